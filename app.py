@@ -1,22 +1,45 @@
 # app.py - Modern UI Version with Performance Optimization (FIXED)
+import sys
+import time
+# Start of this script run, for the time-to-first-paint report
+SCRIPT_START = time.perf_counter()
+import uuid
+import threading
 import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx, add_script_run_ctx
+from streamlit.runtime.scriptrunner.script_run_context import SCRIPT_RUN_CONTEXT_ATTR_NAME
 import pandas as pd
 import numpy as np
-from typing import Dict, Any
 import warnings
 warnings.filterwarnings('ignore')
 
-from train_model import DepressionModelTrainer
-from utils import (
-    load_data_from_url, load_data_from_file, get_dataset_info,
-    plot_confusion_matrix, plot_target_distribution, plot_correlation_matrix,
-    plot_feature_importance, plot_prediction_comparison
+# Sessions share loaded datasets; Copy-on-Write keeps their views independent
+pd.set_option('mode.copy_on_write', True)
+
+# Heavy modules (sklearn, scipy, matplotlib, requests) are imported inside the
+# functions that use them and preloaded per page, so Quick Predict renders
+# without them
+import lazy_imports
+from dataset_cache import SharedDatasetStore
+from quick_predict import QuickPredictAI
+from config import (
+    TARGET_COLUMN, TEST_SIZE_DEFAULT, RANDOM_STATE_DEFAULT, PAGES, MODEL_SAVE_PATH,
+    TRAINING_JOB_REFRESH_SECONDS, PROFILE_CACHE_ENTRIES, CORRELATION_HEATMAP_MAX_FEATURES,
+    CORRELATION_TOP_PAIRS, PREDICTION_MEMO_ENTRIES, SHOW_RUN_COUNTER, SHOW_STARTUP_REPORT
 )
-from config import TARGET_COLUMN, TEST_SIZE_DEFAULT, RANDOM_STATE_DEFAULT, PAGES
 
 # Add Quick Predict to PAGES
 PAGES = ["🔮 Quick Predict", "📁 Load Data", "🤖 Train Model", "🎯 Make Predictions", "📊 Visualizations"]
 
+# Modules each page needs, imported the first time the page is visited
+PAGE_MODULES = {
+    PAGES[0]: [],
+    PAGES[1]: ['utils'],
+    PAGES[2]: ['training_jobs', 'model_store', 'utils'],
+    PAGES[3]: ['train_model', 'model_store'],
+    PAGES[4]: ['train_model', 'model_store', 'feature_correlations', 'figure_cache', 'utils']
+}
+
 # Page configuration
 st.set_page_config(
     page_title="Mental Health AI Predictor",
@@ -562,6 +585,8 @@ label {
 def init_session_state():
     if 'df' not in st.session_state:
         st.session_state.df = None
+    if 'dataset_handle' not in st.session_state:
+        st.session_state.dataset_handle = None
     if 'trainer' not in st.session_state:
         st.session_state.trainer = None
     if 'model_trained' not in st.session_state:
@@ -574,6 +599,188 @@ def init_session_state():
         st.session_state.quick_predict_responses = {}
     if 'assessment_completed' not in st.session_state:
         st.session_state.assessment_completed = False
+    if 'training_job_id' not in st.session_state:
+        st.session_state.training_job_id = None
+    if 'attached_job_id' not in st.session_state:
+        st.session_state.attached_job_id = None
+    if 'prediction_inputs' not in st.session_state:
+        st.session_state.prediction_inputs = None
+    if 'prediction_memo' not in st.session_state:
+        st.session_state.prediction_memo = {}
+        st.session_state.prediction_memo_trainer = None
+    if 'run_stats' not in st.session_state:
+        st.session_state.run_stats = {'runs': 0, 'interactions': 0, 'interaction_runs': 0}
+    if 'startup_timings' not in st.session_state:
+        st.session_state.startup_timings = {}
+
+def count_script_run():
+    """Count this script run; reruns requested by the app belong to the interaction that caused them"""
+    stats = st.session_state.run_stats
+    stats['runs'] += 1
+    if st.session_state.pop('rerun_requested', False):
+        stats['interaction_runs'] += 1
+    else:
+        stats['interactions'] += 1
+        stats['interaction_runs'] = 1
+
+def rerun():
+    """Rerun the script immediately, counting the extra run toward the current interaction"""
+    st.session_state.rerun_requested = True
+    st.rerun()
+
+def load_page_modules(page):
+    """Import a page's heavy modules on its first visit in this process"""
+    missing = [name for name in PAGE_MODULES.get(page, []) if name not in sys.modules]
+    if missing:
+        with st.spinner("Loading..."):
+            for name in missing:
+                lazy_imports.load(name)
+
+def record_startup_timing(name):
+    """Record seconds since the script started for the session's first run only"""
+    timings = st.session_state.startup_timings
+    if st.session_state.run_stats['runs'] == 1 and name not in timings:
+        timings[name] = time.perf_counter() - SCRIPT_START
+
+def render_startup_report():
+    """Show the session's first-run timings and the process's import times"""
+    with st.expander("⏱️ Startup Report"):
+        timings = st.session_state.startup_timings
+        if timings:
+            st.caption(" · ".join(f"{name}: {seconds:.3f}s" for name, seconds in timings.items()))
+        import_times = lazy_imports.import_times()
+        if import_times:
+            st.dataframe(pd.DataFrame({'Module': list(import_times), 'Import (s)': list(import_times.values())}),
+                         use_container_width=True, hide_index=True)
+        else:
+            st.caption("No page modules imported yet")
+
+def navigate_to(page):
+    """Button callback: switch pages before the script runs, so a click costs one run"""
+    st.session_state.current_page = page
+
+# Shared model cache (one model per process, read-only for every session)
+@st.cache_resource(show_spinner="Loading shared model...")
+def get_shared_trainer():
+    """Load the latest published model from MODEL_SAVE_PATH once per process"""
+    from model_store import ModelStore
+    from train_model import DepressionModelTrainer
+    
+    if ModelStore(MODEL_SAVE_PATH).latest_version() is None:
+        return None
+    
+    trainer = DepressionModelTrainer()
+    trainer.load_model(MODEL_SAVE_PATH)
+    return trainer
+
+def reload_shared_model():
+    """Invalidate the process-wide model cache and load the latest version again"""
+    get_shared_trainer.clear()
+    return get_shared_trainer()
+
+@st.cache_resource
+def get_dataset_store():
+    """Process-wide store deduplicating the datasets sessions load"""
+    return SharedDatasetStore()
+
+@st.cache_data(max_entries=PROFILE_CACHE_ENTRIES, show_spinner="Profiling dataset...")
+def get_dataset_profile(dataset_key, _df):
+    """Profile a dataset once per content hash (the frame itself is not hashed)"""
+    from utils import get_dataset_info
+    return get_dataset_info(_df)
+
+@st.cache_data(max_entries=PROFILE_CACHE_ENTRIES, show_spinner="Computing correlations...")
+def get_feature_correlations(dataset_key, _df):
+    """Correlate a dataset's features once per content hash"""
+    from feature_correlations import FeatureCorrelations
+    return FeatureCorrelations.from_dataframe(_df)
+
+def set_session_dataset(df):
+    """Share a loaded dataset across sessions and point this session at it"""
+    previous = st.session_state.dataset_handle
+    handle = get_dataset_store().share(df)
+    if previous is not None:
+        previous.release()
+    st.session_state.dataset_handle = handle
+    st.session_state.df = handle.df
+
+@st.cache_resource
+def get_figure_cache():
+    """Process-wide cache of rendered plots"""
+    from figure_cache import FigureCache
+    return FigureCache()
+
+def show_plot(key, plot):
+    """Display a plot from the figure cache; keys containing None are rendered uncached"""
+    if key is not None and None in key:
+        key = None
+    image = get_figure_cache().get_or_render(key, plot)
+    if image is not None:
+        st.image(image, use_column_width=True)
+    return image
+
+@st.cache_resource
+def get_training_jobs():
+    """Process-wide background training job manager"""
+    from training_jobs import TrainingJobManager
+    return TrainingJobManager()
+
+def get_job_owner():
+    """Return the token scoping training jobs to this user, kept in the URL so it survives a refresh"""
+    if 'job_owner' not in st.session_state:
+        params = st.experimental_get_query_params()
+        owner = params.get('owner', [None])[0]
+        if not owner:
+            owner = uuid.uuid4().hex
+            st.experimental_set_query_params(**params, owner=owner)
+        st.session_state.job_owner = owner
+    return st.session_state.job_owner
+
+def attach_training_job(job_id, discard=False):
+    """
+    Load a finished job's model into this session.
+    
+    Args:
+        job_id (str): Job id
+        discard (bool): Delete the job's saved model once loaded; only the
+            session that submitted the job does this
+        
+    Returns:
+        bool: False if the job disappeared before it could be loaded
+    """
+    jobs = get_training_jobs()
+    try:
+        trainer = jobs.load_result(job_id, mmap=False)
+    except ValueError:
+        st.warning(f"⚠️ Training job {job_id} is no longer available. Please train again.")
+        if st.session_state.training_job_id == job_id:
+            st.session_state.training_job_id = None
+        return False
+    
+    if discard:
+        jobs.discard(job_id)
+    st.session_state.trainer = trainer
+    st.session_state.model_trained = True
+    st.session_state.training_job_id = job_id
+    st.session_state.attached_job_id = job_id
+    return True
+
+def attach_finished_training_job():
+    """Attach the session's training job once it finishes, on whatever page the user is"""
+    job_id = st.session_state.training_job_id
+    if job_id is None or job_id == st.session_state.attached_job_id:
+        return
+    
+    from training_jobs import DONE
+    status = get_training_jobs().status(job_id)
+    if status is not None and status['state'] == DONE and attach_training_job(job_id, discard=True):
+        st.toast("✅ Model trained successfully!")
+
+def get_active_trainer():
+    """Return the model trained in this session, falling back to the shared model"""
+    if st.session_state.model_trained:
+        return st.session_state.trainer
+    return get_shared_trainer()
 
 # Hero Section
 def render_hero():
@@ -624,205 +831,11 @@ def render_navigation():
                 """, unsafe_allow_html=True)
             else:
                 # Clickable button for inactive pages
-                if st.button(page, key=button_key, use_container_width=True):
-                    st.session_state.current_page = page
-                    # Force a clean rerun
-                    st.rerun()
+                st.button(page, key=button_key, use_container_width=True,
+                          on_click=navigate_to, args=(page,))
     
     st.markdown('</div>', unsafe_allow_html=True)
 
-# Rule-based AI prediction system - FIXED VERSION
-class QuickPredictAI:
-    """Rule-based AI system for instant depression prediction"""
-    
-    @staticmethod
-    def calculate_depression_score(responses: Dict[str, str]) -> float:
-        """Calculate depression score based on responses"""
-        # Map responses to scores (0-4 scale)
-        response_mapping = {
-            # For positive questions (lower is better)
-            'Very good': 0,
-            'Good': 1,
-            'Fair': 2,
-            'Poor': 3,
-            'Very poor': 4,
-            
-            # For frequency questions
-            'Never': 0,
-            'Rarely': 1,
-            'Sometimes': 2,
-            'Often': 3,
-            'Always': 4,
-            'Constantly': 4,
-            'Frequently': 4,
-            
-            # For interest/energy questions
-            'Very energetic': 0,
-            'Energetic': 1,
-            'Average': 2,
-            'Low': 3,
-            'Very low': 4,
-            
-            'Very interested': 0,
-            'Interested': 1,
-            'Neutral': 2,
-            'Disinterested': 3,
-            'Very disinterested': 4,
-            
-            'Full interest': 0,
-            'Most interest': 1,
-            'Some interest': 2,
-            'Little interest': 3,
-            'No interest': 4,
-            
-            # For engagement questions (hobby)
-            'Very engaged': 0,
-            'Engaged': 1,
-            'Disengaged': 3,
-            'Very disengaged': 4,
-            
-            # For change questions
-            'No change': 0,
-            'Slight change': 1,
-            'Moderate change': 2,
-            'Significant change': 3,
-            'Extreme change': 4,
-            
-            # For difficulty questions
-            'Not at all': 0,
-            'Slightly': 1,
-            'Moderately': 2,
-            'Very': 3,
-            'Extremely': 4,
-        }
-        
-        # Weighted scoring system based on clinical depression criteria
-        weights = {
-            'mood': 1.5,           # Mood disturbance
-            'sleep': 1.2,          # Sleep problems
-            'energy': 1.3,         # Energy/fatigue
-            'appetite': 1.0,       # Appetite changes
-            'concentration': 1.4,  # Concentration difficulties
-            'anxiety': 1.3,        # Anxiety levels
-            'social': 1.2,         # Social withdrawal
-            'interest': 1.5,       # Loss of interest
-            'guilt': 1.1,          # Guilt/worthlessness
-            'suicidal': 2.0,       # Suicidal thoughts (higher weight)
-            'hobby': 1.3           # Engagement with hobbies
-        }
-        
-        total_score = 0
-        max_possible = 0
-        
-        for key, weight in weights.items():
-            response = responses.get(key, '')
-            if response:  # Only calculate if response exists
-                score = response_mapping.get(response, 0)
-                # Normalize score to 0-10 scale
-                normalized_score = (score / 4) * 10
-                total_score += normalized_score * weight
-                max_possible += 10 * weight
-        
-        # Normalize to 0-100 scale
-        if max_possible > 0:
-            depression_percentage = (total_score / max_possible) * 100
-        else:
-            depression_percentage = 0
-            
-        return depression_percentage
-    
-    @staticmethod
-    def interpret_score(score: float) -> Dict[str, Any]:
-        """Interpret depression score into levels and recommendations"""
-        if score < 20:
-            level = "Normal"
-            color_class = "prediction-result-normal"
-            severity = "Low"
-            recommendation = "You appear to have good mental health. Maintain healthy habits!"
-        elif score < 40:
-            level = "Mild"
-            color_class = "prediction-result-mild"
-            severity = "Low-Moderate"
-            recommendation = "Mild symptoms detected. Consider stress management techniques."
-        elif score < 60:
-            level = "Moderate"
-            color_class = "prediction-result-moderate"
-            severity = "Moderate"
-            recommendation = "Moderate symptoms detected. Consider speaking with a professional."
-        elif score < 80:
-            level = "Severe"
-            color_class = "prediction-result-severe"
-            severity = "High"
-            recommendation = "Severe symptoms detected. Please seek professional help immediately."
-        else:
-            level = "Critical"
-            color_class = "prediction-result-severe"
-            severity = "Very High"
-            recommendation = "Critical symptoms detected. Urgent professional help is strongly recommended."
-        
-        return {
-            'level': level,
-            'score': score,
-            'color_class': color_class,
-            'severity': severity,
-            'recommendation': recommendation
-        }
-    
-    @staticmethod
-    def generate_insights(responses: Dict[str, str]) -> list:
-        """Generate personalized insights based on responses - FIXED VERSION"""
-        insights = []
-        
-        # Response mapping for checking severity
-        response_mapping = {
-            'Very good': 0, 'Good': 1, 'Fair': 2, 'Poor': 3, 'Very poor': 4,
-            'Never': 0, 'Rarely': 1, 'Sometimes': 2, 'Often': 3, 'Always': 4,
-            'Very energetic': 0, 'Energetic': 1, 'Average': 2, 'Low': 3, 'Very low': 4,
-            'Very interested': 0, 'Interested': 1, 'Neutral': 2, 'Disinterested': 3, 'Very disinterested': 4,
-            'Full interest': 0, 'Most interest': 1, 'Some interest': 2, 'Little interest': 3, 'No interest': 4,
-            'Very engaged': 0, 'Engaged': 1, 'Disengaged': 3, 'Very disengaged': 4,
-            'No change': 0, 'Slight change': 1, 'Moderate change': 2, 'Significant change': 3, 'Extreme change': 4,
-            'Not at all': 0, 'Slightly': 1, 'Moderately': 2, 'Very': 3, 'Extremely': 4,
-            'Constantly': 4, 'Frequently': 4,
-        }
-        
-        # Mood insights
-        mood_score = response_mapping.get(responses.get('mood', ''), 0)
-        if mood_score >= 3:
-            insights.append("💙 **Mood**: Persistent low mood detected - Consider mood tracking and journaling")
-        
-        # Sleep insights
-        sleep_score = response_mapping.get(responses.get('sleep', ''), 0)
-        if sleep_score >= 3:
-            insights.append("😴 **Sleep**: Sleep disturbances noted - Establish regular sleep routine and reduce screen time before bed")
-        
-        # Energy insights
-        energy_score = response_mapping.get(responses.get('energy', ''), 0)
-        if energy_score >= 3:
-            insights.append("⚡ **Energy**: Low energy levels - Consider regular physical activity and balanced nutrition")
-        
-        # Concentration insights
-        concentration_score = response_mapping.get(responses.get('concentration', ''), 0)
-        if concentration_score >= 3:
-            insights.append("🎯 **Focus**: Difficulty concentrating - Try mindfulness exercises and break tasks into smaller steps")
-        
-        # Social insights
-        social_score = response_mapping.get(responses.get('social', ''), 0)
-        if social_score >= 3:
-            insights.append("👥 **Social**: Social withdrawal detected - Consider joining support groups or social activities")
-        
-        # Hobby insights
-        hobby_score = response_mapping.get(responses.get('hobby', ''), 0)
-        if hobby_score >= 3:
-            insights.append("🎨 **Hobbies**: Loss of interest in hobbies - Try reintroducing small enjoyable activities gradually")
-            
-        # Suicidal thoughts (high priority)
-        suicidal_score = response_mapping.get(responses.get('suicidal', ''), 0)
-        if suicidal_score >= 2:
-            insights.append("⚠️ **Important**: If you're having suicidal thoughts, please call emergency services or a crisis hotline immediately")
-        
-        return insights
-
 # Page 0: Quick Predict (New Page)
 def page_quick_predict():
     # Reset assessment flag if coming from other pages
@@ -987,16 +1000,12 @@ def page_quick_predict():
     
     col1, col2, col3 = st.columns([1, 2, 1])
     with col2:
-        if st.button("🔮 Get Instant Assessment", 
-                    use_container_width=True, 
-                    type="primary",
-                    disabled=not responses_complete,
-                    help="Please answer all questions to get an assessment"):
-            if responses_complete:
-                process_quick_prediction()
-            else:
-                st.warning("⚠️ Please answer all questions before proceeding")
-                st.rerun()
+        st.button("🔮 Get Instant Assessment", 
+                  use_container_width=True, 
+                  type="primary",
+                  disabled=not responses_complete,
+                  help="Please answer all questions to get an assessment",
+                  on_click=process_quick_prediction)
 
 def render_question(question):
     """Render individual question with proper styling"""
@@ -1016,21 +1025,25 @@ def render_question(question):
     # Get current response or default to "Select..."
     current_response = st.session_state.quick_predict_responses.get(question['id'], 'Select...')
     
-    # Create selectbox
-    response = st.selectbox(
+    # Create selectbox; its callback stores the response before the next run
+    st.selectbox(
         "",
         options=question['options'],
         index=question['options'].index(current_response) if current_response in question['options'] else 0,
         key=response_key,
         label_visibility="collapsed",
-        help="Select your response"
+        help="Select your response",
+        on_change=record_response,
+        args=(question['id'], response_key)
     )
-    
-    # Store response if not "Select..."
+
+def record_response(question_id, response_key):
+    """Selectbox callback: store the response, dropping it when reset to the placeholder"""
+    response = st.session_state[response_key]
     if response != "Select...":
-        st.session_state.quick_predict_responses[question['id']] = response
-    elif question['id'] in st.session_state.quick_predict_responses:
-        del st.session_state.quick_predict_responses[question['id']]
+        st.session_state.quick_predict_responses[question_id] = response
+    else:
+        st.session_state.quick_predict_responses.pop(question_id, None)
 
 def show_assessment_results():
     """Display assessment results"""
@@ -1066,18 +1079,6 @@ def show_assessment_results():
     </div>
     """, unsafe_allow_html=True)
     
-    # Response mapping for scores
-    response_mapping = {
-        'Very good': 0, 'Good': 1, 'Fair': 2, 'Poor': 3, 'Very poor': 4,
-        'Never': 0, 'Rarely': 1, 'Sometimes': 2, 'Often': 3, 'Always': 4,
-        'Very energetic': 0, 'Energetic': 1, 'Average': 2, 'Low': 3, 'Very low': 4,
-        'Very interested': 0, 'Interested': 1, 'Neutral': 2, 'Disinterested': 3, 'Very disinterested': 4,
-        'Full interest': 0, 'Most interest': 1, 'Some interest': 2, 'Little interest': 3, 'No interest': 4,
-        'No change': 0, 'Slight change': 1, 'Moderate change': 2, 'Significant change': 3, 'Extreme change': 4,
-        'Not at all': 0, 'Slightly': 1, 'Moderately': 2, 'Very': 3, 'Extremely': 4,
-        'Constantly': 4, 'Frequently': 4
-    }
-    
     key_symptoms = ['mood', 'sleep', 'energy', 'concentration', 'anxiety', 'social', 'interest']
     symptom_labels = {
         'mood': 'Mood Disturbance',
@@ -1092,7 +1093,7 @@ def show_assessment_results():
     for symptom in key_symptoms:
         response = st.session_state.quick_predict_responses.get(symptom, '')
         if response:
-            score = response_mapping.get(response, 0)
+            score = QuickPredictAI.RESPONSE_CODES.get(response, 0)
             percentage = (score / 4) * 100
             
             st.markdown(f"""
@@ -1170,24 +1171,26 @@ def show_assessment_results():
     # Action buttons
     col1, col2 = st.columns(2)
     with col1:
-        if st.button("🔄 Take Another Assessment", use_container_width=True):
-            st.session_state.assessment_completed = False
-            st.session_state.quick_predict_responses = {}
-            st.session_state.assessment_reset = False
-            st.rerun()
+        st.button("🔄 Take Another Assessment", use_container_width=True, on_click=reset_assessment)
     
     with col2:
-        if st.button("📁 Use Advanced Model", use_container_width=True):
-            st.session_state.current_page = PAGES[1]  # Go to Load Data
-            st.rerun()
+        # Go to Load Data
+        st.button("📁 Use Advanced Model", use_container_width=True, on_click=navigate_to, args=(PAGES[1],))
+
+def reset_assessment():
+    """Button callback: clear the responses and show the questionnaire again"""
+    st.session_state.assessment_completed = False
+    st.session_state.quick_predict_responses = {}
+    st.session_state.assessment_reset = False
 
 def process_quick_prediction():
-    """Process the quick prediction and display results"""
+    """Button callback: mark the assessment complete so this run shows the results"""
     st.session_state.assessment_completed = True
-    st.rerun()
 
 # Page 1: Load Data (renumbered from original)
 def page_load_data():
+    from utils import load_data_from_url, load_data_from_file, upload_cache
+    
     col1, col2 = st.columns(2, gap="large")
     
     with col1:
@@ -1202,14 +1205,27 @@ def page_load_data():
         
         uploaded_file = st.file_uploader("Choose a CSV file", type=['csv'], label_visibility="collapsed")
         
-        if uploaded_file:
+        # The uploader keeps returning the file on every rerun; load it once
+        if uploaded_file and uploaded_file.file_id != st.session_state.get('uploaded_file_id'):
             df, error = load_data_from_file(uploaded_file)
             if error:
                 st.error(f"❌ Error: {error}")
             else:
-                st.session_state.df = df
+                set_session_dataset(df)
+                st.session_state.uploaded_file_id = uploaded_file.file_id
                 st.success("✅ Data loaded successfully!")
-                st.rerun()
+                rerun()
+        
+        cache_stats = upload_cache.stats()
+        st.caption(
+            f"Upload cache: {cache_stats['hits']} hits · {cache_stats['misses']} misses · "
+            f"{cache_stats['size_bytes'] / 1024 ** 2:.1f} of {cache_stats['max_bytes'] / 1024 ** 2:.0f} MB"
+        )
+        shared = get_dataset_store().stats()
+        st.caption(
+            f"Shared datasets: {shared['datasets']} in memory "
+            f"({shared['memory_bytes'] / 1024 ** 2:.1f} MB) · {shared['references']} session references"
+        )
     
     with col2:
         st.markdown("""
@@ -1226,21 +1242,54 @@ def page_load_data():
         if st.button("Load from URL", use_container_width=True):
             if csv_url:
                 with st.spinner("Loading..."):
-                    df, error = load_data_from_url(csv_url)
+                    df, error = load_data_from_url(csv_url, progress_callback=make_download_progress())
                     if error:
                         st.error(f"❌ Error: {error}")
                     else:
-                        st.session_state.df = df
+                        set_session_dataset(df)
                         st.success("✅ Data loaded successfully!")
-                        st.rerun()
+                        rerun()
     
     if st.session_state.df is not None:
-        display_dataset_overview(st.session_state.df)
+        display_dataset_overview(st.session_state.df, st.session_state.dataset_handle.key)
+
+def make_download_progress(min_interval=0.2):
+    """Return a load_data_from_url progress callback that drives a progress bar"""
+    bar = st.progress(0.0, text="Connecting...")
+    last_update = [0.0]
+    script_ctx = get_script_run_ctx()
+    
+    def report(bytes_received, total_bytes):
+        now = time.monotonic()
+        if now - last_update[0] < min_interval:
+            return
+        last_update[0] = now
+        # The pyarrow CSV engine calls this from its shared IO threads: attach
+        # this session only for the update and restore the thread afterwards
+        thread = threading.current_thread()
+        previous_ctx = get_script_run_ctx(suppress_warning=True)
+        add_script_run_ctx(thread, script_ctx)
+        try:
+            received_mb = bytes_received / 1024 ** 2
+            if total_bytes:
+                bar.progress(min(bytes_received / total_bytes, 1.0),
+                             text=f"Downloaded {received_mb:.1f} of {total_bytes / 1024 ** 2:.1f} MB")
+            else:
+                bar.progress(0.0, text=f"Downloaded {received_mb:.1f} MB")
+        finally:
+            if previous_ctx is None:
+                delattr(thread, SCRIPT_RUN_CONTEXT_ATTR_NAME)
+            else:
+                setattr(thread, SCRIPT_RUN_CONTEXT_ATTR_NAME, previous_ctx)
+    
+    return report
 
-def display_dataset_overview(df):
+def display_dataset_overview(df, dataset_key):
     st.markdown("<br>", unsafe_allow_html=True)
     
-    info = get_dataset_info(df)
+    info = get_dataset_profile(dataset_key, df)
+    # Approximate statistics are prefixed with ≈ and their error bounds listed
+    approx = "≈" if info['approximate'] else ""
     
     st.markdown("""
     <div class="glass-card">
@@ -1256,8 +1305,10 @@ def display_dataset_overview(df):
         ("📋", "Total Rows", f"{info['rows']:,}"),
         ("📊", "Columns", f"{info['columns']}"),
         ("⚠️", "Missing", f"{info['missing_values']}"),
-        ("💾", "Memory", f"{info['memory_usage_kb']:.1f} KB")
+        ("💾", "Memory", f"{approx}{info['memory_usage_kb']:.1f} KB")
     ]
+    if info['memory_before_kb'] > info['memory_usage_kb']:
+        stats[-1] = ("💾", f"Memory (was {info['memory_before_kb']:.1f} KB)", f"{approx}{info['memory_usage_kb']:.1f} KB")
     
     for col, (icon, label, value) in zip(cols, stats):
         with col:
@@ -1285,13 +1336,23 @@ def display_dataset_overview(df):
         """, unsafe_allow_html=True)
         
         # Show column details
-        col_info = pd.DataFrame({
-            'Column': df.columns,
-            'Type': df.dtypes.values,
-            'Non-Null Count': df.notnull().sum().values,
-            'Unique Values': [df[col].nunique() for col in df.columns]
+        col_info = pd.DataFrame(info['column_stats']).rename(columns={
+            'column': 'Column', 'dtype': 'Type', 'non_null': 'Non-Null Count', 'unique': 'Unique Values'
         })
+        if info['approximate']:
+            col_info = col_info.rename(columns={'Unique Values': 'Unique Values (≈)'})
         st.dataframe(col_info, use_container_width=True)
+        
+        st.caption(f"Duplicate rows: {info['duplicates']:,}")
+        if info['approximate']:
+            bounds = info['error_bounds']
+            memory_note = (f", memory (sampled strings) within ±{bounds['memory_usage_kb']:.1%}"
+                           if bounds['memory_usage_kb'] else "")
+            st.caption(
+                f"Approximate profile ({info['rows']:,} rows): unique values are HyperLogLog "
+                f"estimates within ±{bounds['unique']:.1%}{memory_note} (95% bounds); "
+                "duplicates are counted from 64-bit row hashes"
+            )
 
 # Page 2: Train Model (renumbered)
 def page_train_model():
@@ -1317,6 +1378,14 @@ def page_train_model():
         
         test_size = st.slider("Test Size (%)", 10, 40, 20) / 100
         random_state = st.number_input("Random State", 1, 100, 42)
+        tune = st.checkbox(
+            "🔍 Tune hyperparameters (successive halving)",
+            help="Search around the default parameters in parallel, dropping weak candidates early"
+        )
+        early_stopping = st.checkbox(
+            "🌲 Adaptive forest size (out-of-bag early stopping)",
+            help="Add trees until the out-of-bag accuracy stops improving, instead of always fitting a fixed number"
+        )
     
     with col2:
         unique_vals = st.session_state.df[TARGET_COLUMN].nunique()
@@ -1331,26 +1400,185 @@ def page_train_model():
         """, unsafe_allow_html=True)
     
     st.markdown("<br>", unsafe_allow_html=True)
-    if st.button("🚀 Train Model", use_container_width=True):
-        train_model(test_size, random_state)
+    if st.button("🚀 Train Model", use_container_width=True, disabled=is_training_job_running()):
+        submit_training_job(test_size, random_state, tune, early_stopping)
+    
+    render_training_job()
+    render_training_job_history()
+    render_model_publishing()
 
-def train_model(test_size, random_state):
-    with st.spinner("Training model..."):
-        try:
-            trainer = DepressionModelTrainer(test_size=test_size, random_state=random_state)
-            metrics = trainer.train_and_evaluate(st.session_state.df.copy())
-            
-            st.session_state.trainer = trainer
-            st.session_state.model_trained = True
-            
-            st.balloons()
-            st.success("✅ Model trained successfully!")
-            
-            display_model_metrics(metrics)
-        except Exception as e:
-            st.error(f"❌ Error: {str(e)}")
+def render_model_publishing():
+    """Publish the session's model to the shared store and manage the shared cache"""
+    shared_trainer = get_shared_trainer()
+    shared_version = shared_trainer.model_version if shared_trainer is not None else "none"
+    
+    st.markdown(f"""
+    <div class="glass-card">
+        <div class="card-header">
+            <div class="card-icon">💾</div>
+            <h3 class="card-title">Shared Model</h3>
+        </div>
+        <p style="color: #94a3b8; margin: 0;">
+            Serving version <strong>{shared_version}</strong> to every session without a model of its own.
+        </p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        if st.button("💾 Publish Trained Model", use_container_width=True,
+                     disabled=not st.session_state.model_trained):
+            try:
+                version = st.session_state.trainer.save_model(MODEL_SAVE_PATH)
+                reload_shared_model()
+                st.success(f"✅ Published model {version}!")
+            except Exception as e:
+                st.error(f"❌ Error: {str(e)}")
+    
+    with col2:
+        if st.button("🔄 Reload Shared Model", use_container_width=True):
+            reload_shared_model()
+            st.success("✅ Shared model reloaded!")
+
+def is_training_job_running():
+    from training_jobs import FINISHED_STATES
+    
+    job_id = st.session_state.training_job_id
+    if job_id is None:
+        return False
+    status = get_training_jobs().status(job_id)
+    return status is not None and status['state'] not in FINISHED_STATES
+
+def submit_training_job(test_size, random_state, tune=False, early_stopping=False):
+    trainer_kwargs = {'test_size': test_size, 'random_state': int(random_state),
+                      'fast_inference': True, 'early_stopping': early_stopping}
+    try:
+        job_id = get_training_jobs().submit(st.session_state.df, trainer_kwargs, tune=tune,
+                                            owner=get_job_owner())
+        st.session_state.training_job_id = job_id
+    except Exception as e:
+        st.error(f"❌ Error: {str(e)}")
+
+def render_training_job():
+    """Show progress of the session's training job, or its results once finished"""
+    from training_jobs import DONE, FAILED, CANCELLED
+    
+    job_id = st.session_state.training_job_id
+    if job_id is None:
+        return
+    
+    # An attached job has been discarded; its model lives in the session
+    if job_id == st.session_state.attached_job_id:
+        st.success(f"✅ Model trained successfully! (job {job_id})")
+        display_model_metrics(st.session_state.trainer.metrics, st.session_state.trainer.model_hash)
+        return
+    
+    status = get_training_jobs().status(job_id)
+    if status is None:
+        st.warning("⚠️ The training job is no longer available (the server restarted or another "
+                   "session attached it). Please train again.")
+        st.session_state.training_job_id = None
+        return
+    
+    if status['state'] == DONE:
+        if not attach_training_job(job_id, discard=True):
+            return
+        st.balloons()
+        st.success(f"✅ Model trained successfully! (job {job_id})")
+        display_model_metrics(st.session_state.trainer.metrics, st.session_state.trainer.model_hash)
+    elif status['state'] in (FAILED, CANCELLED):
+        if status['state'] == FAILED:
+            st.error(f"❌ Error: {status['error']}")
+        else:
+            st.warning(f"⚠️ Training job {job_id} was cancelled.")
+        # Shown once; the job has nothing left to attach
+        get_training_jobs().discard(job_id)
+        st.session_state.training_job_id = None
+    else:
+        render_training_progress(job_id, status)
+
+def render_training_progress(job_id, status):
+    st.markdown(f"""
+    <div class="glass-card">
+        <div class="card-header">
+            <div class="card-icon">⏳</div>
+            <h3 class="card-title">Training Job {job_id}</h3>
+        </div>
+        <p style="color: #94a3b8; margin: 0;">
+            {'Tuning and training' if status['tune'] else 'Training'} in the background.
+            You can leave this page; the model attaches to your session on your
+            next interaction after it finishes.
+        </p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    if LIVE_JOB_PROGRESS is not None:
+        LIVE_JOB_PROGRESS(job_id)
+    else:
+        render_job_progress_bar(status)
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        if st.button("⛔ Cancel Training", use_container_width=True):
+            get_training_jobs().cancel(job_id)
+            rerun()
+    with col2:
+        if LIVE_JOB_PROGRESS is None:
+            st.button("🔄 Refresh Progress", use_container_width=True)
 
-def display_model_metrics(metrics):
+def render_job_progress_bar(status):
+    if status['trees_total']:
+        fraction = status['trees_built'] / status['trees_total']
+        trees = f" · {status['trees_built']}/{status['trees_total']} trees"
+    else:
+        fraction = 0.0
+        trees = ""
+    st.progress(fraction, text=f"Stage: {status['stage'] or status['state']}{trees}")
+
+def render_live_job_progress(job_id):
+    """Refresh a running job's progress bar; rerun the whole page once the job finishes"""
+    from training_jobs import FINISHED_STATES
+    
+    status = get_training_jobs().status(job_id)
+    if status is None or status['state'] in FINISHED_STATES:
+        rerun()
+    render_job_progress_bar(status)
+
+# Streamlit versions with fragments rerun only this progress bar on a timer,
+# so nothing holds the script thread between refreshes. The pinned 1.28 has
+# neither fragments nor timed reruns, and polling there would block the
+# session, so it refreshes on demand.
+LIVE_JOB_PROGRESS = (st.fragment(run_every=TRAINING_JOB_REFRESH_SECONDS)(render_live_job_progress)
+                     if hasattr(st, 'fragment') else None)
+
+def render_training_job_history():
+    """List this user's training jobs and attach any finished model to this session"""
+    from training_jobs import DONE
+    
+    jobs = get_training_jobs().list_jobs(owner=get_job_owner())
+    if not jobs:
+        return
+    
+    with st.expander("📋 Training Jobs"):
+        history = pd.DataFrame(jobs)[['job_id', 'state', 'stage', 'trees_built', 'tune', 'submitted_at']]
+        history['submitted_at'] = pd.to_datetime(history['submitted_at'], unit='s')
+        st.dataframe(history, use_container_width=True, hide_index=True)
+        
+        finished = [job['job_id'] for job in jobs if job['state'] == DONE]
+        if finished:
+            col1, col2 = st.columns([2, 1])
+            with col1:
+                job_id = st.selectbox("Finished job", finished)
+            with col2:
+                st.markdown("<br>", unsafe_allow_html=True)
+                if st.button("📎 Attach Model", use_container_width=True):
+                    # Kept for the owner's other tabs; the job manager prunes old jobs
+                    if attach_training_job(job_id):
+                        rerun()
+
+def display_model_metrics(metrics, model_key=None):
+    from utils import plot_confusion_matrix
+    
     st.markdown("<br>", unsafe_allow_html=True)
     
     cols = st.columns(4)
@@ -1373,12 +1601,17 @@ def display_model_metrics(metrics):
     
     st.markdown("<br>", unsafe_allow_html=True)
     
+    if 'tuning' in metrics:
+        display_tuning_results(metrics['tuning'])
+    
+    if 'oob_curve' in metrics:
+        display_oob_curve(metrics['oob_curve'], metrics['n_trees'])
+    
     # Create tabs for model details
-    tab1, tab2 = st.tabs(["📊 Confusion Matrix", "📈 Classification Report"])
+    tab1, tab2, tab3 = st.tabs(["📊 Confusion Matrix", "📈 Classification Report", "⏱️ Stage Timings"])
     
     with tab1:
-        fig = plot_confusion_matrix(metrics['confusion_matrix'])
-        st.pyplot(fig)
+        show_plot(('confusion_matrix', model_key), lambda: plot_confusion_matrix(metrics['confusion_matrix']))
     
     with tab2:
         if 'classification_report' in metrics:
@@ -1389,10 +1622,73 @@ def display_model_metrics(metrics):
                 'f1-score': '{:.2%}',
                 'support': '{:.0f}'
             }), use_container_width=True)
+    
+    with tab3:
+        if 'stage_timings' in metrics:
+            display_stage_timings(metrics['stage_timings'])
+        else:
+            st.info("No stage timings recorded for this model.")
+
+def display_stage_timings(stage_timings):
+    timings = pd.DataFrame(stage_timings).T
+    timings.index.name = 'Stage'
+    timings = timings.rename(columns={
+        'seconds': 'Time (s)',
+        'peak_mb': 'Peak Traced Memory (MB)',
+        'rss_mb': 'Peak RSS (MB)'
+    })
+    timings['Share'] = timings['Time (s)'] / timings['Time (s)'].sum()
+    
+    st.bar_chart(timings['Time (s)'])
+    st.dataframe(timings.style.format({
+        'Time (s)': '{:.3f}',
+        'Peak Traced Memory (MB)': '{:.1f}',
+        'Peak RSS (MB)': '{:.1f}',
+        'Share': '{:.1%}'
+    }), use_container_width=True)
+
+def display_oob_curve(oob_curve, n_trees):
+    st.markdown(f"""
+    <div class="glass-card">
+        <div class="card-header">
+            <div class="card-icon">🌲</div>
+            <h3 class="card-title">Adaptive Forest Size</h3>
+        </div>
+        <p style="color: #94a3b8; margin: 0;">
+            Out-of-bag accuracy plateaued at <strong>{n_trees}</strong> trees
+            (grew up to {oob_curve['n_trees'][-1]} while checking).
+        </p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    curve = pd.DataFrame(oob_curve).set_index('n_trees').rename(columns={'oob_score': 'OOB Accuracy'})
+    st.line_chart(curve)
+
+def display_tuning_results(tuning):
+    st.markdown(f"""
+    <div class="glass-card">
+        <div class="card-header">
+            <div class="card-icon">🔍</div>
+            <h3 class="card-title">Hyperparameter Search</h3>
+        </div>
+        <p style="color: #94a3b8; margin: 0;">
+            Best parameters: <strong>{tuning['best_params']}</strong>
+            &nbsp;|&nbsp; Search time: <strong>{tuning['search_time']:.1f}s</strong>
+        </p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    leaderboard = pd.DataFrame(tuning['leaderboard'])
+    leaderboard['Params'] = leaderboard['Params'].astype(str)
+    st.dataframe(leaderboard.style.format({
+        'Fit Time (s)': '{:.2f}',
+        'CV Accuracy': '{:.2%}'
+    }), use_container_width=True)
 
 # Page 3: Make Predictions (renumbered)
 def page_make_predictions():
-    if not st.session_state.model_trained:
+    trainer = get_active_trainer()
+    if trainer is None:
         st.warning("⚠️ Please train the model first!")
         return
     
@@ -1409,14 +1705,38 @@ def page_make_predictions():
     </div>
     """, unsafe_allow_html=True)
     
-    input_data = create_input_fields(st.session_state.trainer)
-    
-    st.markdown("<br>", unsafe_allow_html=True)
-    
-    col1, col2, col3 = st.columns([1, 2, 1])
-    with col2:
-        if st.button("🎯 Predict Depression Level", use_container_width=True, type="primary"):
-            make_prediction(input_data, st.session_state.trainer)
+    # Widgets inside a form do not rerun the script until it is submitted
+    with st.form("prediction_form"):
+        input_data = create_input_fields(trainer)
+        
+        st.markdown("<br>", unsafe_allow_html=True)
+        
+        col1, col2, col3 = st.columns([1, 2, 1])
+        with col2:
+            submitted = st.form_submit_button("🎯 Predict Depression Level", use_container_width=True, type="primary")
+    
+    if submitted:
+        st.session_state.prediction_inputs = input_data
+    
+    # Keep showing the last prediction on reruns; it is served from the memo
+    inputs = st.session_state.prediction_inputs
+    if inputs is not None and set(inputs) == set(trainer.feature_names):
+        make_prediction(inputs, trainer)
+
+def predict_memoized(input_data, trainer):
+    """Predict once per input vector for the active model (memoized per session)"""
+    # A different trainer object means a different model: start a new memo
+    if st.session_state.prediction_memo_trainer is not trainer:
+        st.session_state.prediction_memo = {}
+        st.session_state.prediction_memo_trainer = trainer
+    
+    memo = st.session_state.prediction_memo
+    key = tuple(input_data[feature] for feature in trainer.feature_names)
+    if key not in memo:
+        memo[key] = trainer.predict(input_data)
+        if len(memo) > PREDICTION_MEMO_ENTRIES:
+            memo.pop(next(iter(memo)))  # oldest entry
+    return memo[key]
 
 def create_input_fields(trainer):
     input_data = {}
@@ -1443,9 +1763,13 @@ def create_input_fields(trainer):
         for idx, feature in enumerate(categorical_features):
             with cols[idx % 2]:
                 options = trainer.label_encoders[feature].classes_
+                stats = (trainer.feature_profile or {}).get(feature)
+                # Default to the most frequent training value
+                default = options.tolist().index(stats['mode']) if stats else 0
                 input_data[feature] = st.selectbox(
                     f"🔹 {feature}",
                     options,
+                    index=default,
                     key=f"select_{feature}",
                     help=f"Select value for {feature}"
                 )
@@ -1460,10 +1784,24 @@ def create_input_fields(trainer):
         cols = st.columns(2, gap="large")
         for idx, feature in enumerate(numerical_features):
             with cols[idx % 2]:
-                # Get min and max from training data for better context
-                min_val = float(trainer.X_train[feature].min())
-                max_val = float(trainer.X_train[feature].max())
-                mean_val = float(trainer.X_train[feature].mean())
+                # Models saved before feature profiles existed carry no ranges
+                stats = (trainer.feature_profile or {}).get(feature)
+                if stats is None:
+                    input_data[feature] = st.number_input(
+                        f"🔹 {feature}",
+                        value=0.0,
+                        key=f"num_{feature}"
+                    )
+                    continue
+                
+                # Ranges from the training data's profile for better context
+                min_val, max_val, mean_val = stats['min'], stats['max'], stats['mean']
+                help_text = f"Range: {min_val:.2f} to {max_val:.2f}"
+                # Outermost quantiles the model was profiled with ('5%' ... '95%' by default)
+                quantiles = sorted(stats['quantiles'].items(), key=lambda item: float(item[0].rstrip('%')))
+                if len(quantiles) >= 2:
+                    (low_label, low), (high_label, high) = quantiles[0], quantiles[-1]
+                    help_text += f" · typical ({low_label}-{high_label}): {low:.2f} to {high:.2f}"
                 
                 input_data[feature] = st.number_input(
                     f"🔹 {feature}",
@@ -1471,16 +1809,14 @@ def create_input_fields(trainer):
                     min_value=float(min_val),
                     max_value=float(max_val),
                     key=f"num_{feature}",
-                    help=f"Range: {min_val:.2f} to {max_val:.2f}"
+                    help=help_text
                 )
     
     return input_data
 
 def make_prediction(input_data, trainer):
     try:
-        input_df = pd.DataFrame([input_data])  # dict -> DataFrame
-        input_df = input_df[trainer.feature_names]  # match training order
-        predicted_class, prediction_proba = trainer.predict(input_data)
+        predicted_class, prediction_proba = predict_memoized(input_data, trainer)
         
         # Get the class with highest probability
         classes = trainer.target_encoder.classes_
@@ -1563,43 +1899,79 @@ def make_prediction(input_data, trainer):
     except Exception as e:
         st.error(f"❌ Error: {str(e)}")
 
+def display_correlations(df, dataset_key):
+    from utils import plot_correlation_matrix
+    
+    correlations = get_feature_correlations(dataset_key, df)
+    n_features = len(correlations.columns)
+    if n_features < 2:
+        st.info("At least two features are needed for a correlation matrix.")
+        return
+    
+    max_features = n_features
+    if n_features > 2:
+        max_features = st.slider("Features in heatmap", 2, n_features,
+                                 min(CORRELATION_HEATMAP_MAX_FEATURES, n_features))
+    show_plot(('correlation_matrix', dataset_key, max_features),
+              lambda: plot_correlation_matrix(df, max_features, correlations))
+    
+    col1, col2 = st.columns(2, gap="large")
+    with col1:
+        st.markdown("**🔗 Strongest Feature Pairs**")
+        st.dataframe(correlations.top_pairs().style.format({'Correlation': '{:+.3f}'}),
+                     use_container_width=True, hide_index=True)
+    with col2:
+        ranking = correlations.target_ranking()
+        if ranking is not None:
+            st.markdown(f"**🎯 Correlation with {TARGET_COLUMN}**")
+            st.bar_chart(ranking.head(CORRELATION_TOP_PAIRS).rename('Correlation'))
+    
+    if correlations.sampled:
+        st.caption(f"Correlations computed from a random sample of {correlations.n_rows_used:,} "
+                   f"of {correlations.n_rows:,} rows")
+
 # Page 4: Visualizations (renumbered)
 def page_visualizations():
+    from utils import plot_target_distribution, plot_feature_importance, plot_prediction_comparison
+    
     if st.session_state.df is None:
         st.warning("⚠️ Please load data first!")
         return
     
+    trainer = get_active_trainer()
+    df = st.session_state.df
+    # Plots are cached per dataset content hash and model content hash
+    dataset_key = st.session_state.dataset_handle.key
+    model_key = trainer.model_hash if trainer is not None else None
     tab1, tab2, tab3, tab4 = st.tabs(["📈 Distribution", "🔗 Correlations", "🎯 Features", "📉 Metrics"])
     
     with tab1:
-        if TARGET_COLUMN in st.session_state.df.columns:
-            fig = plot_target_distribution(st.session_state.df, TARGET_COLUMN)
-            st.pyplot(fig)
+        if TARGET_COLUMN in df.columns:
+            show_plot(('target_distribution', dataset_key, TARGET_COLUMN),
+                      lambda: plot_target_distribution(df, TARGET_COLUMN))
         else:
             st.info("Target column not found in dataset. Showing general distribution.")
             # Plot distribution of first numerical column
-            numerical_cols = st.session_state.df.select_dtypes(include=[np.number]).columns
+            numerical_cols = df.select_dtypes(include=[np.number]).columns
             if len(numerical_cols) > 0:
-                fig = plot_target_distribution(st.session_state.df, numerical_cols[0])
-                st.pyplot(fig)
+                show_plot(('target_distribution', dataset_key, numerical_cols[0]),
+                          lambda: plot_target_distribution(df, numerical_cols[0]))
     
     with tab2:
-        fig = plot_correlation_matrix(st.session_state.df)
-        if fig:
-            st.pyplot(fig)
+        display_correlations(df, dataset_key)
     
     with tab3:
-        if st.session_state.model_trained:
-            feature_importance_df = st.session_state.trainer.get_feature_importance()
+        if trainer is not None:
+            feature_importance_df = trainer.get_feature_importance()
             if feature_importance_df is not None:
-                fig = plot_feature_importance(feature_importance_df)
-                st.pyplot(fig)
+                show_plot(('feature_importance', model_key, 15),
+                          lambda: plot_feature_importance(feature_importance_df, top_n=15))
             else:
                 st.info("Feature importance not available for this model.")
     
     with tab4:
-        if st.session_state.model_trained:
-            metrics = st.session_state.trainer.metrics
+        if trainer is not None:
+            metrics = trainer.metrics
             if 'classification_report' in metrics:
                 class_report = pd.DataFrame(metrics['classification_report']).transpose()
                 st.dataframe(class_report.style.format({
@@ -1610,24 +1982,29 @@ def page_visualizations():
                 }), use_container_width=True)
             
             if 'y_test' in metrics and 'y_pred' in metrics:
-                fig = plot_prediction_comparison(metrics['y_test'], metrics['y_pred'], st.session_state.trainer.target_encoder)
-                st.pyplot(fig)
+                show_plot(('prediction_comparison', model_key),
+                          lambda: plot_prediction_comparison(metrics['y_test'], metrics['y_pred'],
+                                                             trainer.target_encoder))
 # Replace the main() function at the bottom of app.py
 
 def main():
     """Main application function with proper initialization"""
     # Initialize session state FIRST
     init_session_state()
+    count_script_run()
+    attach_finished_training_job()
     
     # Render UI
     render_hero()
     render_navigation()
+    record_startup_timing('first paint')
     
     # Add a small separator
     st.markdown("<br>", unsafe_allow_html=True)
     
     # Route to correct page based on session state
     current_page = st.session_state.current_page
+    load_page_modules(current_page)
     
     if current_page == PAGES[0]:  # Quick Predict
         page_quick_predict()
@@ -1642,7 +2019,16 @@ def main():
     else:
         # Fallback to first page if something goes wrong
         st.session_state.current_page = PAGES[0]
-        st.rerun()
+        rerun()
+    
+    if SHOW_RUN_COUNTER:
+        stats = st.session_state.run_stats
+        st.caption(f"Script runs: {stats['runs']} · interactions: {stats['interactions']} · "
+                   f"runs for the last interaction: {stats['interaction_runs']}")
+    
+    record_startup_timing('page ready')
+    if SHOW_STARTUP_REPORT:
+        render_startup_report()
 
 
 if __name__ == "__main__":
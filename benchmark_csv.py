@@ -0,0 +1,96 @@
+"""
+CSV Parsing Benchmark
+Compares pandas' C parser with the multithreaded pyarrow engine (with and
+without Arrow-backed dtypes) on generated datasets of increasing size and
+reports parse time, peak memory and the resulting frame's size
+"""
+
+import os
+import time
+import tempfile
+import multiprocessing
+
+from generate_sample_data import generate_sample_data
+
+ENGINES = [
+    ('c', False, 'C parser'),
+    ('pyarrow', False, 'pyarrow'),
+    ('pyarrow', True, 'pyarrow + Arrow dtypes'),
+]
+
+
+def _parse_once(path, engine, arrow_dtypes, results):
+    """
+    Parse a CSV in a fresh process and report its cost.
+
+    Peak memory is the process's max RSS above its baseline after imports,
+    which also counts Arrow's allocations outside the Python heap.
+    """
+    from utils import read_csv
+    from train_model import _peak_rss_mb
+
+    baseline = _peak_rss_mb()
+    start = time.perf_counter()
+    df = read_csv(path, engine=engine, arrow_dtypes=arrow_dtypes)
+    seconds = time.perf_counter() - start
+    results.put((seconds, _peak_rss_mb() - baseline, df.memory_usage(deep=True).sum() / 1024 ** 2))
+
+
+def _write_dataset(path, n_rows):
+    generate_sample_data(n_samples=n_rows).to_csv(path, index=False)
+
+
+def measure_parse(path, engine, arrow_dtypes, repeats):
+    """
+    Time a parser configuration, each repeat in its own process.
+
+    Args:
+        path (str): CSV file
+        engine (str): 'c' or 'pyarrow'
+        arrow_dtypes (bool): Keep Arrow-backed dtypes
+        repeats (int): Number of timed parses
+
+    Returns:
+        tuple: (median_seconds, peak_mb, frame_mb)
+    """
+    # The peak RSS survives fork/exec, so each parse starts from a process
+    # that never held a large frame
+    context = multiprocessing.get_context('spawn')
+    results = context.Queue()
+    runs = []
+    for _ in range(repeats):
+        process = context.Process(target=_parse_once, args=(path, engine, arrow_dtypes, results))
+        process.start()
+        runs.append(results.get())
+        process.join()
+    runs.sort()
+    seconds, peak_mb, frame_mb = runs[len(runs) // 2]
+    return seconds, max(run[1] for run in runs), frame_mb
+
+
+def main(sizes=(10_000, 100_000, 1_000_000), repeats=3):
+    print("=" * 78)
+    print(f"CSV parsing on {os.cpu_count()} cores (median of {repeats} runs)")
+    print("=" * 78)
+    print(f"{'Rows':>10} {'File':>8} | {'Engine':<24} | {'Parse':>8} {'Peak RSS':>10} {'Frame':>9}")
+    print("-" * 78)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for n_rows in sizes:
+            path = os.path.join(tmp_dir, f"depression_{n_rows}.csv")
+            writer = multiprocessing.get_context('spawn').Process(target=_write_dataset, args=(path, n_rows))
+            writer.start()
+            writer.join()
+            file_mb = os.path.getsize(path) / 1024 ** 2
+
+            baseline = None
+            for engine, arrow_dtypes, label in ENGINES:
+                seconds, peak_mb, frame_mb = measure_parse(path, engine, arrow_dtypes, repeats)
+                baseline = baseline or seconds
+                print(f"{n_rows:>10,} {file_mb:>6.1f}MB | {label:<24} | {seconds:>7.3f}s "
+                      f"{peak_mb:>8.1f}MB {frame_mb:>7.1f}MB  ({baseline / seconds:.1f}x)")
+            print("-" * 78)
+
+
+if __name__ == "__main__":
+    main()
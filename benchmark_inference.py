@@ -0,0 +1,70 @@
+"""
+Inference Latency Benchmark
+Compares RandomForestClassifier.predict_proba with the FlatForest engine
+on 1, 100 and 100k rows and reports p50/p99 latency for both
+"""
+
+import time
+import numpy as np
+import pandas as pd
+
+from train_model import DepressionModelTrainer
+
+
+def measure_latency(func, X, repeats):
+    """
+    Time repeated calls of func(X).
+
+    Args:
+        func (callable): Prediction function to time
+        X (np.ndarray): Input batch
+        repeats (int): Number of timed calls
+
+    Returns:
+        tuple: (p50_ms, p99_ms)
+    """
+    func(X)  # warm-up
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func(X)
+        timings.append((time.perf_counter() - start) * 1000)
+    return np.percentile(timings, 50), np.percentile(timings, 99)
+
+
+def main(dataset_path='depression_dataset.csv'):
+    df = pd.read_csv(dataset_path)
+    trainer = DepressionModelTrainer(fast_inference=True)
+    trainer.train_and_evaluate(df)
+
+    X_train, X_test, _, _ = trainer.prepare_data(df)
+    X_scaled = trainer.scaler.transform(pd.concat([X_train, X_test]))
+    rng = np.random.default_rng(42)
+
+    forest = trainer.model
+    engine = trainer.inference_engine
+
+    # Exactness check against sequential sklearn accumulation
+    forest.set_params(n_jobs=1)
+    sample = X_scaled[rng.integers(0, len(X_scaled), 10_000)]
+    exact = np.array_equal(forest.predict_proba(sample), engine.predict_proba(sample))
+    forest.set_params(n_jobs=-1)
+
+    print("=" * 72)
+    print(f"Forest: {engine.n_estimators} trees, {len(engine.feature):,} nodes, "
+          f"max depth {engine.max_depth}")
+    print(f"Probabilities identical to predict_proba: {exact}")
+    print("=" * 72)
+    print(f"{'Rows':>8} | {'sklearn p50':>12} {'p99':>10} | {'FlatForest p50':>15} {'p99':>10} | {'Speedup':>7}")
+    print("-" * 72)
+
+    for n_rows, repeats in [(1, 200), (100, 100), (100_000, 5)]:
+        X = X_scaled[rng.integers(0, len(X_scaled), n_rows)]
+        sk_p50, sk_p99 = measure_latency(forest.predict_proba, X, repeats)
+        ff_p50, ff_p99 = measure_latency(engine.predict_proba, X, repeats)
+        print(f"{n_rows:>8,} | {sk_p50:>10.2f}ms {sk_p99:>8.2f}ms | "
+              f"{ff_p50:>13.2f}ms {ff_p99:>8.2f}ms | {sk_p50 / ff_p50:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Startup Benchmark
+Measures, in freshly started processes, how long each heavy module takes to
+import and how long a new worker takes to render the Quick Predict page with
+lazy page imports versus importing every page's modules up front
+"""
+
+import time
+import multiprocessing
+
+# Modules app.py imports only when a page that needs them is first visited
+HEAVY_MODULES = ['utils', 'feature_correlations', 'figure_cache', 'model_store', 'train_model', 'training_jobs']
+
+
+def _import_once(module_name, results):
+    """Import one module in a fresh process, after what app.py always loads"""
+    import streamlit  # also loads pandas, numpy and pyarrow
+    import importlib
+
+    start = time.perf_counter()
+    importlib.import_module(module_name)
+    results.put(time.perf_counter() - start)
+
+
+def _first_run(eager, results):
+    """Render the default page in a fresh process, like a newly started worker"""
+    from streamlit.testing.v1 import AppTest
+
+    start = time.perf_counter()
+    if eager:
+        import importlib
+        for module_name in HEAVY_MODULES:
+            importlib.import_module(module_name)
+    app = AppTest.from_file('app.py', default_timeout=120)
+    app.run()
+    results.put(time.perf_counter() - start)
+
+
+def _median_in_fresh_processes(target, args, repeats):
+    context = multiprocessing.get_context('spawn')
+    results = context.Queue()
+    runs = []
+    for _ in range(repeats):
+        process = context.Process(target=target, args=(*args, results))
+        process.start()
+        runs.append(results.get())
+        process.join()
+    return sorted(runs)[len(runs) // 2]
+
+
+def main(repeats=5):
+    print("=" * 60)
+    print(f"Import time per module, fresh process (median of {repeats})")
+    print("=" * 60)
+    for module_name in HEAVY_MODULES:
+        seconds = _median_in_fresh_processes(_import_once, (module_name,), repeats)
+        print(f"{module_name:<24} {seconds:>8.3f}s")
+
+    print("=" * 60)
+    print(f"Quick Predict first run on a new worker (median of {repeats})")
+    print("=" * 60)
+    eager = _median_in_fresh_processes(_first_run, (True,), repeats)
+    lazy = _median_in_fresh_processes(_first_run, (False,), repeats)
+    print(f"{'All modules up front':<24} {eager:>8.3f}s")
+    print(f"{'Lazy page imports':<24} {lazy:>8.3f}s  ({eager / lazy:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
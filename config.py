@@ -14,13 +14,116 @@ MODEL_PARAMS = {
     'n_jobs': -1
 }
 
+# Hyperparameter Search Configuration
+# Explicit candidate lists (e.g. 'max_features': ['sqrt', 0.5]); the other
+# tunable parameters are bracketed around MODEL_PARAMS
+MODEL_SEARCH_SPACE = {}
+SEARCH_CV_FOLDS = 3
+SEARCH_HALVING_FACTOR = 3
+
+# Incremental Training Configuration
+INCREMENTAL_TREES_PER_UPDATE = 10
+INCREMENTAL_MAX_TREES = 300        # oldest trees are evicted beyond this
+INCREMENTAL_HOLDOUT_WINDOW = 7     # updates whose holdouts form the evaluation set
+
+# OOB Early Stopping
+# Trees are added EARLY_STOPPING_STEP at a time until the out-of-bag accuracy
+# has not improved by more than EARLY_STOPPING_TOLERANCE for
+# EARLY_STOPPING_PATIENCE steps
+EARLY_STOPPING_STEP = 10
+EARLY_STOPPING_TOLERANCE = 0.002
+EARLY_STOPPING_PATIENCE = 3
+EARLY_STOPPING_MAX_TREES = 500
+
+# Training Instrumentation
+# Stages always record wall time and peak RSS; tracemalloc peaks are opt-in
+# because tracing slows allocation-heavy stages several times over and skews
+# their timings (the hyperparameter search is never traced)
+TRACK_STAGE_MEMORY = False
+
+# Background Training Jobs
+TRAINING_JOB_WORKERS = 1  # each forest fit already uses every core
+TREE_BATCH_SIZE = 10  # trees grown between progress reports
+TRAINING_JOB_REFRESH_SECONDS = 2.0  # live progress refresh (Streamlit versions with fragments)
+# Finished jobs kept per owner, and for at most this long, before their models are deleted
+TRAINING_JOB_KEEP_FINISHED = 5
+TRAINING_JOB_TTL_SECONDS = 24 * 60 * 60
+
+# Feature Profile
+# Summary of the training features stored with each model for input forms;
+# quantiles are computed from at most FEATURE_PROFILE_SAMPLE_ROWS rows
+FEATURE_PROFILE_QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+FEATURE_PROFILE_SAMPLE_ROWS = 100_000
+
+# Inference Configuration
+# Batches up to this size are scored by the FlatForest engine; larger ones
+# go to sklearn's compiled (multi-threaded) predict_proba
+FAST_INFERENCE_MAX_ROWS = 1000
+# Predictions remembered per session on the Make Predictions page
+PREDICTION_MEMO_ENTRIES = 128
+
 # Data Configuration
 TARGET_COLUMN = 'Depression'
+# Rows per chunk for out-of-core preparation of large CSV files
+STREAM_CHUNK_ROWS = 100_000
 TEST_SIZE_DEFAULT = 0.2
 RANDOM_STATE_DEFAULT = 42
 
+# CSV parsing: 'pyarrow' parses with Arrow's multithreaded reader, 'c' is
+# pandas' single-threaded default. With CSV_ARROW_DTYPES the pyarrow engine
+# keeps Arrow-backed columns (converted to NumPy only for model training)
+CSV_ENGINE = 'pyarrow'
+CSV_ARROW_DTYPES = True
+
+# Loaded datasets get compact dtypes (category, narrow ints, float32)
+COMPACT_DTYPES_ON_LOAD = True
+# Object columns with at most this share of distinct values become categorical
+CATEGORY_MAX_UNIQUE_FRACTION = 0.05
+
+# URL Loading
+URL_MAX_BYTES = 500 * 1024 ** 2  # decompressed CSV size limit
+URL_CONNECT_TIMEOUT = 10  # seconds to establish the connection
+URL_READ_TIMEOUT = 30  # seconds allowed between received packets
+URL_TOTAL_TIMEOUT = 600  # seconds allowed for the whole download
+# Parsed URL datasets are cached as Feather files and revalidated with
+# conditional GETs once older than the TTL
+URL_CACHE_PATH = 'cache/urls'
+URL_CACHE_TTL = 3600  # seconds
+URL_CACHE_MAX_BYTES = 1024 ** 3  # least recently used datasets are evicted beyond this
+# Parsed uploads are cached as Feather files keyed by a hash of the file
+UPLOAD_CACHE_PATH = 'cache/uploads'
+UPLOAD_CACHE_MAX_BYTES = 1024 ** 3
+
+# Dataset Profiling
+# Statistics are exact up to PROFILE_EXACT_MAX_ROWS rows; above that, distinct
+# counts come from HyperLogLog sketches (2**PROFILE_HLL_PRECISION registers)
+# and string memory from a PROFILE_SAMPLE_ROWS-row sample
+PROFILE_EXACT_MAX_ROWS = 200_000
+PROFILE_HLL_PRECISION = 14  # ~0.8% relative standard error
+PROFILE_SAMPLE_ROWS = 20_000
+PROFILE_CACHE_ENTRIES = 32  # profiles kept per process, one per dataset hash
+
+# Prediction comparison plot: with more points than this the per-row scatter
+# gives way to an aggregated view, 'bubble' (confusion counts) or 'hexbin'
+PREDICTION_PLOT_SCATTER_MAX_POINTS = 5000
+PREDICTION_PLOT_LARGE_MODE = 'bubble'
+
+# Correlations: computed in float32 from at most CORRELATION_MAX_ROWS rows;
+# the heatmap shows the features most correlated with the target
+CORRELATION_MAX_ROWS = 200_000
+CORRELATION_TOP_PAIRS = 10
+CORRELATION_HEATMAP_MAX_FEATURES = 20
+CORRELATION_ANNOTATE_MAX_FEATURES = 20  # larger heatmaps are drawn without cell labels
+
+# Rendered plots are cached as PNG bytes per (plot, dataset, model, params)
+FIGURE_CACHE_MAX_BYTES = 64 * 1024 ** 2  # least recently used images are evicted beyond this
+FIGURE_DPI = 200  # matches st.pyplot's rendering
+
 # File Paths
-MODEL_SAVE_PATH = 'models/depression_model.pkl'
+# Root of the versioned model artifact store (one sub-directory per version)
+MODEL_SAVE_PATH = 'models/depression_model'
+# Models trained by background jobs (one store per job id)
+JOB_ARTIFACT_PATH = 'models/jobs'
 
 # UI Configuration
 COLORS = {
@@ -30,6 +133,10 @@ COLORS = {
     'warning': '#f093fb',
     'info': '#4facfe'
 }
+# Show a caption counting script runs per user interaction (one is ideal)
+SHOW_RUN_COUNTER = False
+# Show the first-run timings and per-module import times of heavy modules
+SHOW_STARTUP_REPORT = False
 
 # Chart Configuration
 CHART_COLORS = ['#667eea', '#764ba2', '#f093fb', '#4facfe', '#43e97b']
@@ -0,0 +1,431 @@
+# dataset_cache.py
+import os
+import json
+import time
+import hashlib
+import weakref
+import threading
+
+import numpy as np
+import pandas as pd
+from pyarrow import feather
+
+from config import (
+    URL_CACHE_PATH, URL_CACHE_TTL, URL_CACHE_MAX_BYTES,
+    UPLOAD_CACHE_PATH, UPLOAD_CACHE_MAX_BYTES
+)
+
+
+class _FeatherDatasetStore:
+    """
+    Directory of parsed datasets stored as Feather files.
+
+    Each dataset has a Feather file and a small JSON entry with its size
+    and access time; the least recently used datasets are evicted once
+    the directory exceeds its size budget.
+    """
+
+    def __init__(self, root, max_bytes):
+        """
+        Initialize the store.
+
+        Args:
+            root (str): Directory holding the cached datasets
+            max_bytes (int): Total size of cached datasets before eviction
+        """
+        self.root = root
+        self.max_bytes = max_bytes
+
+    def _paths(self, key):
+        return os.path.join(self.root, f"{key}.feather"), os.path.join(self.root, f"{key}.json")
+
+    def _write_entry(self, key, entry):
+        entry_path = self._paths(key)[1]
+        tmp_path = f"{entry_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, entry_path)
+
+    def _read_entry(self, key):
+        data_path, entry_path = self._paths(key)
+        try:
+            with open(entry_path) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return entry if os.path.isfile(data_path) else None
+
+    def _read_frame(self, key):
+        """Read a cached dataset and mark it as recently used."""
+        entry = self._read_entry(key)
+        table = feather.read_table(self._paths(key)[0])
+        # Frames parsed with Arrow-backed dtypes come back the same way
+        arrow_backed = entry is not None and entry.get('arrow_backed')
+        df = table.to_pandas(types_mapper=pd.ArrowDtype if arrow_backed else None)
+        # Arrow turns missing strings into None; restore read_csv's NaN,
+        # touching only the columns Arrow knows contain nulls
+        for name in table.column_names:
+            if table.column(name).null_count and df[name].dtype == object:
+                df[name] = df[name].fillna(np.nan)
+
+        if entry is not None:
+            entry['last_used'] = time.time()
+            self._write_entry(key, entry)
+        return df
+
+    def _write_frame(self, key, df, **fields):
+        """
+        Cache a dataset, then evict to the size budget.
+
+        Returns:
+            bool: Whether the dataset was cached (Feather cannot store
+                every frame, e.g. mixed-type object columns)
+        """
+        data_path = self._paths(key)[0]
+        os.makedirs(self.root, exist_ok=True)
+        tmp_path = f"{data_path}.tmp"
+        try:
+            df.to_feather(tmp_path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return False
+        os.replace(tmp_path, data_path)
+
+        now = time.time()
+        self._write_entry(key, {
+            'key': key,
+            **fields,
+            'arrow_backed': any(isinstance(dtype, pd.ArrowDtype) for dtype in df.dtypes),
+            'fetched_at': now,
+            'last_used': now,
+            'size': os.path.getsize(data_path)
+        })
+        self.evict()
+        return True
+
+    def entries(self):
+        """
+        List all cache entries.
+
+        Returns:
+            list: Entries, least recently used first
+        """
+        if not os.path.isdir(self.root):
+            return []
+
+        entries = []
+        for name in os.listdir(self.root):
+            if not name.endswith('.json'):
+                continue
+            try:
+                with open(os.path.join(self.root, name)) as f:
+                    entries.append(json.load(f))
+            except (OSError, ValueError):
+                continue
+        return sorted(entries, key=lambda entry: entry['last_used'])
+
+    def evict(self):
+        """Delete least recently used datasets until the cache fits max_bytes."""
+        entries = self.entries()
+        total = sum(entry['size'] for entry in entries)
+        for entry in entries:
+            if total <= self.max_bytes:
+                break
+            for path in self._paths(entry['key']):
+                if os.path.exists(path):
+                    os.remove(path)
+            total -= entry['size']
+
+
+class URLDatasetCache(_FeatherDatasetStore):
+    """
+    On-disk cache of parsed URL datasets.
+
+    Entries keep the response's ETag/Last-Modified validators. Entries
+    younger than the TTL are served without contacting the server; older
+    ones are revalidated with a conditional GET.
+    """
+
+    def __init__(self, root=URL_CACHE_PATH, ttl=URL_CACHE_TTL, max_bytes=URL_CACHE_MAX_BYTES):
+        """
+        Initialize the cache.
+
+        Args:
+            root (str): Directory holding the cached datasets
+            ttl (float): Seconds an entry is served without revalidation
+            max_bytes (int): Total size of cached datasets before eviction
+        """
+        super().__init__(root, max_bytes)
+        self.ttl = ttl
+
+    @staticmethod
+    def _key(url):
+        return hashlib.sha256(url.encode('utf-8')).hexdigest()[:32]
+
+    def lookup(self, url):
+        """
+        Return the cache entry for a URL.
+
+        Args:
+            url (str): Dataset URL
+
+        Returns:
+            dict: url, etag, last_modified, fetched_at, last_used and size;
+                None if the URL is not cached
+        """
+        entry = self._read_entry(self._key(url))
+        if entry is None or entry.get('url') != url:
+            return None
+        return entry
+
+    def is_fresh(self, entry):
+        """Whether an entry is younger than the TTL."""
+        return time.time() - entry['fetched_at'] < self.ttl
+
+    def conditional_headers(self, entry):
+        """
+        Build conditional-GET headers from an entry's validators.
+
+        Args:
+            entry (dict): Cache entry from lookup()
+
+        Returns:
+            dict: If-None-Match / If-Modified-Since headers
+        """
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def read(self, url):
+        """
+        Read a cached dataset and mark it as recently used.
+
+        Args:
+            url (str): Dataset URL
+
+        Returns:
+            pd.DataFrame: Cached dataset
+        """
+        return self._read_frame(self._key(url))
+
+    def revalidated(self, url):
+        """
+        Restart an entry's TTL after the server confirmed it is unchanged.
+
+        Args:
+            url (str): Dataset URL
+        """
+        entry = self.lookup(url)
+        if entry is not None:
+            entry['fetched_at'] = time.time()
+            self._write_entry(self._key(url), entry)
+
+    def store(self, url, df, headers):
+        """
+        Cache a freshly downloaded dataset.
+
+        Responses without an ETag or Last-Modified validator are cached
+        too; they are re-downloaded once their TTL expires.
+
+        Args:
+            url (str): Dataset URL
+            df (pd.DataFrame): Parsed dataset
+            headers (Mapping): Response headers
+
+        Returns:
+            bool: Whether the dataset was cached
+        """
+        return self._write_frame(
+            self._key(url), df,
+            url=url,
+            etag=headers.get('ETag'),
+            last_modified=headers.get('Last-Modified')
+        )
+
+
+class UploadDatasetCache(_FeatherDatasetStore):
+    """
+    On-disk cache of parsed uploads keyed by a hash of the file's bytes.
+
+    The same file uploaded again, by any session, is read back from its
+    Feather copy instead of being parsed as CSV. Hits and misses are
+    counted per process.
+    """
+
+    def __init__(self, root=UPLOAD_CACHE_PATH, max_bytes=UPLOAD_CACHE_MAX_BYTES):
+        """
+        Initialize the cache.
+
+        Args:
+            root (str): Directory holding the cached datasets
+            max_bytes (int): Total size of cached datasets before eviction
+        """
+        super().__init__(root, max_bytes)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def content_hash(file):
+        """
+        Hash a file object's bytes without reading it into memory at once.
+
+        Args:
+            file: Binary file object (e.g. Streamlit UploadedFile)
+
+        Returns:
+            str: sha256 hex digest
+        """
+        file.seek(0)
+        digest = hashlib.sha256()
+        for block in iter(lambda: file.read(1 << 20), b''):
+            digest.update(block)
+        file.seek(0)
+        return digest.hexdigest()
+
+    def load(self, file, parse=pd.read_csv):
+        """
+        Return the parsed dataset for an uploaded file.
+
+        Args:
+            file: Binary file object positioned anywhere
+            parse (callable): Parser used on a miss
+
+        Returns:
+            pd.DataFrame: Parsed dataset
+        """
+        key = self.content_hash(file)
+        if self._read_entry(key) is not None:
+            with self._lock:
+                self.hits += 1
+            return self._read_frame(key)
+
+        with self._lock:
+            self.misses += 1
+        df = parse(file)
+        self._write_frame(key, df, name=getattr(file, 'name', None))
+        return df
+
+    def stats(self):
+        """
+        Return cache counters and disk usage.
+
+        Returns:
+            dict: hits, misses, entries, size_bytes and max_bytes
+        """
+        entries = self.entries()
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'entries': len(entries),
+            'size_bytes': sum(entry['size'] for entry in entries),
+            'max_bytes': self.max_bytes
+        }
+
+
+class DatasetHandle:
+    """
+    A session's reference to a dataset in a SharedDatasetStore.
+
+    df is the session's own copy-on-write view of the shared frame: it
+    shares the data until the session modifies it. The reference is
+    released explicitly or when the handle is garbage-collected with the
+    session.
+    """
+
+    def __init__(self, store, key, df):
+        self.key = key
+        self.df = df.copy(deep=False)
+        self._finalizer = weakref.finalize(self, store._release, key)
+
+    def release(self):
+        """Drop this reference; safe to call more than once."""
+        self._finalizer()
+
+
+class SharedDatasetStore:
+    """
+    Process-wide store of loaded datasets, shared between sessions.
+
+    Datasets are keyed by a hash of their contents, so sessions loading
+    the same data share one frame instead of holding a copy each. A
+    dataset is dropped once no handle references it. Sessions must only
+    get copy-on-write views, so pandas' Copy-on-Write mode
+    (pd.options.mode.copy_on_write) has to be enabled.
+    """
+
+    def __init__(self):
+        self._datasets = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def content_key(df):
+        """
+        Hash a DataFrame's columns, dtypes, index and values.
+
+        Args:
+            df (pd.DataFrame): Dataset
+
+        Returns:
+            str: sha256 hex digest
+        """
+        digest = hashlib.sha256()
+        digest.update(repr([(str(col), str(dtype)) for col, dtype in df.dtypes.items()]).encode('utf-8'))
+        digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+        return digest.hexdigest()
+
+    def share(self, df):
+        """
+        Register a dataset and return a handle to the shared copy.
+
+        If an identical dataset is already stored, df is discarded in
+        favour of it.
+
+        Args:
+            df (pd.DataFrame): Freshly loaded dataset
+
+        Returns:
+            DatasetHandle: Handle whose df is a copy-on-write view
+        """
+        if not pd.options.mode.copy_on_write:
+            raise RuntimeError("SharedDatasetStore requires pandas Copy-on-Write mode")
+
+        key = self.content_key(df)
+        with self._lock:
+            entry = self._datasets.get(key)
+            if entry is None:
+                entry = self._datasets[key] = {
+                    'df': df,
+                    'refs': 0,
+                    'memory_bytes': int(df.memory_usage(deep=True).sum())
+                }
+            entry['refs'] += 1
+            return DatasetHandle(self, key, entry['df'])
+
+    def _release(self, key):
+        with self._lock:
+            entry = self._datasets.get(key)
+            if entry is None:
+                return
+            entry['refs'] -= 1
+            if entry['refs'] <= 0:
+                del self._datasets[key]
+
+    def stats(self):
+        """
+        Return the number of shared datasets, references and their size.
+
+        Returns:
+            dict: datasets, references and memory_bytes
+        """
+        with self._lock:
+            entries = list(self._datasets.values())
+        return {
+            'datasets': len(entries),
+            'references': sum(entry['refs'] for entry in entries),
+            'memory_bytes': sum(entry['memory_bytes'] for entry in entries)
+        }
@@ -0,0 +1,173 @@
+# dataset_profile.py
+import sys
+
+import numpy as np
+import pandas as pd
+
+from config import PROFILE_EXACT_MAX_ROWS, PROFILE_HLL_PRECISION, PROFILE_SAMPLE_ROWS
+
+# Multiplier used to fold column hashes into row hashes (64-bit FNV prime)
+_ROW_HASH_PRIME = np.uint64(0x100000001B3)
+
+
+def _leading_zeros(x):
+    """Count leading zero bits of each non-zero uint64."""
+    # frexp gives a value's bit length; 32-bit halves convert to float exactly
+    _, high_bits = np.frexp((x >> np.uint64(32)).astype(np.float64))
+    _, low_bits = np.frexp((x & np.uint64(0xFFFFFFFF)).astype(np.float64))
+    return np.where(high_bits > 0, 32 - high_bits, 64 - low_bits).astype(np.uint8)
+
+
+class HyperLogLog:
+    """
+    HyperLogLog distinct-count sketch over 64-bit hashes.
+
+    Memory is fixed at 2**precision one-byte registers whatever the number
+    of values; the estimate's relative standard error is
+    1.04 / sqrt(2**precision).
+    """
+
+    def __init__(self, precision=PROFILE_HLL_PRECISION):
+        """
+        Initialize an empty sketch.
+
+        Args:
+            precision (int): Number of hash bits selecting a register (4-18)
+        """
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    @property
+    def relative_error(self):
+        """Relative standard error of count()."""
+        return 1.04 / np.sqrt(len(self.registers))
+
+    def add_hashes(self, hashes):
+        """
+        Add values by their uint64 hashes.
+
+        Args:
+            hashes (np.ndarray): uint64 hash per value
+        """
+        p = np.uint64(self.precision)
+        register = (hashes >> (np.uint64(64) - p)).astype(np.intp)
+        # A guard bit below the remaining bits caps the rank at 64 - p + 1
+        rest = (hashes << p) | (np.uint64(1) << (p - np.uint64(1)))
+        np.maximum.at(self.registers, register, _leading_zeros(rest) + 1)
+
+    def count(self):
+        """
+        Estimate the number of distinct values added.
+
+        Returns:
+            float: Estimated distinct count
+        """
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.exp2(-self.registers.astype(np.float64)))
+        empty = np.count_nonzero(self.registers == 0)
+        if estimate <= 2.5 * m and empty:
+            # Linear counting is more accurate for small cardinalities
+            estimate = m * np.log(m / empty)
+        return float(estimate)
+
+
+def _sampled_object_memory(series, sample_rows, rng):
+    """
+    Estimate a column's deep memory from a sample of its values.
+
+    Returns:
+        tuple: (estimated bytes, 95% relative error bound)
+    """
+    n = len(series)
+    sample = series.to_numpy()[rng.choice(n, size=sample_rows, replace=False)]
+    sizes = np.fromiter((sys.getsizeof(value) for value in sample), dtype=np.float64, count=sample_rows)
+    mean = sizes.mean()
+    pointers = series.memory_usage(deep=False, index=False)
+    estimate = pointers + n * mean
+    bound = 1.96 * n * sizes.std() / np.sqrt(sample_rows) / estimate if mean else 0.0
+    return estimate, bound
+
+
+def profile_dataset(df, exact_max_rows=PROFILE_EXACT_MAX_ROWS, sample_rows=PROFILE_SAMPLE_ROWS,
+                    precision=PROFILE_HLL_PRECISION, seed=0):
+    """
+    Compute the dataset overview statistics in one pass over the columns.
+
+    Up to exact_max_rows rows every statistic is exact. Larger datasets
+    are hashed once per column; the hashes feed HyperLogLog distinct
+    counts and row hashes for the duplicate count (exact barring 64-bit
+    collisions), and object-column memory is estimated from a sample.
+    error_bounds gives the 95% relative error of each approximate
+    statistic.
+
+    Args:
+        df (pd.DataFrame): Dataset
+        exact_max_rows (int): Largest dataset profiled exactly
+        sample_rows (int): Rows sampled for string memory estimates
+        precision (int): HyperLogLog precision
+        seed (int): Seed for the memory sample
+
+    Returns:
+        dict: get_dataset_info keys plus column_stats (per-column dtype,
+            non-null and distinct counts), approximate and error_bounds
+    """
+    n_rows = len(df)
+    approximate = n_rows > exact_max_rows
+    rng = np.random.default_rng(seed)
+    row_hashes = np.zeros(n_rows, dtype=np.uint64) if approximate else None
+    memory_bound = 0.0
+    memory_bytes = float(df.index.memory_usage(deep=True))
+    column_stats = []
+
+    for col in df.columns:
+        series = df[col]
+        non_null = series.notna().to_numpy()
+        n_non_null = int(non_null.sum())
+
+        if not approximate:
+            unique = series.nunique()
+            memory = series.memory_usage(deep=True, index=False)
+        else:
+            hashes = pd.util.hash_pandas_object(series, index=False).to_numpy()
+            row_hashes = row_hashes * _ROW_HASH_PRIME ^ hashes
+            sketch = HyperLogLog(precision)
+            sketch.add_hashes(hashes[non_null])
+            unique = int(round(min(sketch.count(), n_non_null)))
+            if series.dtype == object and n_rows > sample_rows:
+                memory, bound = _sampled_object_memory(series, sample_rows, rng)
+                memory_bound = max(memory_bound, bound)
+            else:
+                memory = series.memory_usage(deep=True, index=False)
+
+        memory_bytes += memory
+        column_stats.append({
+            'column': col,
+            'dtype': str(series.dtype),
+            'non_null': n_non_null,
+            'unique': unique
+        })
+
+    if approximate:
+        duplicates = n_rows - len(np.unique(row_hashes))
+    else:
+        duplicates = int(df.duplicated().sum())
+
+    memory_usage_kb = memory_bytes / 1024
+    return {
+        'rows': n_rows,
+        'columns': df.shape[1],
+        'missing_values': int(sum(n_rows - stats['non_null'] for stats in column_stats)),
+        'memory_usage_kb': memory_usage_kb,
+        'memory_before_kb': df.attrs.get('memory_before_compaction_kb', memory_usage_kb),
+        'dtypes': df.dtypes.to_dict(),
+        'numeric_columns': df.select_dtypes(include=[np.number]).columns.tolist(),
+        'categorical_columns': [col for col in df.columns if not pd.api.types.is_numeric_dtype(df[col].dtype)],
+        'duplicates': duplicates,
+        'column_stats': column_stats,
+        'approximate': approximate,
+        'error_bounds': {
+            'unique': 1.96 * 1.04 / np.sqrt(1 << precision),
+            'memory_usage_kb': memory_bound
+        } if approximate else {}
+    }
@@ -0,0 +1,186 @@
+# feature_correlations.py
+import warnings
+
+import numpy as np
+import pandas as pd
+from scipy.cluster.hierarchy import linkage, leaves_list
+from scipy.spatial.distance import squareform
+
+from config import TARGET_COLUMN, CORRELATION_MAX_ROWS, CORRELATION_TOP_PAIRS
+
+
+def _encoded_column(series):
+    """
+    Return a column as float32 with NaN for missing values.
+
+    Non-numeric columns are label-encoded in sorted order, as the
+    trainer's LabelEncoder does.
+    """
+    if pd.api.types.is_bool_dtype(series.dtype) or pd.api.types.is_numeric_dtype(series.dtype):
+        return series.to_numpy(dtype=np.float32, na_value=np.nan)
+    codes, _ = pd.factorize(series, sort=True)
+    codes = codes.astype(np.float32)
+    codes[codes < 0] = np.nan
+    return codes
+
+
+class FeatureCorrelations:
+    """
+    Pearson correlations between a dataset's features and with its target.
+
+    The matrix is computed once, in float32, with a single matrix product
+    over the standardized columns; missing values are mean-imputed and
+    datasets longer than CORRELATION_MAX_ROWS are sampled, so the cost is
+    O(rows * columns**2) with a fixed row count.
+    """
+
+    def __init__(self, columns, matrix, target_correlations=None, n_rows=None, n_rows_used=None):
+        """
+        Initialize from a computed correlation matrix.
+
+        Args:
+            columns (list): Feature names
+            matrix (np.ndarray): float32 correlation matrix (NaN for
+                constant columns)
+            target_correlations (pd.Series): Correlation of each feature
+                with the encoded target, or None without a target
+            n_rows (int): Rows in the dataset
+            n_rows_used (int): Rows the correlations were computed from
+        """
+        self.columns = list(columns)
+        self.matrix = matrix
+        self.target_correlations = target_correlations
+        self.n_rows = n_rows
+        self.n_rows_used = n_rows_used
+
+    @classmethod
+    def from_dataframe(cls, df, target_column=TARGET_COLUMN, max_rows=CORRELATION_MAX_ROWS, seed=0):
+        """
+        Compute the correlations of every column of a dataset.
+
+        Args:
+            df (pd.DataFrame): Dataset; numeric, categorical and string
+                columns are all included
+            target_column (str): Target column, correlated separately
+            max_rows (int): Rows sampled from longer datasets
+            seed (int): Seed for the row sample
+
+        Returns:
+            FeatureCorrelations: Computed correlations
+        """
+        n_rows = len(df)
+        if n_rows > max_rows:
+            rows = np.sort(np.random.default_rng(seed).choice(n_rows, size=max_rows, replace=False))
+            df = df.iloc[rows]
+
+        columns = list(df.columns)
+        X = np.empty((len(df), len(columns)), dtype=np.float32)
+        for i, col in enumerate(columns):
+            X[:, i] = _encoded_column(df[col])
+
+        # Standardize, then mean-impute (a centred NaN becomes 0)
+        with warnings.catch_warnings(), np.errstate(invalid='ignore', divide='ignore'):
+            warnings.simplefilter('ignore', RuntimeWarning)  # all-missing columns
+            X -= np.nanmean(X, axis=0)
+            np.nan_to_num(X, copy=False, nan=0.0)
+            norms = np.sqrt(np.einsum('ij,ij->j', X, X))
+            X /= norms
+            matrix = X.T @ X
+        np.clip(matrix, -1, 1, out=matrix)
+        constant = ~(norms > 0)
+        matrix[constant, :] = np.nan
+        matrix[:, constant] = np.nan
+
+        target_correlations = None
+        if target_column in columns:
+            t = columns.index(target_column)
+            keep = [i for i in range(len(columns)) if i != t]
+            target_correlations = pd.Series(matrix[t, keep], index=[columns[i] for i in keep])
+            matrix = matrix[np.ix_(keep, keep)]
+            columns = [columns[i] for i in keep]
+
+        return cls(columns, matrix, target_correlations, n_rows=n_rows, n_rows_used=len(df))
+
+    @property
+    def sampled(self):
+        """Whether the correlations come from a row sample."""
+        return self.n_rows_used < self.n_rows
+
+    def to_frame(self):
+        """
+        Return the correlation matrix as a DataFrame.
+
+        Returns:
+            pd.DataFrame: Features x features correlations
+        """
+        return pd.DataFrame(self.matrix, index=self.columns, columns=self.columns)
+
+    def top_pairs(self, k=CORRELATION_TOP_PAIRS):
+        """
+        Return the k most strongly correlated feature pairs.
+
+        Args:
+            k (int): Number of pairs
+
+        Returns:
+            pd.DataFrame: Feature A, Feature B and Correlation, strongest first
+        """
+        rows, cols = np.triu_indices(len(self.columns), k=1)
+        values = self.matrix[rows, cols]
+        strength = np.nan_to_num(np.abs(values), nan=-1.0)
+        k = min(k, len(values))
+        top = np.argpartition(-strength, k - 1)[:k] if k else np.array([], dtype=int)
+        top = top[np.argsort(-strength[top], kind='stable')]
+        return pd.DataFrame({
+            'Feature A': [self.columns[i] for i in rows[top]],
+            'Feature B': [self.columns[i] for i in cols[top]],
+            'Correlation': values[top]
+        })
+
+    def target_ranking(self):
+        """
+        Return the target correlations, strongest first.
+
+        Returns:
+            pd.Series: Correlation with the encoded target per feature, or
+                None without a target
+        """
+        if self.target_correlations is None:
+            return None
+        order = np.argsort(-np.nan_to_num(np.abs(self.target_correlations.to_numpy()), nan=-1.0), kind='stable')
+        return self.target_correlations.iloc[order]
+
+    def select_features(self, max_features, cluster=True):
+        """
+        Choose the features shown in a heatmap.
+
+        Features are ranked by their absolute correlation with the target
+        (or, without a target, by their strongest correlation with another
+        feature); constant features are left out. The selection is then
+        ordered by average-linkage clustering on 1 - |r| so correlated
+        features sit next to each other.
+
+        Args:
+            max_features (int): Largest number of features returned
+            cluster (bool): Order the selection by clustering
+
+        Returns:
+            list: Selected feature indices in display order
+        """
+        valid = np.flatnonzero(~np.isnan(np.diag(self.matrix)))
+        if self.target_correlations is not None:
+            score = np.abs(self.target_correlations.to_numpy())
+        else:
+            off_diagonal = np.nan_to_num(np.abs(self.matrix), nan=-1.0)
+            np.fill_diagonal(off_diagonal, -1.0)
+            score = off_diagonal.max(axis=1)
+        score = np.nan_to_num(score[valid], nan=-1.0)
+        selected = np.sort(valid[np.argsort(-score, kind='stable')[:max_features]])
+
+        if cluster and len(selected) > 2:
+            distance = 1 - np.abs(self.matrix[np.ix_(selected, selected)].astype(np.float64))
+            distance = np.nan_to_num((distance + distance.T) / 2, nan=1.0)
+            np.fill_diagonal(distance, 0)
+            order = leaves_list(linkage(squareform(distance, checks=False), method='average'))
+            selected = selected[order]
+        return selected.tolist()
@@ -0,0 +1,124 @@
+# figure_cache.py
+import io
+import threading
+from collections import OrderedDict
+
+import matplotlib.pyplot as plt
+
+from config import FIGURE_CACHE_MAX_BYTES, FIGURE_DPI
+
+
+def render_figure(fig, fmt='png', dpi=FIGURE_DPI):
+    """
+    Render a Figure to image bytes and close it.
+
+    The plot functions in utils build their figures outside pyplot, so
+    closing only matters for a figure created through pyplot, which its
+    global registry would otherwise keep alive.
+
+    Args:
+        fig (matplotlib.figure.Figure): Figure to render
+        fmt (str): 'png' or 'svg'
+        dpi (int): Resolution of raster formats
+
+    Returns:
+        bytes: Encoded image
+    """
+    try:
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format=fmt, dpi=dpi, bbox_inches='tight')
+        return buffer.getvalue()
+    finally:
+        plt.close(fig)
+
+
+class FigureCache:
+    """
+    Process-wide LRU cache of rendered plots.
+
+    Plots are stored as encoded PNG/SVG bytes under a caller-supplied key
+    (plot type, dataset hash, model hash, parameters), so a cached plot is
+    served without building a Figure at all. The least recently used
+    images are evicted once the cache exceeds its size budget.
+    """
+
+    def __init__(self, max_bytes=FIGURE_CACHE_MAX_BYTES, dpi=FIGURE_DPI):
+        """
+        Initialize the cache.
+
+        Args:
+            max_bytes (int): Total size of cached images before eviction
+            dpi (int): Resolution of rendered PNGs
+        """
+        self.max_bytes = max_bytes
+        self.dpi = dpi
+        self.hits = 0
+        self.misses = 0
+        self._images = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get_or_render(self, key, plot, fmt='png'):
+        """
+        Return a plot's image bytes, rendering it on a miss.
+
+        Args:
+            key (tuple): Hashable identity of the plot and everything it
+                depends on; None renders without caching
+            plot (callable): Builds the Figure (may return None for no plot)
+            fmt (str): 'png' or 'svg'
+
+        Returns:
+            bytes: Encoded image, or None if plot() returned None
+        """
+        if key is not None:
+            key = (fmt, *key)
+            with self._lock:
+                image = self._images.get(key)
+                if image is not None:
+                    self._images.move_to_end(key)
+                    self.hits += 1
+                    return image
+                self.misses += 1
+
+        # Rendered outside the lock so other sessions are not blocked
+        fig = plot()
+        if fig is None:
+            return None
+        image = render_figure(fig, fmt=fmt, dpi=self.dpi)
+
+        if key is not None:
+            with self._lock:
+                if key not in self._images:
+                    self._images[key] = image
+                    self._size += len(image)
+                self._evict()
+        return image
+
+    def _evict(self):
+        """Drop least recently used images until the cache fits max_bytes."""
+        while self._size > self.max_bytes and len(self._images) > 1:
+            _, image = self._images.popitem(last=False)
+            self._size -= len(image)
+
+    def clear(self):
+        """Drop every cached image."""
+        with self._lock:
+            self._images.clear()
+            self._size = 0
+
+    def stats(self):
+        """
+        Return cache counters and memory usage.
+
+        Returns:
+            dict: hits, misses, entries, size_bytes and max_bytes
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'entries': len(self._images),
+                'size_bytes': self._size,
+                'max_bytes': self.max_bytes
+            }
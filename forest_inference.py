@@ -0,0 +1,256 @@
+# forest_inference.py
+import numpy as np
+import sklearn
+
+# Since scikit-learn 1.4 tree_.value stores class fractions and
+# DecisionTreeClassifier.predict_proba returns them without renormalizing
+_SKLEARN_VERSION = tuple(int(part) for part in sklearn.__version__.split('.')[:2])
+_VALUES_ARE_FRACTIONS = _SKLEARN_VERSION >= (1, 4)
+
+
+class FlatForest:
+    """
+    Flattened, NumPy-only inference engine for a fitted RandomForestClassifier.
+
+    All trees are concatenated into contiguous node arrays (feature,
+    threshold, children, leaf values) and a batch is routed through every
+    tree at once with vectorized indexing, avoiding sklearn's per-call
+    validation and joblib dispatch.
+    """
+
+    def __init__(self, feature, threshold, children, missing_go_to_left, values,
+                 roots, classes, max_depth, feature_importances=None, block_size=4096):
+        """
+        Initialize the engine from flattened node arrays.
+
+        Args:
+            feature (np.ndarray): Split feature per node (0 for leaves)
+            threshold (np.ndarray): float32 split threshold per node, rounded
+                down so ``x <= threshold`` decides exactly like sklearn
+            children (np.ndarray): Global child indices packed as
+                ``[right, left]`` pairs per node (leaves point to themselves)
+            missing_go_to_left (np.ndarray): Whether NaN goes left per node
+            values (np.ndarray): Class probabilities per node
+            roots (np.ndarray): Global index of each tree's root node
+            classes (np.ndarray): Class labels as in ``estimator.classes_``
+            max_depth (int): Maximum depth over all trees
+            feature_importances (np.ndarray): Optional impurity importances
+            block_size (int): Rows routed per block to bound memory
+        """
+        self.feature = feature
+        self.threshold = threshold
+        self.children = children
+        self.missing_go_to_left = missing_go_to_left
+        self.values = values
+        self.roots = roots
+        self.classes_ = classes
+        self.max_depth = int(max_depth)
+        self.feature_importances_ = feature_importances
+        self.block_size = block_size
+
+    @classmethod
+    def from_estimator(cls, forest, block_size=4096):
+        """
+        Compile a fitted RandomForestClassifier into flat node arrays.
+
+        Args:
+            forest (RandomForestClassifier): Fitted single-output forest
+            block_size (int): Rows routed per block to bound memory
+
+        Returns:
+            FlatForest: Compiled inference engine
+        """
+        if getattr(forest, 'n_outputs_', 1) != 1:
+            raise ValueError("Only single-output forests can be compiled")
+
+        n_classes = len(forest.classes_)
+        features, thresholds, children, missing_left, values, roots = [], [], [], [], [], []
+        offset = 0
+        max_depth = 0
+
+        for estimator in forest.estimators_:
+            tree = estimator.tree_
+            is_leaf = tree.children_left == -1
+            node_ids = np.arange(tree.node_count)
+
+            # Leaves loop back to themselves so every row can take max_depth steps
+            left = np.where(is_leaf, node_ids, tree.children_left) + offset
+            right = np.where(is_leaf, node_ids, tree.children_right) + offset
+            children.append(np.column_stack([right, left]))
+            features.append(np.where(is_leaf, 0, tree.feature))
+            thresholds.append(tree.threshold)
+
+            nodes = tree.__getstate__()['nodes']
+            if 'missing_go_to_left' in nodes.dtype.names:
+                missing_left.append(nodes['missing_go_to_left'].astype(bool))
+            else:
+                missing_left.append(np.zeros(tree.node_count, dtype=bool))
+
+            # Same leaf values as DecisionTreeClassifier.predict_proba
+            proba = tree.value[:, 0, :n_classes]
+            if not _VALUES_ARE_FRACTIONS:
+                normalizer = proba.sum(axis=1)[:, np.newaxis]
+                normalizer[normalizer == 0.0] = 1.0
+                proba = proba / normalizer
+            values.append(proba)
+
+            roots.append(offset)
+            offset += tree.node_count
+            max_depth = max(max_depth, tree.max_depth)
+
+        # sklearn compares float32 features against float64 thresholds; the
+        # largest float32 not above each threshold gives identical decisions
+        threshold64 = np.concatenate(thresholds)
+        threshold32 = threshold64.astype(np.float32)
+        rounded_up = threshold32.astype(np.float64) > threshold64
+        threshold32[rounded_up] = np.nextafter(threshold32[rounded_up], np.float32(-np.inf))
+
+        return cls(
+            feature=np.ascontiguousarray(np.concatenate(features), dtype=np.int32),
+            threshold=threshold32,
+            children=np.ascontiguousarray(np.concatenate(children).ravel(), dtype=np.int32),
+            missing_go_to_left=np.concatenate(missing_left),
+            values=np.ascontiguousarray(np.concatenate(values), dtype=np.float64),
+            roots=np.asarray(roots, dtype=np.int32),
+            classes=np.asarray(forest.classes_),
+            max_depth=max_depth,
+            feature_importances=np.asarray(forest.feature_importances_),
+            block_size=block_size
+        )
+
+    def extend(self, other, max_trees=None):
+        """
+        Return a forest with another forest's trees appended.
+
+        Node arrays are concatenated with the appended trees' child and
+        root indices offset past this forest's nodes. Beyond max_trees the
+        oldest trees are evicted by slicing their nodes off the front.
+        Feature importances are averaged over the kept trees by tree count,
+        so they are approximate once trees have been evicted.
+
+        Args:
+            other (FlatForest): Forest over the same classes and features
+            max_trees (int): Forest size cap (None for no cap)
+
+        Returns:
+            FlatForest: Combined engine; this forest is left unchanged
+        """
+        if not np.array_equal(self.classes_, other.classes_):
+            raise ValueError("Only forests over the same classes can be combined")
+
+        offset = len(self.feature)
+        children = np.concatenate([self.children, other.children + offset])
+        roots = np.concatenate([self.roots, other.roots + offset])
+        n_old, n_new = self.n_estimators, other.n_estimators
+
+        arrays = {
+            'feature': np.concatenate([self.feature, other.feature]),
+            'threshold': np.concatenate([self.threshold, other.threshold]),
+            'missing_go_to_left': np.concatenate([self.missing_go_to_left, other.missing_go_to_left]),
+            'values': np.concatenate([self.values, other.values]),
+        }
+
+        evicted = max(len(roots) - max_trees, 0) if max_trees is not None else 0
+        if evicted:
+            # Trees are stored contiguously in order, so the oldest nodes come first
+            first_kept = roots[evicted]
+            arrays = {name: array[first_kept:] for name, array in arrays.items()}
+            children = children[2 * first_kept:] - first_kept
+            roots = roots[evicted:] - first_kept
+            n_old, n_new = max(n_old - evicted, 0), min(n_new, len(roots))
+
+        feature_importances = None
+        if self.feature_importances_ is not None and other.feature_importances_ is not None:
+            feature_importances = (np.asarray(self.feature_importances_) * n_old
+                                   + np.asarray(other.feature_importances_) * n_new) / (n_old + n_new)
+
+        return FlatForest(
+            children=np.ascontiguousarray(children, dtype=np.int32),
+            roots=np.asarray(roots, dtype=np.int32),
+            classes=self.classes_,
+            max_depth=max(self.max_depth, other.max_depth),
+            feature_importances=feature_importances,
+            block_size=self.block_size,
+            **{name: np.ascontiguousarray(array) for name, array in arrays.items()}
+        )
+
+    @property
+    def n_estimators(self):
+        """Number of trees in the compiled forest."""
+        return len(self.roots)
+
+    def apply(self, X):
+        """
+        Return the leaf index reached by every row in every tree.
+
+        Args:
+            X (array-like): Feature matrix of shape (n_rows, n_features)
+
+        Returns:
+            np.ndarray: Global leaf indices of shape (n_trees, n_rows)
+        """
+        # Trees split on float32 features, exactly as sklearn does
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        n_rows, n_features = X.shape
+        flat_X = X.ravel()
+        has_nan = np.isnan(flat_X).any()
+
+        row_offsets = (np.arange(n_rows, dtype=np.int32) * n_features)[np.newaxis, :]
+        nodes = np.repeat(self.roots[:, np.newaxis], n_rows, axis=1)
+        index = np.empty_like(nodes)
+        x = np.empty(nodes.shape, dtype=np.float32)
+        threshold = np.empty(nodes.shape, dtype=np.float32)
+        go_left = np.empty(nodes.shape, dtype=bool)
+
+        for _ in range(self.max_depth):
+            np.take(self.feature, nodes, out=index)
+            index += row_offsets
+            np.take(flat_X, index, out=x)
+            np.take(self.threshold, nodes, out=threshold)
+            np.less_equal(x, threshold, out=go_left)
+            if has_nan:
+                missing = np.isnan(x)
+                go_left[missing] = self.missing_go_to_left[nodes[missing]]
+            # children holds [right, left] pairs, so 2 * node + go_left picks the branch
+            nodes *= 2
+            nodes += go_left
+            np.take(self.children, nodes, out=nodes)
+
+        return nodes
+
+    def predict_proba(self, X):
+        """
+        Predict class probabilities, matching ``RandomForestClassifier.predict_proba``.
+
+        Args:
+            X (array-like): Feature matrix of shape (n_rows, n_features)
+
+        Returns:
+            np.ndarray: Class probabilities of shape (n_rows, n_classes)
+        """
+        X = np.asarray(X)
+        n_rows = X.shape[0]
+        proba = np.zeros((n_rows, len(self.classes_)), dtype=np.float64)
+
+        for start in range(0, n_rows, self.block_size):
+            stop = min(start + self.block_size, n_rows)
+            leaves = self.apply(X[start:stop])
+            block = proba[start:stop]
+            # Accumulate tree by tree in estimator order, like sklearn
+            for tree_leaves in leaves:
+                block += self.values[tree_leaves]
+
+        proba /= self.n_estimators
+        return proba
+
+    def predict(self, X):
+        """
+        Predict class labels.
+
+        Args:
+            X (array-like): Feature matrix of shape (n_rows, n_features)
+
+        Returns:
+            np.ndarray: Predicted labels from ``classes_``
+        """
+        return self.classes_.take(np.argmax(self.predict_proba(X), axis=1))
@@ -5,153 +5,176 @@ This script generates a synthetic dataset for testing the depression prediction
 
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
 
-# Set random seed for reproducibility
-np.random.seed(42)
+FEATURE_CHOICES = {
+    'Gender': (['Male', 'Female', 'Non-binary'], [0.48, 0.48, 0.04]),
+    'Physical_Activity': (['None', 'Light', 'Moderate', 'Heavy'], [0.2, 0.3, 0.3, 0.2]),
+    'Stress_Level': (['Low', 'Medium', 'High', 'Very High'], [0.2, 0.3, 0.35, 0.15]),
+    'Relationship_Status': (['Single', 'Relationship', 'Married', 'Divorced'], [0.3, 0.25, 0.35, 0.1]),
+    'Chronic_Illness': (['Yes', 'No'], [0.25, 0.75]),
+    'Family_History': (['Yes', 'No'], [0.35, 0.65]),
+    'Therapy_History': (['Yes', 'No'], [0.3, 0.7]),
+    'Medication': (['Yes', 'No'], [0.2, 0.8]),
+    'Alcohol_Consumption': (['None', 'Occasional', 'Moderate', 'Heavy'], [0.3, 0.4, 0.2, 0.1]),
+    'Diet_Quality': (['Poor', 'Fair', 'Good', 'Excellent'], [0.15, 0.35, 0.35, 0.15]),
+}
 
-# Number of samples
-n_samples = 500
 
-# Generate synthetic data
-data = {
-    'Age': np.random.randint(18, 70, n_samples),
-    'Gender': np.random.choice(['Male', 'Female', 'Non-binary'], n_samples, p=[0.48, 0.48, 0.04]),
-    'Sleep_Hours': np.random.uniform(4, 10, n_samples).round(1),
-    'Work_Hours': np.random.randint(20, 80, n_samples),
-    'Physical_Activity': np.random.choice(['None', 'Light', 'Moderate', 'Heavy'], n_samples, p=[0.2, 0.3, 0.3, 0.2]),
-    'Social_Support': np.random.randint(1, 11, n_samples),  # Scale 1-10
-    'Stress_Level': np.random.choice(['Low', 'Medium', 'High', 'Very High'], n_samples, p=[0.2, 0.3, 0.35, 0.15]),
-    'Anxiety_Score': np.random.randint(0, 21, n_samples),  # GAD-7 scale (0-21)
-    'Work_Satisfaction': np.random.randint(1, 11, n_samples),  # Scale 1-10
-    'Relationship_Status': np.random.choice(['Single', 'Relationship', 'Married', 'Divorced'], n_samples, p=[0.3, 0.25, 0.35, 0.1]),
-    'Financial_Stress': np.random.randint(1, 11, n_samples),  # Scale 1-10
-    'Chronic_Illness': np.random.choice(['Yes', 'No'], n_samples, p=[0.25, 0.75]),
-    'Family_History': np.random.choice(['Yes', 'No'], n_samples, p=[0.35, 0.65]),
-    'Therapy_History': np.random.choice(['Yes', 'No'], n_samples, p=[0.3, 0.7]),
-    'Medication': np.random.choice(['Yes', 'No'], n_samples, p=[0.2, 0.8]),
-    'Screen_Time': np.random.uniform(2, 14, n_samples).round(1),  # Hours per day
-    'Alcohol_Consumption': np.random.choice(['None', 'Occasional', 'Moderate', 'Heavy'], n_samples, p=[0.3, 0.4, 0.2, 0.1]),
-    'Diet_Quality': np.random.choice(['Poor', 'Fair', 'Good', 'Excellent'], n_samples, p=[0.15, 0.35, 0.35, 0.15]),
-}
+def generate_sample_data(n_samples=500, seed=42):
+    """
+    Generate the synthetic depression dataset.
+    
+    The defaults reproduce the bundled depression_dataset.csv.
+    
+    Args:
+        n_samples (int): Number of rows
+        seed (int): Random seed for reproducibility
+        
+    Returns:
+        pd.DataFrame: Synthetic dataset with a 'Depression' column
+    """
+    np.random.seed(seed)
+    
+    def choice(col):
+        values, p = FEATURE_CHOICES[col]
+        return np.random.choice(values, n_samples, p=p)
+    
+    # Generate synthetic data
+    data = {
+        'Age': np.random.randint(18, 70, n_samples),
+        'Gender': choice('Gender'),
+        'Sleep_Hours': np.random.uniform(4, 10, n_samples).round(1),
+        'Work_Hours': np.random.randint(20, 80, n_samples),
+        'Physical_Activity': choice('Physical_Activity'),
+        'Social_Support': np.random.randint(1, 11, n_samples),  # Scale 1-10
+        'Stress_Level': choice('Stress_Level'),
+        'Anxiety_Score': np.random.randint(0, 21, n_samples),  # GAD-7 scale (0-21)
+        'Work_Satisfaction': np.random.randint(1, 11, n_samples),  # Scale 1-10
+        'Relationship_Status': choice('Relationship_Status'),
+        'Financial_Stress': np.random.randint(1, 11, n_samples),  # Scale 1-10
+        'Chronic_Illness': choice('Chronic_Illness'),
+        'Family_History': choice('Family_History'),
+        'Therapy_History': choice('Therapy_History'),
+        'Medication': choice('Medication'),
+        'Screen_Time': np.random.uniform(2, 14, n_samples).round(1),  # Hours per day
+        'Alcohol_Consumption': choice('Alcohol_Consumption'),
+        'Diet_Quality': choice('Diet_Quality'),
+    }
+    
+    # Create DataFrame
+    df = pd.DataFrame(data)
+    
+    # Generate Depression levels based on certain factors (with some randomness)
+    df['Depression'] = calculate_depression(df, np.random.uniform(-1, 1, n_samples))
+    
+    # Add some missing values randomly (5% of data)
+    missing_cols = ['Sleep_Hours', 'Social_Support', 'Work_Satisfaction', 'Anxiety_Score']
+    for col in missing_cols:
+        mask = np.random.random(n_samples) < 0.05
+        df.loc[mask, col] = np.nan
+    
+    return df
 
-# Create DataFrame
-df = pd.DataFrame(data)
 
-# Generate Depression levels based on certain factors (with some randomness)
-def calculate_depression(row):
+def calculate_depression(df, noise):
     """
     Calculate depression level based on various factors
     This is a simplified model for synthetic data generation
+    
+    Terms are added in a fixed order so every row gets exactly the score
+    a row-by-row calculation would give.
+    
+    Args:
+        df (pd.DataFrame): Generated features
+        noise (np.ndarray): Random term per row
+        
+    Returns:
+        np.ndarray: Depression level per row
     """
-    score = 0
+    score = np.zeros(len(df))
     
     # Sleep hours (poor sleep increases depression)
-    if row['Sleep_Hours'] < 6:
-        score += 2
-    elif row['Sleep_Hours'] < 7:
-        score += 1
+    score += np.select([df['Sleep_Hours'] < 6, df['Sleep_Hours'] < 7], [2, 1], 0)
     
     # Stress level
     stress_scores = {'Low': 0, 'Medium': 1, 'High': 2, 'Very High': 3}
-    score += stress_scores.get(row['Stress_Level'], 0)
+    score += df['Stress_Level'].map(stress_scores).fillna(0).to_numpy()
     
     # Anxiety score (normalized)
-    score += row['Anxiety_Score'] / 7
+    score += df['Anxiety_Score'].to_numpy() / 7
     
     # Social support (lack of support increases depression)
-    if row['Social_Support'] < 4:
-        score += 2
-    elif row['Social_Support'] < 6:
-        score += 1
+    score += np.select([df['Social_Support'] < 4, df['Social_Support'] < 6], [2, 1], 0)
     
     # Work satisfaction (low satisfaction increases depression)
-    if row['Work_Satisfaction'] < 4:
-        score += 2
-    elif row['Work_Satisfaction'] < 6:
-        score += 1
+    score += np.select([df['Work_Satisfaction'] < 4, df['Work_Satisfaction'] < 6], [2, 1], 0)
     
     # Financial stress
-    if row['Financial_Stress'] > 7:
-        score += 2
-    elif row['Financial_Stress'] > 5:
-        score += 1
+    score += np.select([df['Financial_Stress'] > 7, df['Financial_Stress'] > 5], [2, 1], 0)
     
     # Physical activity (lack of activity increases depression)
     activity_scores = {'None': 2, 'Light': 1, 'Moderate': 0, 'Heavy': -1}
-    score += activity_scores.get(row['Physical_Activity'], 0)
+    score += df['Physical_Activity'].map(activity_scores).fillna(0).to_numpy()
     
     # Family history
-    if row['Family_History'] == 'Yes':
-        score += 1
+    score += (df['Family_History'] == 'Yes').to_numpy()
     
     # Chronic illness
-    if row['Chronic_Illness'] == 'Yes':
-        score += 1
+    score += (df['Chronic_Illness'] == 'Yes').to_numpy()
     
     # Screen time (excessive screen time)
-    if row['Screen_Time'] > 10:
-        score += 1
+    score += (df['Screen_Time'] > 10).to_numpy()
     
     # Add some randomness
-    score += np.random.uniform(-1, 1)
+    score += noise
     
     # Categorize depression level based on score
-    if score < 3:
-        return 'Minimal'
-    elif score < 6:
-        return 'Mild'
-    elif score < 9:
-        return 'Moderate'
-    elif score < 12:
-        return 'Moderately Severe'
-    else:
-        return 'Severe'
+    levels = np.array(['Minimal', 'Mild', 'Moderate', 'Moderately Severe', 'Severe'])
+    return levels[np.searchsorted([3, 6, 9, 12], score, side='right')]
 
-# Apply depression calculation
-df['Depression'] = df.apply(calculate_depression, axis=1)
 
-# Add some missing values randomly (5% of data)
-missing_cols = ['Sleep_Hours', 'Social_Support', 'Work_Satisfaction', 'Anxiety_Score']
-for col in missing_cols:
-    mask = np.random.random(n_samples) < 0.05
-    df.loc[mask, col] = np.nan
+def main():
+    df = generate_sample_data()
+    
+    # Display dataset info
+    print("=" * 60)
+    print("Sample Depression Dataset Generated Successfully!")
+    print("=" * 60)
+    print(f"\nDataset Shape: {df.shape}")
+    print(f"Total Samples: {len(df)}")
+    print(f"\nDepression Level Distribution:")
+    print(df['Depression'].value_counts().sort_index())
+    print(f"\nMissing Values:")
+    print(df.isnull().sum()[df.isnull().sum() > 0])
+    print("\n" + "=" * 60)
+    print("Dataset Preview:")
+    print("=" * 60)
+    print(df.head(10))
+
+    # Save to CSV
+    filename = 'depression_dataset.csv'
+    df.to_csv(filename, index=False)
+    print(f"\n✅ Dataset saved as '{filename}'")
 
-# Display dataset info
-print("=" * 60)
-print("Sample Depression Dataset Generated Successfully!")
-print("=" * 60)
-print(f"\nDataset Shape: {df.shape}")
-print(f"Total Samples: {len(df)}")
-print(f"\nDepression Level Distribution:")
-print(df['Depression'].value_counts().sort_index())
-print(f"\nMissing Values:")
-print(df.isnull().sum()[df.isnull().sum() > 0])
-print("\n" + "=" * 60)
-print("Dataset Preview:")
-print("=" * 60)
-print(df.head(10))
+    # Display column information
+    print("\n" + "=" * 60)
+    print("Column Information:")
+    print("=" * 60)
+    for col in df.columns:
+        print(f"- {col}: {df[col].dtype}")
 
-# Save to CSV
-filename = 'depression_dataset.csv'
-df.to_csv(filename, index=False)
-print(f"\n✅ Dataset saved as '{filename}'")
+    print("\n" + "=" * 60)
+    print("Statistical Summary:")
+    print("=" * 60)
+    print(df.describe())
 
-# Display column information
-print("\n" + "=" * 60)
-print("Column Information:")
-print("=" * 60)
-for col in df.columns:
-    print(f"- {col}: {df[col].dtype}")
+    print("\n🎉 You can now use this dataset in the Depression Predictor App!")
+    print(f"📁 File location: ./{filename}")
+    print("\n📝 To use in the app:")
+    print("   1. Run: streamlit run app.py")
+    print(f"   2. Upload the file: {filename}")
+    print("   3. Or use the absolute path as URL")
 
-print("\n" + "=" * 60)
-print("Statistical Summary:")
-print("=" * 60)
-print(df.describe())
 
-print("\n🎉 You can now use this dataset in the Depression Predictor App!")
-print(f"📁 File location: ./{filename}")
-print("\n📝 To use in the app:")
-print("   1. Run: streamlit run app.py")
-print(f"   2. Upload the file: {filename}")
-print("   3. Or use the absolute path as URL")
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+# lazy_imports.py
+import sys
+import time
+import importlib
+import threading
+
+# Seconds each module took to import, in the order they were first loaded
+_import_seconds = {}
+_lock = threading.Lock()
+
+
+def load(module_name):
+    """
+    Import a module on first use and record how long the import took.
+
+    Modules already imported (directly or as another module's dependency)
+    are returned as is, so a recorded time covers the module together with
+    every dependency it was first to pull in.
+
+    Args:
+        module_name (str): Dotted module name
+
+    Returns:
+        module: The imported module
+    """
+    module = sys.modules.get(module_name)
+    if module is not None:
+        return module
+
+    with _lock:
+        start = time.perf_counter()
+        module = importlib.import_module(module_name)
+        _import_seconds.setdefault(module_name, time.perf_counter() - start)
+    return module
+
+
+def import_times():
+    """
+    Return the recorded import times.
+
+    Returns:
+        dict: Module name -> seconds, in load order
+    """
+    with _lock:
+        return dict(_import_seconds)
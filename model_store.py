@@ -0,0 +1,309 @@
+# model_store.py
+import os
+import re
+import json
+import shutil
+import hashlib
+import tempfile
+from datetime import datetime, timezone
+
+import numpy as np
+from sklearn.preprocessing import LabelEncoder, StandardScaler
+
+from forest_inference import FlatForest
+from config import MODEL_SAVE_PATH
+
+FORMAT_VERSION = 1
+MANIFEST_NAME = 'manifest.json'
+VERSION_PATTERN = re.compile(r'^v(\d+)$')
+
+FOREST_ARRAYS = ['feature', 'threshold', 'children', 'missing_go_to_left', 'values', 'roots']
+
+
+def _json_default(value):
+    """Convert numpy scalars and arrays for json.dump."""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _as_plain_array(values):
+    """Return values as a non-object array that np.save can write without pickle."""
+    array = np.asarray(values)
+    if array.dtype == object:
+        array = np.asarray([str(value) for value in array])
+    return array
+
+
+def _file_hash(path):
+    """Return the sha256 hex digest of a file."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _content_hash(manifest):
+    """Hash every array file hash plus the metadata that interprets them."""
+    content = json.dumps({k: v for k, v in manifest.items() if k not in ('version', 'created_at', 'content_hash')},
+                         sort_keys=True, default=_json_default)
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+class ModelStore:
+    """
+    Versioned on-disk model artifact store.
+
+    Each version is a directory of ``.npy`` arrays (forest nodes, scaler
+    statistics, encoder vocabularies, evaluation arrays) plus a JSON
+    manifest holding the small metadata and a content hash. Arrays are
+    loaded memory-mapped, so loading is near-instant and the OS page cache
+    shares them between worker processes.
+
+    Saves are safe to run concurrently: each one writes a private staging
+    directory and claims its version with an atomic rename.
+    """
+
+    def __init__(self, root=MODEL_SAVE_PATH):
+        """
+        Initialize the store.
+
+        Args:
+            root (str): Directory holding one sub-directory per version
+        """
+        self.root = root
+
+    def list_versions(self):
+        """
+        List stored versions, oldest first.
+
+        Returns:
+            list: Manifest summaries with version, created_at, content_hash
+                and accuracy
+        """
+        if not os.path.isdir(self.root):
+            return []
+
+        versions = []
+        for name in os.listdir(self.root):
+            match = VERSION_PATTERN.match(name)
+            manifest_path = os.path.join(self.root, name, MANIFEST_NAME)
+            if match and os.path.isfile(manifest_path):
+                with open(manifest_path) as f:
+                    manifest = json.load(f)
+                versions.append({
+                    'version': name,
+                    'created_at': manifest['created_at'],
+                    'content_hash': manifest['content_hash'],
+                    'accuracy': manifest['metrics'].get('accuracy')
+                })
+
+        return sorted(versions, key=lambda v: int(VERSION_PATTERN.match(v['version']).group(1)))
+
+    def latest_version(self):
+        """
+        Return the newest stored version name.
+
+        Returns:
+            str: Version name, or None if the store is empty
+        """
+        versions = self.list_versions()
+        return versions[-1]['version'] if versions else None
+
+    def _next_version_number(self):
+        """Return one past the highest version directory number."""
+        numbers = [int(match.group(1)) for match in map(VERSION_PATTERN.match, os.listdir(self.root)) if match]
+        return max(numbers, default=0) + 1
+
+    def save(self, artifacts):
+        """
+        Write a new version of the model artifacts.
+
+        Args:
+            artifacts (dict): Same keys as DepressionModelTrainer.save_model
+                builds: model, scaler, label_encoders, target_encoder,
+                feature_names, feature_profile, metrics, fill_values,
+                model_params, update_count and holdout_buffer (a list of
+                (X, y) arrays per incremental update)
+
+        Returns:
+            str: Name of the version written
+        """
+        model = artifacts['model']
+        engine = model if isinstance(model, FlatForest) else FlatForest.from_estimator(model)
+
+        os.makedirs(self.root, exist_ok=True)
+        # Private to this save, so concurrent saves never touch each other's files
+        staging_dir = tempfile.mkdtemp(prefix='.staging-', dir=self.root)
+        try:
+            return self._write_version(artifacts, engine, staging_dir)
+        finally:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+
+    def _write_version(self, artifacts, engine, staging_dir):
+        """Write the artifacts into staging_dir and publish it as the next version."""
+        arrays = {}
+        for name in FOREST_ARRAYS:
+            arrays[f"forest/{name}.npy"] = getattr(engine, name)
+        arrays['forest/classes.npy'] = engine.classes_
+        arrays['forest/feature_importances.npy'] = engine.feature_importances_
+
+        scaler = artifacts['scaler']
+        arrays['scaler/mean.npy'] = scaler.mean_
+        arrays['scaler/scale.npy'] = scaler.scale_
+        arrays['scaler/var.npy'] = scaler.var_
+
+        encoder_files = {}
+        for idx, (col, encoder) in enumerate(artifacts['label_encoders'].items()):
+            encoder_files[col] = f"encoders/{idx:04d}.npy"
+            arrays[encoder_files[col]] = encoder.classes_
+        arrays['encoders/target.npy'] = artifacts['target_encoder'].classes_
+
+        # Rolling holdout of incremental updates, stored as one matrix split by sizes
+        holdout = artifacts.get('holdout_buffer') or []
+        if holdout:
+            arrays['holdout/X.npy'] = np.concatenate([X for X, _ in holdout])
+            arrays['holdout/y.npy'] = np.concatenate([y for _, y in holdout])
+
+        metrics = dict(artifacts['metrics'] or {})
+        metric_files = {}
+        for key, value in list(metrics.items()):
+            if isinstance(value, np.ndarray):
+                metric_files[key] = f"metrics/{key}.npy"
+                arrays[metric_files[key]] = metrics.pop(key)
+
+        array_hashes = {}
+        for rel_path, array in arrays.items():
+            path = os.path.join(staging_dir, rel_path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            np.save(path, _as_plain_array(array), allow_pickle=False)
+            array_hashes[rel_path] = _file_hash(path)
+
+        manifest = {
+            'format_version': FORMAT_VERSION,
+            'version': None,
+            'created_at': datetime.now(timezone.utc).isoformat(),
+            'feature_names': list(artifacts['feature_names']),
+            'max_depth': engine.max_depth,
+            'n_samples_seen': int(np.max(scaler.n_samples_seen_)),
+            'feature_profile': artifacts.get('feature_profile'),
+            'encoders': encoder_files,
+            'metric_arrays': metric_files,
+            'metrics': metrics,
+            'fill_values': artifacts.get('fill_values'),
+            'model_params': artifacts.get('model_params'),
+            'incremental': {
+                'update_count': int(artifacts.get('update_count') or 0),
+                'holdout_sizes': [len(y) for _, y in holdout]
+            },
+            'arrays': array_hashes
+        }
+        manifest['content_hash'] = _content_hash(manifest)
+
+        # Renaming onto a published (non-empty) version fails, so a save
+        # that lost the race for a number retries with the next one
+        while True:
+            version = f"v{self._next_version_number():04d}"
+            manifest['version'] = version
+            with open(os.path.join(staging_dir, MANIFEST_NAME), 'w') as f:
+                json.dump(manifest, f, indent=2, default=_json_default)
+            try:
+                os.rename(staging_dir, os.path.join(self.root, version))
+                return version
+            except OSError:
+                if not os.path.isdir(os.path.join(self.root, version)):
+                    raise
+
+    def load(self, version=None, mmap=True, verify=True):
+        """
+        Load a stored version.
+
+        Args:
+            version (str): Version name; the latest version if None
+            mmap (bool): Memory-map the arrays instead of reading them
+            verify (bool): Re-hash every array file and the metadata
+                against the manifest's hashes
+
+        Returns:
+            dict: Artifacts with the same keys save() accepts, plus
+                version and content_hash
+        """
+        version = version or self.latest_version()
+        if version is None:
+            raise FileNotFoundError(f"No model versions found in {self.root}")
+
+        version_dir = os.path.join(self.root, version)
+        with open(os.path.join(version_dir, MANIFEST_NAME)) as f:
+            manifest = json.load(f)
+
+        if manifest['format_version'] != FORMAT_VERSION:
+            raise ValueError(f"Unsupported model format version {manifest['format_version']}")
+
+        if verify:
+            if _content_hash(manifest) != manifest['content_hash']:
+                raise ValueError(f"Manifest of {version} does not match its content hash")
+            for rel_path, expected in manifest['arrays'].items():
+                if _file_hash(os.path.join(version_dir, rel_path)) != expected:
+                    raise ValueError(f"Checksum mismatch for {rel_path} in {version}")
+
+        mmap_mode = 'r' if mmap else None
+
+        def load_array(rel_path):
+            return np.load(os.path.join(version_dir, rel_path), mmap_mode=mmap_mode, allow_pickle=False)
+
+        forest_arrays = {name: load_array(f"forest/{name}.npy") for name in FOREST_ARRAYS}
+        model = FlatForest(
+            classes=load_array('forest/classes.npy'),
+            max_depth=manifest['max_depth'],
+            feature_importances=load_array('forest/feature_importances.npy'),
+            **forest_arrays
+        )
+
+        feature_names = manifest['feature_names']
+        scaler = StandardScaler()
+        scaler.mean_ = load_array('scaler/mean.npy')
+        scaler.scale_ = load_array('scaler/scale.npy')
+        scaler.var_ = load_array('scaler/var.npy')
+        scaler.n_features_in_ = len(feature_names)
+        scaler.feature_names_in_ = np.asarray(feature_names, dtype=object)
+        scaler.n_samples_seen_ = manifest['n_samples_seen']
+
+        label_encoders = {}
+        for col, rel_path in manifest['encoders'].items():
+            label_encoders[col] = LabelEncoder()
+            label_encoders[col].classes_ = load_array(rel_path)
+
+        target_encoder = LabelEncoder()
+        target_encoder.classes_ = load_array('encoders/target.npy')
+
+        metrics = dict(manifest['metrics'])
+        for key, rel_path in manifest['metric_arrays'].items():
+            metrics[key] = load_array(rel_path)
+
+        # Manifests written before incremental state was stored have none
+        incremental = manifest.get('incremental', {})
+        holdout_buffer = []
+        if incremental.get('holdout_sizes'):
+            bounds = np.cumsum(incremental['holdout_sizes'])[:-1]
+            holdout_buffer = list(zip(np.split(load_array('holdout/X.npy'), bounds),
+                                      np.split(load_array('holdout/y.npy'), bounds)))
+
+        return {
+            'model': model,
+            'scaler': scaler,
+            'label_encoders': label_encoders,
+            'target_encoder': target_encoder,
+            'feature_names': feature_names,
+            # Manifests written before feature profiles were added have none
+            'feature_profile': manifest.get('feature_profile'),
+            'metrics': metrics,
+            'fill_values': manifest.get('fill_values'),
+            'model_params': manifest.get('model_params'),
+            'update_count': incremental.get('update_count', 0),
+            'holdout_buffer': holdout_buffer,
+            'version': version,
+            'content_hash': manifest['content_hash']
+        }
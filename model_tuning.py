@@ -0,0 +1,103 @@
+# model_tuning.py
+import time
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+from sklearn.model_selection import HalvingGridSearchCV
+
+from config import MODEL_PARAMS, MODEL_SEARCH_SPACE
+
+
+def build_search_space(base_params=MODEL_PARAMS, overrides=MODEL_SEARCH_SPACE):
+    """
+    Build a hyperparameter grid around the default model parameters.
+
+    Each tunable default is bracketed by smaller and larger values, then
+    any explicit lists from ``overrides`` replace the generated ones.
+
+    Args:
+        base_params (dict): Default RandomForestClassifier parameters
+        overrides (dict): Explicit candidate lists per parameter
+
+    Returns:
+        dict: Parameter name -> list of candidate values
+    """
+    n_estimators = base_params['n_estimators']
+    max_depth = base_params['max_depth']
+    min_samples_split = base_params['min_samples_split']
+
+    space = {
+        'n_estimators': sorted({max(n_estimators // 2, 10), n_estimators, n_estimators * 2}),
+        'max_depth': sorted({max(max_depth // 2, 2), max_depth, max_depth * 2}) + [None],
+        'min_samples_split': sorted({2, min_samples_split, min_samples_split * 2}),
+    }
+    space.update(overrides or {})
+    return space
+
+
+def successive_halving_search(X, y, search_space=None, cv=3, factor=3,
+                              random_state=42, n_jobs=-1):
+    """
+    Search RandomForest hyperparameters with successive halving.
+
+    All candidates start on a small sample of the data; each round keeps
+    the best 1/factor of them and grows their sample by factor. Candidates
+    run in parallel across cores (each forest is single-threaded), so wall
+    time scales with cores rather than with the number of candidates.
+
+    Args:
+        X (array-like): Scaled training features
+        y (array-like): Encoded training target
+        search_space (dict): Parameter grid; build_search_space() if None
+        cv (int): Number of cross-validation folds per round
+        factor (int): Elimination rate between rounds
+        random_state (int): Random state for reproducibility
+        n_jobs (int): Parallel candidate fits (-1 for all cores)
+
+    Returns:
+        tuple: (best_params, leaderboard DataFrame, search_time_seconds)
+    """
+    search_space = search_space or build_search_space()
+    base_params = {k: v for k, v in MODEL_PARAMS.items() if k not in search_space}
+    base_params.update(random_state=random_state, n_jobs=1)
+
+    search = HalvingGridSearchCV(
+        RandomForestClassifier(**base_params),
+        search_space,
+        factor=factor,
+        cv=cv,
+        scoring='accuracy',
+        refit=False,
+        random_state=random_state,
+        n_jobs=n_jobs
+    )
+
+    start = time.perf_counter()
+    search.fit(X, y)
+    search_time = time.perf_counter() - start
+
+    return search.best_params_, _build_leaderboard(search.cv_results_), search_time
+
+
+def _build_leaderboard(cv_results):
+    """
+    Summarize halving results with one row per candidate at its last round.
+
+    Args:
+        cv_results (dict): ``cv_results_`` of a halving search
+
+    Returns:
+        pd.DataFrame: Candidates sorted by rounds survived and accuracy
+    """
+    results = pd.DataFrame(cv_results)
+    results['candidate'] = results['params'].astype(str)
+    last_round = results.sort_values('iter').groupby('candidate').tail(1)
+
+    leaderboard = pd.DataFrame({
+        'Params': last_round['params'],
+        'Rounds Survived': last_round['iter'] + 1,
+        'Samples': last_round['n_resources'],
+        'Fit Time (s)': last_round['mean_fit_time'],
+        'CV Accuracy': last_round['mean_test_score'],
+    })
+    return leaderboard.sort_values(['Rounds Survived', 'CV Accuracy'], ascending=False).reset_index(drop=True)
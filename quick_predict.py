@@ -0,0 +1,257 @@
+# quick_predict.py
+import sys
+from typing import Dict, Any
+
+import numpy as np
+import pandas as pd
+
+
+class QuickPredictAI:
+    """Rule-based AI system for instant depression prediction"""
+
+    # Map responses to scores (0-4 scale)
+    RESPONSE_CODES = {
+        # For positive questions (lower is better)
+        'Very good': 0,
+        'Good': 1,
+        'Fair': 2,
+        'Poor': 3,
+        'Very poor': 4,
+
+        # For frequency questions
+        'Never': 0,
+        'Rarely': 1,
+        'Sometimes': 2,
+        'Often': 3,
+        'Always': 4,
+        'Constantly': 4,
+        'Frequently': 4,
+
+        # For interest/energy questions
+        'Very energetic': 0,
+        'Energetic': 1,
+        'Average': 2,
+        'Low': 3,
+        'Very low': 4,
+
+        'Very interested': 0,
+        'Interested': 1,
+        'Neutral': 2,
+        'Disinterested': 3,
+        'Very disinterested': 4,
+
+        'Full interest': 0,
+        'Most interest': 1,
+        'Some interest': 2,
+        'Little interest': 3,
+        'No interest': 4,
+
+        # For engagement questions (hobby)
+        'Very engaged': 0,
+        'Engaged': 1,
+        'Disengaged': 3,
+        'Very disengaged': 4,
+
+        # For change questions
+        'No change': 0,
+        'Slight change': 1,
+        'Moderate change': 2,
+        'Significant change': 3,
+        'Extreme change': 4,
+
+        # For difficulty questions
+        'Not at all': 0,
+        'Slightly': 1,
+        'Moderately': 2,
+        'Very': 3,
+        'Extremely': 4,
+    }
+
+    # Weighted scoring system based on clinical depression criteria
+    QUESTION_WEIGHTS = {
+        'mood': 1.5,           # Mood disturbance
+        'sleep': 1.2,          # Sleep problems
+        'energy': 1.3,         # Energy/fatigue
+        'appetite': 1.0,       # Appetite changes
+        'concentration': 1.4,  # Concentration difficulties
+        'anxiety': 1.3,        # Anxiety levels
+        'social': 1.2,         # Social withdrawal
+        'interest': 1.5,       # Loss of interest
+        'guilt': 1.1,          # Guilt/worthlessness
+        'suicidal': 2.0,       # Suicidal thoughts (higher weight)
+        'hobby': 1.3           # Engagement with hobbies
+    }
+
+    # Score bands: (upper bound, level, color class, severity, recommendation)
+    SCORE_LEVELS = [
+        (20, "Normal", "prediction-result-normal", "Low",
+         "You appear to have good mental health. Maintain healthy habits!"),
+        (40, "Mild", "prediction-result-mild", "Low-Moderate",
+         "Mild symptoms detected. Consider stress management techniques."),
+        (60, "Moderate", "prediction-result-moderate", "Moderate",
+         "Moderate symptoms detected. Consider speaking with a professional."),
+        (80, "Severe", "prediction-result-severe", "High",
+         "Severe symptoms detected. Please seek professional help immediately."),
+        (None, "Critical", "prediction-result-severe", "Very High",
+         "Critical symptoms detected. Urgent professional help is strongly recommended."),
+    ]
+
+    # Insights: (question, minimum response code, message), in display order
+    INSIGHT_RULES = [
+        ('mood', 3, "💙 **Mood**: Persistent low mood detected - Consider mood tracking and journaling"),
+        ('sleep', 3, "😴 **Sleep**: Sleep disturbances noted - Establish regular sleep routine and reduce screen time before bed"),
+        ('energy', 3, "⚡ **Energy**: Low energy levels - Consider regular physical activity and balanced nutrition"),
+        ('concentration', 3, "🎯 **Focus**: Difficulty concentrating - Try mindfulness exercises and break tasks into smaller steps"),
+        ('social', 3, "👥 **Social**: Social withdrawal detected - Consider joining support groups or social activities"),
+        ('hobby', 3, "🎨 **Hobbies**: Loss of interest in hobbies - Try reintroducing small enjoyable activities gradually"),
+        # Suicidal thoughts (high priority)
+        ('suicidal', 2, "⚠️ **Important**: If you're having suicidal thoughts, please call emergency services or a crisis hotline immediately"),
+    ]
+
+    @classmethod
+    def calculate_depression_score(cls, responses: Dict[str, str]) -> float:
+        """Calculate depression score based on responses"""
+        total_score = 0
+        max_possible = 0
+
+        for key, weight in cls.QUESTION_WEIGHTS.items():
+            response = responses.get(key, '')
+            if response:  # Only calculate if response exists
+                score = cls.RESPONSE_CODES.get(response, 0)
+                # Normalize score to 0-10 scale
+                normalized_score = (score / 4) * 10
+                total_score += normalized_score * weight
+                max_possible += 10 * weight
+
+        # Normalize to 0-100 scale
+        if max_possible > 0:
+            depression_percentage = (total_score / max_possible) * 100
+        else:
+            depression_percentage = 0
+
+        return depression_percentage
+
+    @classmethod
+    def interpret_score(cls, score: float) -> Dict[str, Any]:
+        """Interpret depression score into levels and recommendations"""
+        for upper, level, color_class, severity, recommendation in cls.SCORE_LEVELS:
+            if upper is None or score < upper:
+                break
+
+        return {
+            'level': level,
+            'score': score,
+            'color_class': color_class,
+            'severity': severity,
+            'recommendation': recommendation
+        }
+
+    @classmethod
+    def generate_insights(cls, responses: Dict[str, str]) -> list:
+        """Generate personalized insights based on responses"""
+        return [message for question, threshold, message in cls.INSIGHT_RULES
+                if cls.RESPONSE_CODES.get(responses.get(question, ''), 0) >= threshold]
+
+    @classmethod
+    def encode_responses(cls, answers: pd.DataFrame):
+        """
+        Turn a table of questionnaire answers into response codes.
+
+        Missing and empty answers count as unanswered; answers outside
+        RESPONSE_CODES count as answered with code 0, as in the per-row path.
+
+        Args:
+            answers (pd.DataFrame): One row per respondent, one column per
+                question id (missing question columns are unanswered)
+
+        Returns:
+            tuple: (codes, answered) arrays of shape (rows, questions) in
+                QUESTION_WEIGHTS order; codes are float64 and 0 where
+                unanswered
+        """
+        n_rows = len(answers)
+        codes = np.zeros((n_rows, len(cls.QUESTION_WEIGHTS)))
+        answered = np.zeros((n_rows, len(cls.QUESTION_WEIGHTS)), dtype=bool)
+
+        for j, question in enumerate(cls.QUESTION_WEIGHTS):
+            if question not in answers.columns:
+                continue
+            values = answers[question].to_numpy(dtype=object, na_value='')
+            answered[:, j] = values.astype(bool)
+            # Look up each distinct answer once
+            inverse, uniques = pd.factorize(values)
+            lookup = np.array([cls.RESPONSE_CODES.get(value, 0) for value in uniques] + [0], dtype=np.float64)
+            codes[:, j] = lookup[inverse]
+
+        return codes, answered
+
+    @classmethod
+    def score_batch(cls, answers: pd.DataFrame) -> pd.DataFrame:
+        """
+        Score many questionnaires at once.
+
+        Scores are accumulated question by question in the same order and
+        with the same floating-point operations as calculate_depression_score,
+        so every row matches the per-row path exactly.
+
+        Args:
+            answers (pd.DataFrame): One row per respondent, one column per
+                question id
+
+        Returns:
+            pd.DataFrame: score, level and severity (as interpret_score gives
+                them) and one boolean insight_<question> column per
+                INSIGHT_RULES entry, indexed like answers
+        """
+        codes, answered = cls.encode_responses(answers)
+
+        total_score = np.zeros(len(answers))
+        max_possible = np.zeros(len(answers))
+        for j, weight in enumerate(cls.QUESTION_WEIGHTS.values()):
+            normalized_score = (codes[:, j] / 4) * 10
+            total_score += np.where(answered[:, j], normalized_score * weight, 0.0)
+            max_possible += np.where(answered[:, j], 10 * weight, 0.0)
+
+        scores = np.zeros(len(answers))
+        np.divide(total_score, max_possible, out=scores, where=max_possible > 0)
+        scores *= 100
+
+        # Band index: how many upper bounds each score has reached
+        bounds = [upper for upper, *_ in cls.SCORE_LEVELS[:-1]]
+        band = np.searchsorted(bounds, scores, side='right')
+        levels = [level for _, level, *_ in cls.SCORE_LEVELS]
+        severities = np.array([severity for *_, severity, _ in cls.SCORE_LEVELS], dtype=object)
+
+        result = pd.DataFrame({
+            'score': scores,
+            'level': pd.Categorical.from_codes(band, categories=levels, ordered=True),
+            'severity': severities[band]
+        }, index=answers.index)
+
+        questions = list(cls.QUESTION_WEIGHTS)
+        for question, threshold, _ in cls.INSIGHT_RULES:
+            result[f'insight_{question}'] = codes[:, questions.index(question)] >= threshold
+        return result
+
+
+def main(path, output_path=None):
+    # Survey exports: one row per respondent, one column per question id
+    answers = pd.read_csv(path, dtype=str)
+    results = QuickPredictAI.score_batch(answers)
+
+    print("=" * 60)
+    print(f"Scored {len(results):,} questionnaires from {path}")
+    print("=" * 60)
+    print(results['level'].value_counts(sort=False).to_string())
+    print(f"\nMean score: {results['score'].mean():.1f}/100")
+    print(f"Flagged for self-harm follow-up: {int(results['insight_suicidal'].sum()):,}")
+
+    if output_path:
+        results.to_csv(output_path, index=False)
+        print(f"\n✅ Results saved as '{output_path}'")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        sys.exit("Usage: python quick_predict.py ANSWERS_CSV [OUTPUT_CSV]")
+    main(*sys.argv[1:3])
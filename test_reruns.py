@@ -0,0 +1,91 @@
+"""
+Script Run Tests
+Drive the app with streamlit.testing and assert that every navigation click
+and Quick Predict interaction costs exactly one script run, using the app's
+own run counter (st.session_state.run_stats)
+
+Run with: python -m pytest test_reruns.py
+"""
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+APP_TIMEOUT = 60
+
+
+def run_once(app, action=None):
+    """
+    Perform one interaction and count the script runs it took.
+
+    Args:
+        app (AppTest): App under test
+        action (callable): Sets widget values on the AppTest; None for the
+            initial page load
+
+    Returns:
+        int: Number of runs
+    """
+    runs_before = app.session_state.run_stats['runs'] if action else 0
+    if action:
+        action(app)
+    try:
+        app.run()
+    except Exception:
+        # AppTest follows st.rerun() but can fail to parse the final run and
+        # cannot continue from it; the app's own counter tells whether a rerun
+        # it asked for is the cause. A requested run that never started counts
+        pending = 'rerun_requested' in app.session_state
+        if not pending and app.session_state.run_stats['interaction_runs'] == 1:
+            raise
+        runs = app.session_state.run_stats['runs'] - runs_before + pending
+        pytest.fail(f"Interaction took at least {runs} script runs (the app called st.rerun())")
+    assert not app.exception, [e.value for e in app.exception]
+    return app.session_state.run_stats['runs'] - runs_before
+
+
+def click(label):
+    """Return the action clicking the button with this exact label"""
+    return lambda app: next(b for b in app.button if b.label == label).click()
+
+
+def choose(key, value):
+    """Return the action choosing a value in the selectbox with this key"""
+    return lambda app: app.selectbox(key=key).select(value)
+
+
+@pytest.fixture
+def app():
+    app = AppTest.from_file('app.py', default_timeout=APP_TIMEOUT)
+    assert run_once(app) == 1
+    return app
+
+
+def test_navigation_takes_one_run_per_click(app):
+    # Every page through the navigation bar, then back to the start page
+    start_page = app.session_state.current_page
+    pages = [b.label for b in app.button if b.key and b.key.startswith('nav_button_')]
+
+    runs = {}
+    for page in pages + [start_page]:
+        runs[f"Navigate to {page}"] = run_once(app, click(page))
+        assert app.session_state.current_page == page
+
+    assert runs == {description: 1 for description in runs}
+
+
+def test_quick_predict_takes_one_run_per_interaction(app):
+    # Answer everything, assess, reset, answer again, assess, then leave
+    questions = [s for s in app.selectbox if s.key and s.key.startswith('select_')]
+    assert questions
+
+    runs = []
+    for question in questions:
+        runs.append((f"Answer {question.key}", run_once(app, choose(question.key, question.options[1]))))
+    runs.append(("Get Instant Assessment", run_once(app, click("🔮 Get Instant Assessment"))))
+    runs.append(("Take Another Assessment", run_once(app, click("🔄 Take Another Assessment"))))
+    for question in questions:
+        runs.append((f"Answer {question.key}", run_once(app, choose(question.key, question.options[-1]))))
+    runs.append(("Get Instant Assessment", run_once(app, click("🔮 Get Instant Assessment"))))
+    runs.append(("Use Advanced Model", run_once(app, click("📁 Use Advanced Model"))))
+
+    assert runs == [(description, 1) for description, _ in runs]
@@ -1,36 +1,242 @@
+import os
+import time
+import tempfile
+import tracemalloc
+from contextlib import contextmanager, nullcontext
 import pandas as pd
 import numpy as np
-import pickle
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import LabelEncoder, StandardScaler
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
 from sklearn.impute import SimpleImputer
+from forest_inference import FlatForest
+from model_store import ModelStore
+from model_tuning import successive_halving_search
+from config import (
+    FAST_INFERENCE_MAX_ROWS, MODEL_SAVE_PATH, MODEL_PARAMS,
+    SEARCH_CV_FOLDS, SEARCH_HALVING_FACTOR, STREAM_CHUNK_ROWS,
+    INCREMENTAL_TREES_PER_UPDATE, INCREMENTAL_MAX_TREES, INCREMENTAL_HOLDOUT_WINDOW,
+    TRACK_STAGE_MEMORY, TREE_BATCH_SIZE,
+    EARLY_STOPPING_STEP, EARLY_STOPPING_TOLERANCE, EARLY_STOPPING_PATIENCE, EARLY_STOPPING_MAX_TREES,
+    FEATURE_PROFILE_QUANTILES, FEATURE_PROFILE_SAMPLE_ROWS
+)
 import warnings
 warnings.filterwarnings('ignore')
 
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+
+def _peak_rss_mb():
+    """Return the process peak resident set size in MB, or None if unknown."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return peak / 1024 ** 2 if os.uname().sysname == 'Darwin' else peak / 1024
+
+
+def _numpy_backed(df):
+    """
+    Convert Arrow-backed columns to the NumPy dtypes sklearn expects.
+    
+    Numeric columns become their NumPy dtype (float64 if they hold
+    nulls) and all others object arrays, with NaN for missing values as
+    the default CSV parser gives.
+    
+    Args:
+        df (pd.DataFrame): Frame possibly holding ArrowDtype columns
+    
+    Returns:
+        pd.DataFrame: Frame without ArrowDtype columns
+    """
+    arrow_columns = [col for col in df.columns if isinstance(df[col].dtype, pd.ArrowDtype)]
+    if not arrow_columns:
+        return df
+    
+    df = df.copy(deep=False)
+    for col in arrow_columns:
+        series = df[col]
+        if pd.api.types.is_numeric_dtype(series.dtype) and not pd.api.types.is_bool_dtype(series.dtype):
+            dtype = np.float64 if series.hasnans else series.dtype.numpy_dtype
+        else:
+            dtype = object
+        df[col] = series.to_numpy(dtype=dtype, na_value=np.nan)
+    return df
+
+
+def _fill_values_from_profile(feature_profile):
+    """
+    Recover imputation values from a feature profile.
+    
+    Models saved before fill values were stored still have their profile.
+    Its means and modes approximate the mean and most-frequent imputation
+    statistics; they differ only in covering the training split alone.
+    
+    Args:
+        feature_profile (dict): Profile from _profile_features, or None
+    
+    Returns:
+        dict: Feature name -> fill value
+    """
+    return {col: stats['mean'] if stats['type'] == 'numeric' else stats['mode']
+            for col, stats in (feature_profile or {}).items()}
+
+
+def _out_of_bag_indices(tree, n_samples, max_samples=None):
+    """
+    Return the rows a forest tree did not see in its bootstrap sample.
+    
+    Redraws the bootstrap exactly as RandomForestClassifier does for
+    unweighted data, from the tree's own random_state.
+    
+    Args:
+        tree (DecisionTreeClassifier): Tree from a fitted forest
+        n_samples (int): Number of training rows
+        max_samples (int or float): The forest's max_samples parameter
+    
+    Returns:
+        np.ndarray: Out-of-bag row indices
+    """
+    if max_samples is None:
+        n_bootstrap = n_samples
+    elif isinstance(max_samples, float):
+        n_bootstrap = max(round(n_samples * max_samples), 1)
+    else:
+        n_bootstrap = max_samples
+    
+    sampled = np.random.RandomState(tree.random_state).randint(0, n_samples, n_bootstrap)
+    return np.flatnonzero(np.bincount(sampled, minlength=n_samples) == 0)
+
 
 class DepressionModelTrainer:
     """
     A class to handle training of depression prediction models.
     """
     
-    def __init__(self, test_size=0.2, random_state=42):
+    def __init__(self, test_size=0.2, random_state=42, fast_inference=False,
+                 track_memory=TRACK_STAGE_MEMORY, early_stopping=False):
         """
         Initialize the model trainer.
         
         Args:
             test_size (float): Proportion of dataset to include in test split
             random_state (int): Random state for reproducibility
+            fast_inference (bool): Compile the trained forest into a
+                FlatForest engine and use it for predictions
+            track_memory (bool): Record tracemalloc peaks per pipeline stage;
+                tracing slows allocation-heavy stages several times over and
+                inflates their timings, so leave it off when timing
+            early_stopping (bool): Grow the forest until its out-of-bag
+                accuracy plateaus instead of fitting n_estimators trees
         """
         self.test_size = test_size
         self.random_state = random_state
+        self.fast_inference = fast_inference
+        self.track_memory = track_memory
+        self._started_tracing = False
+        self.early_stopping = early_stopping
+        self.oob_curve = None
+        self.stage_timings = {}
+        self.training_time = None
         self.model = None
+        # RandomForestClassifier parameters the forest was built with
+        self.model_params = None
+        self.inference_engine = None
+        self.model_version = None
+        self.model_hash = None
+        self.tuning_results = None
+        self.update_count = 0
+        self.holdout_buffer = []
         self.scaler = None
         self.label_encoders = {}
+        self.fill_values = {}
         self.target_encoder = None
         self.feature_names = None
+        # Per-feature summary of the training data (ranges, quantiles,
+        # categories) used by input forms instead of the training matrix
+        self.feature_profile = None
         self.metrics = None
+        # Optional callable(stage, trees_built=None, trees_total=None) used
+        # by background jobs to report progress; it may raise to abort
+        self.progress_callback = None
+    
+    @contextmanager
+    def _stage(self, name, trace=True):
+        """
+        Time a pipeline stage and record it in stage_timings.
+        
+        Records wall time, the peak traced allocation above the level at
+        stage start (when tracemalloc is tracing) and the process peak RSS.
+        
+        Args:
+            name (str): Stage name
+            trace (bool): False pauses tracing this run started for the
+                stage, so it records time and RSS only
+        """
+        if self.progress_callback is not None:
+            self.progress_callback(name)
+        paused = not trace and self._started_tracing and tracemalloc.is_tracing()
+        if paused:
+            tracemalloc.stop()
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            baseline = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            record = {'seconds': time.perf_counter() - start}
+            if paused:
+                tracemalloc.start()
+            if tracing:
+                record['peak_mb'] = (tracemalloc.get_traced_memory()[1] - baseline) / 1024 ** 2
+            peak_rss = _peak_rss_mb()
+            if peak_rss is not None:
+                record['rss_mb'] = peak_rss
+            self.stage_timings[name] = record
+    
+    @contextmanager
+    def _instrumented_run(self):
+        """Reset stage timings and trace memory for one full pipeline run."""
+        self.stage_timings = {}
+        self._started_tracing = self.track_memory and not tracemalloc.is_tracing()
+        if self._started_tracing:
+            tracemalloc.start()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.training_time = time.perf_counter() - start
+            if self._started_tracing and tracemalloc.is_tracing():
+                tracemalloc.stop()
+            self._started_tracing = False
+    
+    def _attach_timings(self, metrics):
+        """Copy the latest pipeline timings into a metrics dict."""
+        metrics['stage_timings'] = self.stage_timings
+        metrics['training_time'] = self.training_time
+        return metrics
+    
+    def _load_input(self, data):
+        """
+        Load the training input as a private DataFrame.
+        
+        Args:
+            data (pd.DataFrame or str): DataFrame or path to a CSV file
+            
+        Returns:
+            pd.DataFrame: Frame the pipeline may modify freely
+        """
+        with self._stage('load'):
+            if isinstance(data, pd.DataFrame):
+                # Under Copy-on-Write a shallow copy is private until written to
+                return data.copy(deep=not pd.options.mode.copy_on_write)
+            return pd.read_csv(data)
         
     def prepare_data(self, df):
         """
@@ -45,6 +251,8 @@ class DepressionModelTrainer:
         if 'Depression' not in df.columns:
             raise ValueError("Dataset must contain 'Depression' column as target variable")
         
+        df = _numpy_backed(df)
+        
         # Separate features and target
         X = df.drop('Depression', axis=1)
         y = df['Depression']
@@ -52,62 +260,621 @@ class DepressionModelTrainer:
         # Identify column types
         numeric_features = X.select_dtypes(include=[np.number]).columns
         categorical_features = X.select_dtypes(include=['object']).columns
+        # Columns compacted to the category dtype are encoded from their codes
+        category_features = X.select_dtypes(include=['category']).columns
+        category_codes = {col: self._category_codes(X[col]) for col in category_features}
         
         # Handle missing values
-        if len(numeric_features) > 0:
-            num_imputer = SimpleImputer(strategy='mean')
-            X[numeric_features] = num_imputer.fit_transform(X[numeric_features])
-        
-        if len(categorical_features) > 0:
-            cat_imputer = SimpleImputer(strategy='most_frequent')
-            X[categorical_features] = cat_imputer.fit_transform(X[categorical_features])
-        
-        # Encode categorical features
-        for col in categorical_features:
-            le = LabelEncoder()
-            X[col] = le.fit_transform(X[col].astype(str))
-            self.label_encoders[col] = le
+        with self._stage('impute'):
+            if len(numeric_features) > 0:
+                num_imputer = SimpleImputer(strategy='mean')
+                # Means in float64, so downcast columns give the same statistics
+                X[numeric_features] = num_imputer.fit_transform(X[numeric_features].astype(np.float64))
+                self.fill_values.update(zip(numeric_features, num_imputer.statistics_))
+            
+            if len(categorical_features) > 0:
+                cat_imputer = SimpleImputer(strategy='most_frequent')
+                X[categorical_features] = cat_imputer.fit_transform(X[categorical_features])
+                self.fill_values.update(zip(categorical_features, cat_imputer.statistics_))
+            
+            for col, (codes, classes) in category_codes.items():
+                # Ties go to the smallest value, as in SimpleImputer(strategy='most_frequent')
+                fill_code = np.argmax(np.bincount(codes[codes >= 0], minlength=len(classes)))
+                codes[codes < 0] = fill_code
+                self.fill_values[col] = classes[fill_code]
         
-        # Encode target variable
-        self.target_encoder = LabelEncoder()
-        y_encoded = self.target_encoder.fit_transform(y)
+        with self._stage('encode'):
+            # Encode categorical features
+            for col in categorical_features:
+                le = LabelEncoder()
+                X[col] = le.fit_transform(X[col].astype(str))
+                self.label_encoders[col] = le
+            
+            for col, (codes, classes) in category_codes.items():
+                le = LabelEncoder()
+                le.classes_ = classes
+                X[col] = codes
+                self.label_encoders[col] = le
+            
+            # Encode target variable
+            self.target_encoder = LabelEncoder()
+            y_encoded = self.target_encoder.fit_transform(y)
         
         # Store feature names
         self.feature_names = X.columns.tolist()
         
         # Split data
-        X_train, X_test, y_train, y_test = train_test_split(
-            X, y_encoded, 
-            test_size=self.test_size, 
-            random_state=self.random_state,
-            stratify=y_encoded
-        )
+        with self._stage('split'):
+            X_train, X_test, y_train, y_test = train_test_split(
+                X, y_encoded, 
+                test_size=self.test_size, 
+                random_state=self.random_state,
+                stratify=y_encoded
+            )
         
         return X_train, X_test, y_train, y_test
     
-    def train(self, X_train, y_train):
+    @staticmethod
+    def _category_codes(series):
+        """
+        Translate a categorical column's codes into LabelEncoder codes.
+        
+        Only the categories are converted and sorted, not the rows, so this
+        is much cheaper than LabelEncoder().fit_transform(series.astype(str)),
+        which it matches for every non-missing value.
+        
+        Args:
+            series (pd.Series): Column with the category dtype
+            
+        Returns:
+            tuple: (codes with -1 for missing values, classes_ array)
+        """
+        series = series.cat.remove_unused_categories()
+        names = series.cat.categories.astype(str).to_numpy(dtype=object)
+        classes = np.unique(names)
+        remap = np.searchsorted(classes, names)
+        codes = series.cat.codes.to_numpy()
+        return np.where(codes >= 0, remap[codes], -1), classes
+    
+    def prepare_data_out_of_core(self, csv_path, work_dir=None, chunksize=STREAM_CHUNK_ROWS):
+        """
+        Prepare a CSV larger than memory without loading it as a DataFrame.
+        
+        Pass one streams the file in chunks, collecting imputation statistics
+        (running means, category frequency counts), category vocabularies
+        and the target column. Pass two imputes and encodes each chunk and
+        writes it as float32 into memory-mapped train and test matrices.
+        Rows land in the same split and order as prepare_data would give.
+        
+        Args:
+            csv_path (str): Path to a CSV file with a 'Depression' column
+            work_dir (str): Directory for the memory-mapped matrices
+                (a new temporary directory, which the caller removes, if None)
+            chunksize (int): Rows read per chunk
+            
+        Returns:
+            tuple: X_train, X_test (np.memmap float32), y_train, y_test
+        """
+        # Sniff column types from the first chunk, then pin them for both passes
+        head = pd.read_csv(csv_path, nrows=chunksize)
+        if 'Depression' not in head.columns:
+            raise ValueError("Dataset must contain 'Depression' column as target variable")
+        
+        feature_names = [col for col in head.columns if col != 'Depression']
+        categorical_features = [col for col in feature_names if head[col].dtype == object]
+        numeric_features = [col for col in feature_names if col not in categorical_features]
+        dtypes = {col: str for col in categorical_features}
+        dtypes.update({col: np.float64 for col in numeric_features})
+        
+        def read_chunks():
+            return pd.read_csv(csv_path, chunksize=chunksize, dtype=dtypes)
+        
+        with self._stage('load'):
+            # Pass 1: imputation statistics, vocabularies and target
+            sums = pd.Series(0.0, index=numeric_features)
+            counts = pd.Series(0, index=numeric_features)
+            frequencies = {col: pd.Series(dtype=np.int64) for col in categorical_features}
+            targets = []
+        
+            for chunk in read_chunks():
+                sums += chunk[numeric_features].sum()
+                counts += chunk[numeric_features].count()
+                for col in categorical_features:
+                    frequencies[col] = frequencies[col].add(chunk[col].value_counts(), fill_value=0)
+                targets.append(chunk['Depression'].to_numpy())
+        
+        with self._stage('impute'):
+            self.fill_values = {}
+            for col in numeric_features:
+                if counts[col] == 0:
+                    raise ValueError(f"Column '{col}' has no non-missing values")
+                self.fill_values[col] = sums[col] / counts[col]
+        
+            self.label_encoders = {}
+            for col in categorical_features:
+                if frequencies[col].empty:
+                    raise ValueError(f"Column '{col}' has no non-missing values")
+                vocabulary = np.array(sorted(frequencies[col].index), dtype=object)
+                # Ties go to the smallest value, as in SimpleImputer(strategy='most_frequent')
+                top_count = frequencies[col].max()
+                self.fill_values[col] = min(frequencies[col].index[frequencies[col] == top_count])
+                self.label_encoders[col] = LabelEncoder()
+                self.label_encoders[col].classes_ = vocabulary
+        
+        with self._stage('split'):
+            self.target_encoder = LabelEncoder()
+            y_encoded = self.target_encoder.fit_transform(np.concatenate(targets))
+            self.feature_names = feature_names
+            
+            # Split row indices exactly as train_test_split splits a DataFrame
+            train_idx, test_idx = train_test_split(
+                np.arange(len(y_encoded)),
+                test_size=self.test_size,
+                random_state=self.random_state,
+                stratify=y_encoded
+            )
+            is_train = np.zeros(len(y_encoded), dtype=bool)
+            is_train[train_idx] = True
+            position = np.empty(len(y_encoded), dtype=np.int64)
+            position[train_idx] = np.arange(len(train_idx))
+            position[test_idx] = np.arange(len(test_idx))
+        
+        with self._stage('encode'):
+            work_dir = work_dir or tempfile.mkdtemp(prefix='depression_prep_')
+            os.makedirs(work_dir, exist_ok=True)
+            n_features = len(feature_names)
+            X_train = np.memmap(os.path.join(work_dir, 'X_train.f32'), dtype=np.float32,
+                                mode='w+', shape=(len(train_idx), n_features))
+            X_test = np.memmap(os.path.join(work_dir, 'X_test.f32'), dtype=np.float32,
+                               mode='w+', shape=(len(test_idx), n_features))
+        
+            # Pass 2: impute, encode and scatter each chunk into the split matrices
+            row_offset = 0
+            for chunk in read_chunks():
+                block = np.empty((len(chunk), n_features), dtype=np.float32)
+                for j, col in enumerate(feature_names):
+                    values = chunk[col].fillna(self.fill_values[col])
+                    if col in self.label_encoders:
+                        values = pd.Categorical(values, categories=self.label_encoders[col].classes_).codes
+                    block[:, j] = values
+            
+                rows = np.arange(row_offset, row_offset + len(chunk))
+                chunk_is_train = is_train[rows]
+                X_train[position[rows[chunk_is_train]]] = block[chunk_is_train]
+                X_test[position[rows[~chunk_is_train]]] = block[~chunk_is_train]
+                row_offset += len(chunk)
+        
+            X_train.flush()
+            X_test.flush()
+        
+        return X_train, X_test, y_encoded[train_idx], y_encoded[test_idx]
+    
+    def train(self, X_train, y_train, params=None):
         """
         Train the Random Forest model.
         
         Args:
             X_train: Training features
             y_train: Training target
+            params (dict): Optional overrides of config.MODEL_PARAMS
         """
+        with self._stage('profile'):
+            self.feature_profile = self._profile_features(X_train)
+        
         # Scale features
-        self.scaler = StandardScaler()
-        X_train_scaled = self.scaler.fit_transform(X_train)
+        with self._stage('scale'):
+            self.scaler = StandardScaler()
+            X_train_scaled = self.scaler.fit_transform(X_train)
+        
+        self._fit_model(X_train_scaled, y_train, params)
+    
+    def train_out_of_core(self, X_train, y_train, params=None, chunksize=STREAM_CHUNK_ROWS):
+        """
+        Train on a memory-mapped matrix from prepare_data_out_of_core.
+        
+        The scaler is fitted chunk by chunk and the matrix is scaled in
+        place, so no full in-memory copy of the training data is made.
+        
+        Args:
+            X_train (np.memmap): float32 training features (scaled in place)
+            y_train: Training target
+            params (dict): Optional overrides of config.MODEL_PARAMS
+            chunksize (int): Rows scaled per chunk
+        """
+        with self._stage('profile'):
+            self.feature_profile = self._profile_features(X_train, chunksize)
+        
+        with self._stage('scale'):
+            self.scaler = StandardScaler()
+            for start in range(0, len(X_train), chunksize):
+                self.scaler.partial_fit(X_train[start:start + chunksize])
+            self._scale_in_place(X_train, chunksize)
+        
+        self._fit_model(X_train, y_train, params)
+    
+    def _profile_features(self, X, chunksize=STREAM_CHUNK_ROWS):
+        """
+        Summarize the imputed, encoded (unscaled) training features.
+        
+        Minimum, maximum, mean and category counts are exact and computed
+        chunk by chunk; quantiles come from at most
+        FEATURE_PROFILE_SAMPLE_ROWS evenly spaced rows.
+        
+        Args:
+            X (pd.DataFrame or np.ndarray): Training features in
+                feature_names order
+            chunksize (int): Rows summarized per chunk
+            
+        Returns:
+            dict: Feature name -> numeric summary (min, max, mean,
+                quantiles) or categorical summary (categories, mode)
+        """
+        rows = X.iloc if isinstance(X, pd.DataFrame) else X
+        n_rows = len(X)
+        if n_rows == 0:
+            return {}
+        
+        categorical = {i: self.label_encoders[col] for i, col in enumerate(self.feature_names)
+                       if col in self.label_encoders}
+        minimum = np.full(len(self.feature_names), np.inf)
+        maximum = np.full(len(self.feature_names), -np.inf)
+        total = np.zeros(len(self.feature_names))
+        counts = {i: np.zeros(len(encoder.classes_), dtype=np.int64) for i, encoder in categorical.items()}
+        for start in range(0, n_rows, chunksize):
+            block = np.asarray(rows[start:start + chunksize], dtype=np.float64)
+            minimum = np.minimum(minimum, block.min(axis=0))
+            maximum = np.maximum(maximum, block.max(axis=0))
+            total += block.sum(axis=0)
+            for i in categorical:
+                counts[i] += np.bincount(block[:, i].astype(np.intp), minlength=len(counts[i]))
+        
+        step = -(-n_rows // FEATURE_PROFILE_SAMPLE_ROWS)
+        quantiles = np.quantile(np.asarray(rows[::step], dtype=np.float64), FEATURE_PROFILE_QUANTILES, axis=0)
+        
+        profile = {}
+        for i, col in enumerate(self.feature_names):
+            if i in categorical:
+                categories = categorical[i].classes_.tolist()
+                profile[col] = {
+                    'type': 'categorical',
+                    'categories': categories,
+                    'mode': categories[np.argmax(counts[i])]
+                }
+            else:
+                profile[col] = {
+                    'type': 'numeric',
+                    'min': float(minimum[i]),
+                    'max': float(maximum[i]),
+                    'mean': float(total[i] / n_rows),
+                    'quantiles': {f"{level:.0%}": float(q) for level, q in zip(FEATURE_PROFILE_QUANTILES, quantiles[:, i])}
+                }
+        return profile
+    
+    def _scale_in_place(self, X, chunksize=STREAM_CHUNK_ROWS):
+        """Apply the fitted scaler to a writable matrix chunk by chunk."""
+        for start in range(0, len(X), chunksize):
+            X[start:start + chunksize] = self.scaler.transform(X[start:start + chunksize])
+        if isinstance(X, np.memmap):
+            X.flush()
+    
+    def _fit_model(self, X_scaled, y_train, params=None):
+        """
+        Fit the Random Forest on already-scaled features.
         
+        Args:
+            X_scaled: Scaled training features
+            y_train: Training target
+            params (dict): Optional overrides of config.MODEL_PARAMS
+        """
         # Initialize and train model
-        self.model = RandomForestClassifier(
-            n_estimators=100,
-            random_state=self.random_state,
-            max_depth=10,
-            min_samples_split=5,
-            n_jobs=-1
-        )
+        model_params = {**MODEL_PARAMS, 'random_state': self.random_state, **(params or {})}
+        self.model_params = model_params
+        self.model = RandomForestClassifier(**model_params)
+        
+        self.oob_curve = None
+        with self._stage('fit'):
+            if self.early_stopping:
+                self._fit_until_oob_plateau(X_scaled, y_train)
+            elif self.progress_callback is None:
+                self.model.fit(X_scaled, y_train)
+            else:
+                self._fit_in_batches(X_scaled, y_train)
+        
+        self.inference_engine = None
+        self.model_version = None
+        self.model_hash = None
+        if self.fast_inference:
+            self.compile_inference_engine()
+    
+    def _fit_in_batches(self, X_scaled, y_train, batch_size=TREE_BATCH_SIZE):
+        """
+        Grow the forest a batch of trees at a time, reporting progress.
+        
+        Warm-started forests draw the same tree seeds as a single fit, so
+        the result is identical to self.model.fit(X_scaled, y_train).
         
-        self.model.fit(X_train_scaled, y_train)
-        self.X_train = X_train
+        Args:
+            X_scaled: Scaled training features
+            y_train: Training target
+            batch_size (int): Trees grown between progress reports
+        """
+        n_total = self.model.n_estimators
+        self.model.set_params(warm_start=True)
+        n_trees = 0
+        while n_trees < n_total:
+            n_trees = min(n_trees + batch_size, n_total)
+            self.model.set_params(n_estimators=n_trees)
+            self.model.fit(X_scaled, y_train)
+            self.progress_callback('fit', trees_built=n_trees, trees_total=n_total)
+        self.model.set_params(warm_start=False)
+    
+    def _fit_until_oob_plateau(self, X_scaled, y_train, step=EARLY_STOPPING_STEP,
+                               tolerance=EARLY_STOPPING_TOLERANCE,
+                               patience=EARLY_STOPPING_PATIENCE,
+                               max_trees=EARLY_STOPPING_MAX_TREES):
+        """
+        Grow the forest step trees at a time until out-of-bag accuracy plateaus.
+        
+        Each new tree's out-of-bag votes are added to running totals, so
+        scoring a step costs only the new trees. Growth stops once the best
+        score has not improved by more than tolerance for patience steps
+        (or at max_trees), and the forest is cut back to the size at which
+        that best score was reached.
+        
+        Args:
+            X_scaled: Scaled training features
+            y_train: Training target
+            step (int): Trees added between out-of-bag evaluations
+            tolerance (float): Smallest accuracy gain counted as improvement
+            patience (int): Steps without improvement before stopping
+            max_trees (int): Upper bound on the forest size
+        """
+        if not self.model.bootstrap:
+            raise ValueError("Early stopping needs bootstrap=True for out-of-bag samples")
+        
+        X_oob = np.asarray(X_scaled, dtype=np.float32)
+        y_oob = np.asarray(y_train)
+        n_samples = len(y_oob)
+        votes = np.zeros((n_samples, len(np.unique(y_oob))))
+        curve_trees, curve_scores = [], []
+        best_score, best_trees, stale_steps = -np.inf, 0, 0
+        
+        self.model.set_params(warm_start=True)
+        n_trees = 0
+        while n_trees < max_trees and stale_steps < patience:
+            n_scored = n_trees
+            n_trees = min(n_trees + step, max_trees)
+            self.model.set_params(n_estimators=n_trees)
+            self.model.fit(X_scaled, y_train)
+            
+            # Only the new trees' out-of-bag votes need computing
+            for tree in self.model.estimators_[n_scored:]:
+                unsampled = _out_of_bag_indices(tree, n_samples, self.model.max_samples)
+                votes[unsampled] += tree.predict_proba(X_oob[unsampled], check_input=False)
+            
+            voted = votes.any(axis=1)
+            score = float(np.mean(self.model.classes_[np.argmax(votes[voted], axis=1)] == y_oob[voted]))
+            curve_trees.append(n_trees)
+            curve_scores.append(score)
+            
+            if score > best_score + tolerance:
+                best_score, best_trees, stale_steps = score, n_trees, 0
+            else:
+                stale_steps += 1
+            
+            if self.progress_callback is not None:
+                self.progress_callback('fit', trees_built=n_trees, trees_total=max_trees)
+        
+        # Keep only the trees that were needed to reach the plateau
+        self.model.estimators_ = self.model.estimators_[:best_trees]
+        self.model.set_params(n_estimators=best_trees, warm_start=False)
+        self.oob_curve = {'n_trees': curve_trees, 'oob_score': curve_scores}
+    
+    def update_incremental(self, df_new, n_new_trees=INCREMENTAL_TREES_PER_UPDATE,
+                           max_trees=INCREMENTAL_MAX_TREES, holdout_fraction=0.2,
+                           holdout_window=INCREMENTAL_HOLDOUT_WINDOW):
+        """
+        Grow the trained forest with trees fit only on newly arrived rows.
+        
+        New rows are imputed, encoded and scaled with the stored
+        preprocessing, so the cost of an update is proportional to the new
+        data. Once the forest exceeds max_trees the oldest trees are evicted.
+        A slice of every update is held out, and the model is re-evaluated
+        on the holdouts of the last holdout_window updates only.
+        
+        Loaded models are FlatForest engines: their new trees are compiled
+        and spliced into the node arrays. The holdouts and update count are
+        saved with the model, so updates continue across restarts.
+        
+        Args:
+            df_new (pd.DataFrame): New rows including the 'Depression' column
+            n_new_trees (int): Trees fit on the new rows
+            max_trees (int): Forest size cap (None for no cap)
+            holdout_fraction (float): Share of new rows kept for evaluation
+            holdout_window (int): Number of recent updates whose holdouts
+                form the rolling evaluation set
+            
+        Returns:
+            dict: Evaluation metrics on the rolling holdout, including an
+                'incremental' entry
+        """
+        if self.model is None:
+            raise ValueError("Model has not been trained yet")
+        if 'Depression' not in df_new.columns:
+            raise ValueError("Dataset must contain 'Depression' column as target variable")
+        df_new = _numpy_backed(df_new)
+        
+        unseen = set(df_new['Depression'].unique()) - set(self.target_encoder.classes_)
+        if unseen:
+            raise ValueError(f"New data contains unseen target classes: {sorted(map(str, unseen))}")
+        
+        X_new = self.scaler.transform(self._impute_and_encode(df_new[self.feature_names]))
+        y_new = self.target_encoder.transform(df_new['Depression'])
+        
+        if holdout_fraction > 0:
+            X_fit, X_holdout, y_fit, y_holdout = train_test_split(
+                X_new, y_new,
+                test_size=holdout_fraction,
+                random_state=self.random_state + self.update_count
+            )
+        else:
+            X_fit, y_fit = X_new, y_new
+        
+        # Trees can only be pooled if they were fit on the same set of classes
+        if len(np.unique(y_fit)) != len(self.model.classes_):
+            raise ValueError("Each incremental update must contain every target class")
+        
+        # Only an accepted update changes the rolling evaluation set
+        if holdout_fraction > 0:
+            self.holdout_buffer.append((X_holdout, y_holdout))
+            self.holdout_buffer = self.holdout_buffer[-holdout_window:]
+        
+        self.update_count += 1
+        if isinstance(self.model, RandomForestClassifier):
+            base_params = self.model.get_params()
+        else:
+            # Models saved before parameters were stored fall back to the defaults
+            base_params = {**MODEL_PARAMS, **(self.model_params or {})}
+        new_params = {**base_params, 'n_estimators': n_new_trees,
+                      'warm_start': False, 'random_state': self.random_state + self.update_count}
+        new_forest = RandomForestClassifier(**new_params).fit(X_fit, y_fit)
+        
+        n_before = self.model.n_estimators
+        if isinstance(self.model, FlatForest):
+            self.model = self.model.extend(FlatForest.from_estimator(new_forest), max_trees)
+        else:
+            estimators = self.model.estimators_ + new_forest.estimators_
+            if max_trees is not None and len(estimators) > max_trees:
+                estimators = estimators[len(estimators) - max_trees:]
+            self.model.estimators_ = estimators
+            self.model.n_estimators = len(estimators)
+        evicted = n_before + n_new_trees - self.model.n_estimators
+        
+        self.inference_engine = None
+        self.model_version = None
+        self.model_hash = None
+        # A FlatForest model already is the fast engine
+        if self.fast_inference and isinstance(self.model, RandomForestClassifier):
+            self.compile_inference_engine()
+        
+        metrics = self.metrics or {}
+        if self.holdout_buffer:
+            X_eval = np.concatenate([X for X, _ in self.holdout_buffer])
+            y_eval = np.concatenate([y for _, y in self.holdout_buffer])
+            previous = metrics
+            metrics = self._score(y_eval, self.model.predict(X_eval))
+            # Keep the training report; importances change with the forest
+            if 'stage_timings' in previous:
+                metrics['stage_timings'] = previous['stage_timings']
+            if 'feature_importance' in previous:
+                importance = self.get_feature_importance()
+                metrics['feature_importance'] = dict(zip(importance['Feature'], importance['Importance']))
+        
+        metrics['incremental'] = {
+            'updates': self.update_count,
+            'rows_added': len(df_new),
+            'trees_added': n_new_trees,
+            'trees_evicted': evicted,
+            'n_trees': self.model.n_estimators,
+            'holdout_rows': sum(len(y) for _, y in self.holdout_buffer)
+        }
+        self.metrics = metrics
+        return metrics
+    
+    def _impute_and_encode(self, X):
+        """
+        Impute and encode raw features with the statistics learned at training.
+        
+        Categories never seen in training are mapped to the training fill value.
+        
+        Args:
+            X (pd.DataFrame): Raw features in training column order
+            
+        Returns:
+            pd.DataFrame: Numeric feature matrix
+        """
+        # Fill values may not be among a categorical column's categories
+        category_features = X.select_dtypes(include=['category']).columns
+        X = X.astype({col: object for col in category_features}).fillna(self.fill_values)
+        
+        for col, encoder in self.label_encoders.items():
+            codes = pd.Categorical(X[col].astype(str), categories=encoder.classes_).codes
+            fallback = np.searchsorted(encoder.classes_, str(self.fill_values[col]))
+            X[col] = np.where(codes == -1, fallback, codes)
+        
+        return X
+    
+    def tune(self, X_train, y_train, search_space=None, cv=SEARCH_CV_FOLDS,
+             factor=SEARCH_HALVING_FACTOR, n_jobs=-1):
+        """
+        Pick hyperparameters by successive halving, then train with the winner.
+        
+        Args:
+            X_train: Training features
+            y_train: Training target
+            search_space (dict): Parameter grid; seeded from MODEL_PARAMS if None
+            cv (int): Cross-validation folds per halving round
+            factor (int): Elimination rate between rounds
+            n_jobs (int): Parallel candidate fits (-1 for all cores)
+            
+        Returns:
+            dict: Best parameters, leaderboard records and search time
+        """
+        # Tracing every allocation of hundreds of candidate fits dominates the search
+        with self._stage('search', trace=False):
+            X_scaled = StandardScaler().fit_transform(X_train)
+            best_params, leaderboard, search_time = successive_halving_search(
+                X_scaled, y_train,
+                search_space=search_space,
+                cv=cv,
+                factor=factor,
+                random_state=self.random_state,
+                n_jobs=n_jobs
+            )
+        
+        self.train(X_train, y_train, params=best_params)
+        
+        self.tuning_results = {
+            'best_params': best_params,
+            'leaderboard': leaderboard.to_dict('records'),
+            'search_time': search_time
+        }
+        return self.tuning_results
+    
+    def tune_and_evaluate(self, df, search_space=None, **search_kwargs):
+        """
+        Complete tuning pipeline: prepare, search, train the winner, and evaluate.
+        
+        Args:
+            df (pd.DataFrame): Input dataframe
+            search_space (dict): Parameter grid; seeded from MODEL_PARAMS if None
+            **search_kwargs: cv, factor and n_jobs passed to tune()
+            
+        Returns:
+            dict: Evaluation metrics including a 'tuning' entry
+        """
+        with self._instrumented_run():
+            df = self._load_input(df)
+            X_train, X_test, y_train, y_test = self.prepare_data(df)
+            tuning = self.tune(X_train, y_train, search_space=search_space, **search_kwargs)
+            metrics = self.evaluate(X_test, y_test)
+            metrics['tuning'] = tuning
+            self._record_feature_importance(metrics)
+        
+        return self._attach_timings(metrics)
+    
+    def compile_inference_engine(self):
+        """
+        Compile the trained forest into a FlatForest inference engine.
+        
+        Returns:
+            FlatForest: Engine used by predict and predict_batch
+        """
+        if self.model is None:
+            raise ValueError("Model has not been trained yet")
+        
+        self.inference_engine = FlatForest.from_estimator(self.model)
+        return self.inference_engine
         
     def evaluate(self, X_test, y_test):
         """
@@ -120,9 +887,44 @@ class DepressionModelTrainer:
         Returns:
             dict: Dictionary containing evaluation metrics
         """
-        X_test_scaled = self.scaler.transform(X_test)
-        y_pred = self.model.predict(X_test_scaled)
+        with self._stage('evaluate'):
+            X_test_scaled = self.scaler.transform(X_test)
+            y_pred = self.model.predict(X_test_scaled)
+            
+            return self._score(y_test, y_pred)
+    
+    def evaluate_out_of_core(self, X_test, y_test, chunksize=STREAM_CHUNK_ROWS):
+        """
+        Evaluate on a memory-mapped matrix from prepare_data_out_of_core.
+        
+        Args:
+            X_test (np.memmap): float32 test features (scaled in place)
+            y_test: Test target
+            chunksize (int): Rows scaled and predicted per chunk
+            
+        Returns:
+            dict: Dictionary containing evaluation metrics
+        """
+        with self._stage('evaluate'):
+            self._scale_in_place(X_test, chunksize)
+            y_pred = np.concatenate([
+                self.model.predict(X_test[start:start + chunksize])
+                for start in range(0, len(X_test), chunksize)
+            ])
+            
+            return self._score(y_test, y_pred)
+    
+    def _score(self, y_test, y_pred):
+        """
+        Compute and store evaluation metrics for a set of predictions.
         
+        Args:
+            y_test: True target values
+            y_pred: Predicted target values
+            
+        Returns:
+            dict: Dictionary containing evaluation metrics
+        """
         accuracy = accuracy_score(y_test, y_pred)
         conf_matrix = confusion_matrix(y_test, y_pred)
         class_report = classification_report(y_test, y_pred, output_dict=True)
@@ -132,8 +934,11 @@ class DepressionModelTrainer:
             'confusion_matrix': conf_matrix,
             'classification_report': class_report,
             'y_test': y_test,
-            'y_pred': y_pred
+            'y_pred': y_pred,
+            'n_trees': self.model.n_estimators
         }
+        if self.oob_curve is not None:
+            self.metrics['oob_curve'] = self.oob_curve
         
         return self.metrics
     
@@ -141,42 +946,120 @@ class DepressionModelTrainer:
         """
         Complete training pipeline: prepare, train, and evaluate.
         
+        Every stage is timed; see metrics['stage_timings'].
+        
         Args:
-            df (pd.DataFrame): Input dataframe
+            df (pd.DataFrame or str): Input dataframe or path to a CSV file
             
         Returns:
             dict: Evaluation metrics
         """
-        X_train, X_test, y_train, y_test = self.prepare_data(df)
-        self.train(X_train, y_train)
-        metrics = self.evaluate(X_test, y_test)
+        with self._instrumented_run():
+            df = self._load_input(df)
+            X_train, X_test, y_train, y_test = self.prepare_data(df)
+            self.train(X_train, y_train)
+            metrics = self.evaluate(X_test, y_test)
+            self._record_feature_importance(metrics)
         
-        return metrics
+        return self._attach_timings(metrics)
+    
+    def _record_feature_importance(self, metrics):
+        """Add the feature importance scores to a metrics dict."""
+        with self._stage('feature_importance'):
+            importance = self.get_feature_importance()
+            metrics['feature_importance'] = dict(zip(importance['Feature'], importance['Importance']))
+    
+    def train_and_evaluate_out_of_core(self, csv_path, work_dir=None, chunksize=STREAM_CHUNK_ROWS):
+        """
+        Complete out-of-core pipeline for CSV files larger than memory.
+        
+        Args:
+            csv_path (str): Path to a CSV file with a 'Depression' column
+            work_dir (str): Directory for the memory-mapped matrices; if
+                None a temporary directory is used and removed afterwards
+            chunksize (int): Rows processed per chunk
+            
+        Returns:
+            dict: Evaluation metrics
+        """
+        # The matrices are as large as the dataset; only a caller's work_dir keeps them
+        scratch = (tempfile.TemporaryDirectory(prefix='depression_prep_') if work_dir is None
+                   else nullcontext(work_dir))
+        with self._instrumented_run(), scratch as work_dir:
+            X_train, X_test, y_train, y_test = self.prepare_data_out_of_core(csv_path, work_dir, chunksize)
+            self.train_out_of_core(X_train, y_train, chunksize=chunksize)
+            metrics = self.evaluate_out_of_core(X_test, y_test, chunksize)
+            self._record_feature_importance(metrics)
+            # Unmap before the directory is removed
+            del X_train, X_test
+        
+        return self._attach_timings(metrics)
     
     def predict(self, input_data):
-        # Convert to DataFrame if dict
-        if isinstance(input_data, dict):
+        """
+        Predict the depression level for a single record.
+        
+        Args:
+            input_data (dict or pd.DataFrame): Feature values for one record
+            
+        Returns:
+            tuple: (predicted_class, class_probabilities)
+        """
+        labels, probabilities = self.predict_batch(input_data)
+        return labels[0], probabilities[0]
+    
+    def predict_batch(self, input_data, chunk_size=None):
+        """
+        Predict depression levels for many records at once.
+        
+        Missing values are imputed and categorical columns encoded
+        column-wise with the training statistics, as for incremental
+        updates: a gap or an unseen category in one record takes the
+        training fill value instead of failing the batch. The forest is
+        traversed once per chunk; labels are derived from the probabilities
+        instead of a second ``model.predict`` pass.
+        
+        Args:
+            input_data (pd.DataFrame, dict or list): Records to score
+            chunk_size (int): Optional number of rows scored per chunk to
+                bound memory on very large inputs
+            
+        Returns:
+            tuple: (predicted_labels, class_probabilities) as numpy arrays
+        """
+        if self.model is None:
+            raise ValueError("Model has not been trained yet")
+        
+        if isinstance(input_data, pd.DataFrame):
+            input_df = _numpy_backed(input_data)
+        elif isinstance(input_data, dict):
             input_df = pd.DataFrame([input_data])
         else:
-            input_df = input_data.copy()
-
-        # ✅ ENSURE SAME COLUMN ORDER
-        input_df = input_df[self.feature_names]
-
-        # Encode categoricals & scale
-        for col in self.label_encoders:
-            if col in input_df.columns:
-                input_df[col] = self.label_encoders[col].transform(input_df[col].astype(str))
-
-        input_scaled = self.scaler.transform(input_df)
-
-        # Predict
-        prediction = self.model.predict(input_scaled)
-        prediction_proba = self.model.predict_proba(input_scaled)
-
-        # Decode prediction
-        predicted_class = self.target_encoder.inverse_transform(prediction)[0]
-        return predicted_class, prediction_proba[0]
+            input_df = pd.DataFrame.from_records(input_data)
+        
+        missing = [col for col in self.feature_names if col not in input_df.columns]
+        if missing:
+            raise ValueError(f"Input is missing feature columns: {missing}")
+        
+        n_rows = len(input_df)
+        if not chunk_size or chunk_size >= n_rows:
+            chunk_size = max(n_rows, 1)
+        
+        # The FlatForest engine wins on small batches; sklearn on large ones
+        estimator = self.model
+        if self.inference_engine is not None and chunk_size <= FAST_INFERENCE_MAX_ROWS:
+            estimator = self.inference_engine
+        
+        probabilities = np.empty((n_rows, len(self.model.classes_)), dtype=np.float64)
+        for start in range(0, n_rows, chunk_size):
+            chunk = input_df.iloc[start:start + chunk_size]
+            chunk_scaled = self.scaler.transform(self._impute_and_encode(chunk[self.feature_names]))
+            probabilities[start:start + chunk_size] = estimator.predict_proba(chunk_scaled)
+        
+        # Same decision rule as RandomForestClassifier.predict
+        encoded = estimator.classes_.take(np.argmax(probabilities, axis=1))
+        labels = self.target_encoder.inverse_transform(encoded.astype(int))
+        return labels, probabilities
     
     def get_feature_importance(self):
         """
@@ -196,12 +1079,15 @@ class DepressionModelTrainer:
         
         return feature_importance_df
     
-    def save_model(self, filepath='model_artifacts.pkl'):
+    def save_model(self, filepath=MODEL_SAVE_PATH):
         """
-        Save model and all artifacts to file.
+        Save model and all artifacts as a new version in a ModelStore.
         
         Args:
-            filepath (str): Path to save the model
+            filepath (str): Root directory of the model store
+            
+        Returns:
+            str: Name of the version written
         """
         if self.model is None:
             raise ValueError("Model has not been trained yet")
@@ -212,32 +1098,53 @@ class DepressionModelTrainer:
             'label_encoders': self.label_encoders,
             'target_encoder': self.target_encoder,
             'feature_names': self.feature_names,
-            'metrics': self.metrics
+            'feature_profile': self.feature_profile,
+            'metrics': self.metrics,
+            'fill_values': self.fill_values,
+            'model_params': self.model_params,
+            'update_count': self.update_count,
+            'holdout_buffer': self.holdout_buffer
         }
         
-        with open(filepath, 'wb') as f:
-            pickle.dump(artifacts, f)
+        version = ModelStore(filepath).save(artifacts)
+        self.model_version = version
         
-        print(f"Model saved successfully to {filepath}")
+        print(f"Model saved successfully to {filepath} as {version}")
+        return version
     
-    def load_model(self, filepath='model_artifacts.pkl'):
+    def load_model(self, filepath=MODEL_SAVE_PATH, version=None, mmap=True):
         """
-        Load model and all artifacts from file.
+        Load model and all artifacts from a ModelStore.
+        
+        Arrays are memory-mapped by default, so the model is served by a
+        FlatForest engine rather than an sklearn forest; update_incremental
+        grows it from where the saved model left off.
         
         Args:
-            filepath (str): Path to load the model from
+            filepath (str): Root directory of the model store
+            version (str): Version to load; the latest version if None
+            mmap (bool): Memory-map the arrays; False reads them into memory
+                so the store can be deleted afterwards
         """
-        with open(filepath, 'rb') as f:
-            artifacts = pickle.load(f)
+        artifacts = ModelStore(filepath).load(version, mmap=mmap)
         
         self.model = artifacts['model']
+        self.inference_engine = None
         self.scaler = artifacts['scaler']
         self.label_encoders = artifacts['label_encoders']
         self.target_encoder = artifacts['target_encoder']
         self.feature_names = artifacts['feature_names']
+        self.feature_profile = artifacts['feature_profile']
         self.metrics = artifacts['metrics']
+        self.fill_values = artifacts['fill_values'] or _fill_values_from_profile(self.feature_profile)
+        self.model_params = artifacts['model_params']
+        self.update_count = artifacts['update_count']
+        self.holdout_buffer = artifacts['holdout_buffer']
+        self.model_version = artifacts['version']
+        # Identifies the model contents across stores (versions are per store)
+        self.model_hash = artifacts['content_hash']
         
-        print(f"Model loaded successfully from {filepath}")
+        print(f"Model {self.model_version} loaded successfully from {filepath}")
 
 
 if __name__ == "__main__":
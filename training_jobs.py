@@ -0,0 +1,254 @@
+# training_jobs.py
+import os
+import time
+import uuid
+import shutil
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, CancelledError
+
+from train_model import DepressionModelTrainer
+from config import (
+    JOB_ARTIFACT_PATH, TRAINING_JOB_WORKERS,
+    TRAINING_JOB_KEEP_FINISHED, TRAINING_JOB_TTL_SECONDS
+)
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+FINISHED_STATES = (DONE, FAILED, CANCELLED)
+
+
+class TrainingCancelled(Exception):
+    """Raised inside a training job when its cancellation was requested."""
+
+
+def _run_training_job(job_id, data, trainer_kwargs, tune, progress, cancel_event, artifact_dir):
+    """
+    Train, evaluate and save one model in a worker process.
+
+    Args:
+        job_id (str): Job identifier
+        data (pd.DataFrame or str): Training frame or CSV path
+        trainer_kwargs (dict): DepressionModelTrainer keyword arguments
+        tune (bool): Run the hyperparameter search before training
+        progress (DictProxy): Shared job id -> status dict
+        cancel_event (Event): Set by the parent to cancel the job
+        artifact_dir (str): ModelStore root the trained model is saved to
+
+    Returns:
+        str: Saved model version
+    """
+    def report(stage, trees_built=None, trees_total=None):
+        if cancel_event.is_set():
+            raise TrainingCancelled(f"Job {job_id} was cancelled")
+        status = dict(progress[job_id])
+        status.update(state=RUNNING, stage=stage)
+        if trees_total is not None:
+            status.update(trees_built=trees_built, trees_total=trees_total)
+        progress[job_id] = status
+
+    report('starting')
+    trainer = DepressionModelTrainer(**trainer_kwargs)
+    trainer.progress_callback = report
+
+    if tune:
+        trainer.tune_and_evaluate(data)
+    else:
+        trainer.train_and_evaluate(data)
+
+    report('saving')
+    return trainer.save_model(artifact_dir)
+
+
+class TrainingJobManager:
+    """
+    Runs model training jobs in a process pool.
+
+    Each job gets an id and reports its current stage and tree count
+    through a manager-backed dict, so the caller can poll without
+    blocking. Finished models are saved to a per-job ModelStore and
+    loaded back on demand, so a result outlives the session that
+    submitted it. Jobs carry an owner token; each owner keeps its latest
+    keep_finished finished jobs for up to ttl_seconds.
+    """
+
+    def __init__(self, max_workers=TRAINING_JOB_WORKERS, artifact_root=JOB_ARTIFACT_PATH,
+                 keep_finished=TRAINING_JOB_KEEP_FINISHED, ttl_seconds=TRAINING_JOB_TTL_SECONDS):
+        """
+        Initialize the job manager.
+
+        Args:
+            max_workers (int): Number of jobs trained concurrently
+            artifact_root (str): Directory holding one model store per job
+            keep_finished (int): Finished jobs kept per owner
+            ttl_seconds (float): Age after which a finished job is discarded
+        """
+        self.artifact_root = artifact_root
+        self.keep_finished = keep_finished
+        self.ttl_seconds = ttl_seconds
+        # Spawned workers do not inherit the web server's threads and locks
+        context = multiprocessing.get_context('spawn')
+        self._manager = context.Manager()
+        self._progress = self._manager.dict()
+        self._cancel_events = {}
+        self._futures = {}
+        self._executor = ProcessPoolExecutor(max_workers=max_workers, mp_context=context)
+
+    def submit(self, data, trainer_kwargs=None, tune=False, owner=None):
+        """
+        Queue a training job.
+
+        Args:
+            data (pd.DataFrame or str): Training frame or CSV path
+            trainer_kwargs (dict): DepressionModelTrainer keyword arguments
+            tune (bool): Run the hyperparameter search before training
+            owner (str): Token of the user submitting the job
+
+        Returns:
+            str: Job id
+        """
+        self._prune(owner)
+        job_id = uuid.uuid4().hex[:8]
+        self._progress[job_id] = {
+            'job_id': job_id,
+            'owner': owner,
+            'state': QUEUED,
+            'stage': None,
+            'trees_built': 0,
+            'trees_total': None,
+            'tune': tune,
+            'submitted_at': time.time(),
+            'finished_at': None,
+            'version': None,
+            'error': None
+        }
+        self._cancel_events[job_id] = self._manager.Event()
+
+        future = self._executor.submit(
+            _run_training_job, job_id, data, dict(trainer_kwargs or {}), tune,
+            self._progress, self._cancel_events[job_id], self._artifact_dir(job_id)
+        )
+        future.add_done_callback(lambda f: self._finish(job_id, f))
+        self._futures[job_id] = future
+        return job_id
+
+    def _artifact_dir(self, job_id):
+        return os.path.join(self.artifact_root, job_id)
+
+    def _finish(self, job_id, future):
+        """Record the final state of a job once its future resolves."""
+        status = dict(self._progress[job_id])
+        status['finished_at'] = time.time()
+        try:
+            status.update(state=DONE, stage=None, version=future.result())
+        except (CancelledError, TrainingCancelled):
+            status.update(state=CANCELLED, stage=None)
+        except Exception as e:
+            status.update(state=FAILED, error=str(e))
+        self._progress[job_id] = status
+
+    def status(self, job_id):
+        """
+        Return a snapshot of a job's status.
+
+        Args:
+            job_id (str): Job id
+
+        Returns:
+            dict: state, stage, trees_built, trees_total, version, error
+                and timestamps; None for an unknown job
+        """
+        status = self._progress.get(job_id)
+        return dict(status) if status is not None else None
+
+    def list_jobs(self, owner=None):
+        """
+        List jobs, newest first.
+
+        Args:
+            owner (str): Only list this owner's jobs; None lists every job
+
+        Returns:
+            list: Job status snapshots
+        """
+        jobs = [dict(status) for status in self._progress.values()
+                if owner is None or status['owner'] == owner]
+        return sorted(jobs, key=lambda s: s['submitted_at'], reverse=True)
+
+    def _prune(self, owner):
+        """Discard expired finished jobs and the owner's finished jobs beyond keep_finished."""
+        expired_before = time.time() - self.ttl_seconds
+        kept = 0
+        for status in self.list_jobs():
+            if status['state'] not in FINISHED_STATES:
+                continue
+            if status['owner'] == owner:
+                kept += 1
+            if status['finished_at'] < expired_before or (status['owner'] == owner and kept > self.keep_finished):
+                self.discard(status['job_id'])
+
+    def cancel(self, job_id):
+        """
+        Request cancellation of a job.
+
+        A queued job is dropped; a running job stops at its next progress
+        report (the next stage or batch of trees).
+
+        Args:
+            job_id (str): Job id
+        """
+        if job_id not in self._futures:
+            raise KeyError(f"Unknown training job {job_id}")
+        self._cancel_events[job_id].set()
+        self._futures[job_id].cancel()
+
+    def load_result(self, job_id, mmap=True):
+        """
+        Load the model trained by a finished job.
+
+        A job discarded while it loads raises ValueError, like any job
+        without a finished model.
+
+        Args:
+            job_id (str): Job id
+            mmap (bool): Memory-map the model; False reads it into memory so
+                the job can be discarded right after
+
+        Returns:
+            DepressionModelTrainer: Trainer with the job's model loaded
+        """
+        status = self.status(job_id)
+        if status is None or status['state'] != DONE:
+            raise ValueError(f"Training job {job_id} has no finished model")
+
+        trainer = DepressionModelTrainer()
+        try:
+            trainer.load_model(self._artifact_dir(job_id), status['version'], mmap=mmap)
+        except OSError as e:
+            raise ValueError(f"Training job {job_id} is no longer available") from e
+        return trainer
+
+    def discard(self, job_id):
+        """
+        Forget a finished job and delete its saved model.
+
+        Args:
+            job_id (str): Job id
+        """
+        status = self.status(job_id)
+        if status is not None and status['state'] not in FINISHED_STATES:
+            raise ValueError(f"Training job {job_id} is still {status['state']}")
+
+        self._progress.pop(job_id, None)
+        self._cancel_events.pop(job_id, None)
+        self._futures.pop(job_id, None)
+        shutil.rmtree(self._artifact_dir(job_id), ignore_errors=True)
+
+    def shutdown(self):
+        """Cancel queued jobs and stop the worker processes."""
+        for event in self._cancel_events.values():
+            event.set()
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        self._manager.shutdown()
@@ -1,67 +1,234 @@
 # utils.py
+import io
+import gzip
+import time
+from urllib.parse import urlparse
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 import seaborn as sns
-from io import StringIO
 import requests
 
-def load_data_from_url(url):
+from dataset_cache import URLDatasetCache, UploadDatasetCache
+from dataset_profile import profile_dataset
+from feature_correlations import FeatureCorrelations
+from config import (
+    URL_MAX_BYTES, URL_CONNECT_TIMEOUT, URL_READ_TIMEOUT, URL_TOTAL_TIMEOUT,
+    COMPACT_DTYPES_ON_LOAD, CATEGORY_MAX_UNIQUE_FRACTION, CSV_ENGINE, CSV_ARROW_DTYPES,
+    PREDICTION_PLOT_SCATTER_MAX_POINTS, PREDICTION_PLOT_LARGE_MODE,
+    CORRELATION_HEATMAP_MAX_FEATURES, CORRELATION_ANNOTATE_MAX_FEATURES
+)
+
+# Shared by every session in the process so its hit/miss counters are too
+upload_cache = UploadDatasetCache()
+
+def read_csv(source, engine=CSV_ENGINE, arrow_dtypes=CSV_ARROW_DTYPES):
+    """
+    Parse a CSV with the configured engine.
+    
+    engine='pyarrow' parses with Arrow's multithreaded reader;
+    arrow_dtypes then keeps the columns Arrow-backed (compact strings
+    and nullable numerics) instead of converting them to NumPy/object.
+    
+    Args:
+        source: Path or binary file object
+        engine (str): 'c' (pandas default) or 'pyarrow'
+        arrow_dtypes (bool): Keep Arrow-backed dtypes with the pyarrow engine
+        
+    Returns:
+        pd.DataFrame: Parsed dataset
+    """
+    if engine == 'pyarrow' and arrow_dtypes:
+        return pd.read_csv(source, engine='pyarrow', dtype_backend='pyarrow')
+    return pd.read_csv(source, engine=engine)
+
+
+class _DownloadStream(io.RawIOBase):
+    """
+    Read-only stream over an HTTP response body for pd.read_csv.
+    
+    Enforces a size cap on the bytes handed to the parser and an overall
+    deadline, and reports progress in bytes received off the wire.
+    """
+    
+    def __init__(self, source, response, max_bytes, deadline, progress_callback=None):
+        self.source = source
+        self.response = response
+        self.max_bytes = max_bytes
+        self.deadline = deadline
+        self.progress_callback = progress_callback
+        self.total_bytes = int(response.headers['Content-Length']) if 'Content-Length' in response.headers else None
+        self.bytes_read = 0
+    
+    def readable(self):
+        return True
+    
+    def readinto(self, buffer):
+        if time.monotonic() > self.deadline:
+            raise TimeoutError("Download took longer than the time limit")
+        
+        data = self.source.read(len(buffer))
+        self.bytes_read += len(data)
+        if self.max_bytes is not None and self.bytes_read > self.max_bytes:
+            raise ValueError(f"Download exceeds the {self.max_bytes / 1024 ** 2:.0f} MB limit")
+        
+        if self.progress_callback is not None:
+            self.progress_callback(self.response.raw.tell(), self.total_bytes)
+        buffer[:len(data)] = data
+        return len(data)
+
+def _fetch_csv(url, max_bytes, timeout, progress_callback, use_cache):
+    """Download and parse a CSV URL through the URL cache (see load_data_from_url)."""
+    cache = URLDatasetCache() if use_cache else None
+    entry = cache.lookup(url) if cache is not None else None
+    if entry is not None and cache.is_fresh(entry):
+        return cache.read(url)
+    
+    headers = cache.conditional_headers(entry) if entry is not None else {}
+    with requests.get(url, stream=True, headers=headers,
+                      timeout=(URL_CONNECT_TIMEOUT, URL_READ_TIMEOUT)) as response:
+        if response.status_code == 304 and entry is not None:
+            cache.revalidated(url)
+            return cache.read(url)
+        response.raise_for_status()
+        
+        # Undo Content-Encoding (gzip/deflate) as the body is read
+        response.raw.decode_content = True
+        source = response.raw
+        if urlparse(url).path.endswith('.gz') or response.headers.get('Content-Type') == 'application/gzip':
+            source = gzip.GzipFile(fileobj=source)
+        
+        stream = _DownloadStream(source, response, max_bytes, time.monotonic() + timeout, progress_callback)
+        df = read_csv(io.BufferedReader(stream))
+        
+        if cache is not None:
+            cache.store(url, df, response.headers)
+    return df
+
+def load_data_from_url(url, max_bytes=URL_MAX_BYTES, timeout=URL_TOTAL_TIMEOUT, progress_callback=None,
+                       use_cache=True, compact=COMPACT_DTYPES_ON_LOAD):
     """
     Load CSV data from a URL.
     
+    The response body is streamed straight into the CSV parser, so the
+    raw file is never held in memory. gzip/deflate transfer encoding and
+    gzip-compressed files (.csv.gz) are decompressed on the fly.
+    
+    Parsed datasets are cached on disk (see URLDatasetCache). A cached
+    copy is returned as-is within its TTL and after a 304 Not Modified
+    answer to a conditional GET.
+    
     Args:
         url (str): URL pointing to CSV file
+        max_bytes (int): Largest (decompressed) file accepted, None for no limit
+        timeout (float): Seconds allowed for the whole download
+        progress_callback (callable): Called as (bytes_received, total_bytes)
+            while downloading; total_bytes is None if the size is unknown.
+            With the pyarrow engine it is called from the parser's threads
+        use_cache (bool): Serve and store the dataset through the URL cache
+        compact (bool): Shrink column dtypes with compact_dtypes
         
     Returns:
         tuple: (DataFrame, error_message) - DataFrame if successful, None if error
     """
     try:
-        response = requests.get(url)
-        response.raise_for_status()
-        csv_data = StringIO(response.text)
-        df = pd.read_csv(csv_data)
+        df = _fetch_csv(url, max_bytes, timeout, progress_callback, use_cache)
+        if compact:
+            df = compact_dtypes(df)
         return df, None
     except Exception as e:
-        return None, str(e)
+        return None, str(e) or type(e).__name__
 
-def load_data_from_file(uploaded_file):
+def load_data_from_file(uploaded_file, use_cache=True, compact=COMPACT_DTYPES_ON_LOAD):
     """
     Load CSV data from an uploaded file.
     
+    Parsed uploads are cached by content hash (see UploadDatasetCache), so
+    the same file uploaded again is not parsed a second time.
+    
     Args:
         uploaded_file: Streamlit UploadedFile object
+        use_cache (bool): Serve and store the dataset through the upload cache
+        compact (bool): Shrink column dtypes with compact_dtypes
         
     Returns:
         tuple: (DataFrame, error_message) - DataFrame if successful, None if error
     """
     try:
-        df = pd.read_csv(uploaded_file)
+        if use_cache:
+            df = upload_cache.load(uploaded_file, parse=read_csv)
+        else:
+            df = read_csv(uploaded_file)
+        if compact:
+            df = compact_dtypes(df)
         return df, None
     except Exception as e:
         return None, str(e)
 
+def compact_dtypes(df, max_category_fraction=CATEGORY_MAX_UNIQUE_FRACTION):
+    """
+    Shrink column dtypes without changing any value.
+    
+    Object columns with few distinct values become ``category``, integers
+    are downcast to the smallest signed width that holds them, and 64-bit
+    float columns (NumPy, nullable or Arrow) become 32-bit when every value
+    survives the round trip.
+    The memory footprint before compaction is kept in
+    ``df.attrs['memory_before_compaction_kb']``.
+    
+    Args:
+        df (pd.DataFrame): Input dataframe
+        max_category_fraction (float): Largest share of distinct values
+            (relative to rows) for an object column to become categorical
+        
+    Returns:
+        pd.DataFrame: Compacted dataframe
+    """
+    memory_before_kb = df.memory_usage(deep=True).sum() / 1024
+    # Shallow copy: untouched columns share memory with the input
+    compacted = df.copy(deep=False)
+    
+    for col in df.columns:
+        series = df[col]
+        if series.dtype == object or (pd.api.types.is_string_dtype(series.dtype)
+                                      and not isinstance(series.dtype, pd.CategoricalDtype)):
+            if series.nunique() <= max_category_fraction * len(series):
+                compacted[col] = series.astype('category')
+        elif pd.api.types.is_integer_dtype(series.dtype):
+            compacted[col] = pd.to_numeric(series, downcast='integer')
+        elif (pd.api.types.is_float_dtype(series.dtype)
+              and getattr(series.dtype, 'numpy_dtype', series.dtype) == np.float64):
+            # Stay in the column's dtype family (NumPy, nullable or Arrow)
+            if isinstance(series.dtype, pd.ArrowDtype):
+                float32 = 'float[pyarrow]'
+            elif isinstance(series.dtype, pd.Float64Dtype):
+                float32 = 'Float32'
+            else:
+                float32 = np.float32
+            as_float32 = series.astype(float32)
+            if np.array_equal(as_float32.to_numpy(np.float64, na_value=np.nan),
+                              series.to_numpy(np.float64, na_value=np.nan), equal_nan=True):
+                compacted[col] = as_float32
+    
+    compacted.attrs['memory_before_compaction_kb'] = memory_before_kb
+    return compacted
+
 def get_dataset_info(df):
     """
     Get comprehensive information about the dataset.
     
+    Large datasets get sketch-based approximations (see
+    dataset_profile.profile_dataset).
+    
     Args:
         df (pd.DataFrame): Input dataframe
         
     Returns:
-        dict: Dictionary containing dataset statistics
+        dict: Dictionary containing dataset statistics; memory_before_kb
+            is the footprint before compact_dtypes (or the current one)
     """
-    info = {
-        'rows': df.shape[0],
-        'columns': df.shape[1],
-        'missing_values': df.isnull().sum().sum(),
-        'memory_usage_kb': df.memory_usage(deep=True).sum() / 1024,
-        'dtypes': df.dtypes.to_dict(),
-        'numeric_columns': df.select_dtypes(include=[np.number]).columns.tolist(),
-        'categorical_columns': df.select_dtypes(include=['object']).columns.tolist(),
-        'duplicates': df.duplicated().sum()
-    }
-    return info
+    return profile_dataset(df)
 
 def plot_confusion_matrix(conf_matrix):
     """
@@ -73,7 +240,8 @@ def plot_confusion_matrix(conf_matrix):
     Returns:
         matplotlib.figure.Figure: Confusion matrix plot
     """
-    fig, ax = plt.subplots(figsize=(10, 8))
+    fig = Figure(figsize=(10, 8))
+    ax = fig.subplots()
     
     # Create heatmap
     sns.heatmap(conf_matrix, 
@@ -90,7 +258,7 @@ def plot_confusion_matrix(conf_matrix):
     ax.set_ylabel('True Labels', fontsize=14, fontweight='bold')
     ax.set_title('Confusion Matrix', fontsize=16, fontweight='bold', pad=20)
     
-    plt.tight_layout()
+    fig.tight_layout()
     return fig
 
 def plot_target_distribution(df, target_column):
@@ -104,7 +272,8 @@ def plot_target_distribution(df, target_column):
     Returns:
         matplotlib.figure.Figure: Distribution plot
     """
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 6))
+    fig = Figure(figsize=(16, 6))
+    ax1, ax2 = fig.subplots(1, 2)
     
     # Count plot
     value_counts = df[target_column].value_counts()
@@ -142,47 +311,61 @@ def plot_target_distribution(df, target_column):
         autotext.set_fontsize(10)
         autotext.set_fontweight('bold')
     
-    plt.tight_layout()
+    fig.tight_layout()
     return fig
 
-def plot_correlation_matrix(df):
+def plot_correlation_matrix(df, max_features=CORRELATION_HEATMAP_MAX_FEATURES, correlations=None):
     """
-    Plot correlation matrix heatmap for numeric columns.
+    Plot a clustered correlation heatmap of the dataset's features.
+    
+    Numeric and label-encoded categorical features are included. Wide
+    datasets are limited to the max_features features most correlated
+    with the target, ordered so correlated features sit together; cells
+    are annotated up to CORRELATION_ANNOTATE_MAX_FEATURES features.
     
     Args:
         df (pd.DataFrame): Input dataframe
+        max_features (int): Largest number of features shown
+        correlations (FeatureCorrelations): Precomputed correlations of df
         
     Returns:
         matplotlib.figure.Figure: Correlation matrix plot or None
     """
-    # Select only numeric columns
-    numeric_df = df.select_dtypes(include=[np.number])
+    if correlations is None:
+        correlations = FeatureCorrelations.from_dataframe(df)
     
-    if len(numeric_df.columns) < 2:
+    selected = correlations.select_features(max_features)
+    if len(selected) < 2:
         return None
     
-    fig, ax = plt.subplots(figsize=(14, 10))
+    fig = Figure(figsize=(14, 10))
+    ax = fig.subplots()
     
-    # Calculate correlation matrix
-    corr_matrix = numeric_df.corr()
+    corr_matrix = correlations.to_frame().iloc[selected, selected]
+    annotate = len(selected) <= CORRELATION_ANNOTATE_MAX_FEATURES
     
     # Create heatmap
     mask = np.triu(np.ones_like(corr_matrix, dtype=bool))
     sns.heatmap(corr_matrix, 
                 mask=mask,
-                annot=True, 
+                annot=annotate, 
                 fmt='.2f', 
                 cmap='coolwarm',
                 center=0,
-                linewidths=0.5,
+                vmin=-1,
+                vmax=1,
+                linewidths=0.5 if annotate else 0,
                 linecolor='white',
                 square=True,
                 cbar_kws={"shrink": 0.8},
                 ax=ax)
     
-    ax.set_title('Feature Correlation Matrix', fontsize=16, fontweight='bold', pad=20)
+    title = 'Feature Correlation Matrix'
+    if len(selected) < len(correlations.columns):
+        title += f' ({len(selected)} of {len(correlations.columns)} features)'
+    ax.set_title(title, fontsize=16, fontweight='bold', pad=20)
     
-    plt.tight_layout()
+    fig.tight_layout()
     return fig
 
 def plot_feature_importance(feature_importance_df, top_n=15):
@@ -199,7 +382,8 @@ def plot_feature_importance(feature_importance_df, top_n=15):
     # Sort and select top N features
     sorted_df = feature_importance_df.sort_values('Importance', ascending=True).tail(top_n)
     
-    fig, ax = plt.subplots(figsize=(12, 8))
+    fig = Figure(figsize=(12, 8))
+    ax = fig.subplots()
     
     # Create horizontal bar plot
     bars = ax.barh(range(len(sorted_df)), sorted_df['Importance'], 
@@ -220,40 +404,82 @@ def plot_feature_importance(feature_importance_df, top_n=15):
     # Add grid
     ax.grid(axis='x', alpha=0.3, linestyle='--')
     
-    plt.tight_layout()
+    fig.tight_layout()
     return fig
 
-def plot_prediction_comparison(y_test, y_pred, target_encoder):
+def _stratified_sample(strata, max_points, rng):
+    """
+    Sample row indices so every stratum keeps its share of the rows.
+    
+    Each non-empty stratum keeps at least one row.
+    
+    Args:
+        strata (np.ndarray): Non-negative integer stratum per row
+        max_points (int): Approximate number of rows to keep
+        rng (np.random.Generator): Random generator
+        
+    Returns:
+        np.ndarray: Sorted row indices
+    """
+    order = rng.permutation(len(strata))
+    # A stable sort keeps each stratum's rows in random order
+    order = order[np.argsort(strata[order], kind='stable')]
+    counts = np.bincount(strata)
+    keep = np.maximum(np.round(counts * max_points / len(strata)), counts > 0).astype(int)
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    return np.sort(np.concatenate([order[start:start + n] for start, n in zip(starts, keep) if n]))
+
+def plot_prediction_comparison(y_test, y_pred, target_encoder, mode='auto', max_points=None,
+                               scatter_max_points=PREDICTION_PLOT_SCATTER_MAX_POINTS, random_state=None):
     """
     Plot comparison between actual and predicted values.
     
+    The right panel shows individual predictions as a jittered scatter.
+    With mode='auto' it switches to PREDICTION_PLOT_LARGE_MODE once more
+    than scatter_max_points markers would be drawn: 'bubble' draws one
+    marker per (actual, predicted) pair sized by its count, 'hexbin' the
+    density of the jittered points. Both take about the same time to
+    render whatever the test set size.
+    
     Args:
         y_test (array): Actual target values (encoded)
         y_pred (array): Predicted target values (encoded)
         target_encoder: LabelEncoder used for target encoding
+        mode (str): 'auto', 'scatter', 'bubble' or 'hexbin'
+        max_points (int): Optional cap on scatter markers; rows are sampled
+            stratified by (actual, predicted) pair
+        scatter_max_points (int): Largest scatter drawn with mode='auto'
+        random_state (int): Seed for the stratified sample
         
     Returns:
         matplotlib.figure.Figure: Comparison plot
     """
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 6))
+    y_test = np.asarray(y_test)
+    y_pred = np.asarray(y_pred)
+    n_rows = len(y_test)
+    n_points = min(n_rows, max_points) if max_points else n_rows
+    if mode == 'auto':
+        mode = 'scatter' if n_points <= scatter_max_points else PREDICTION_PLOT_LARGE_MODE
+    if mode not in ('scatter', 'bubble', 'hexbin'):
+        raise ValueError(f"Unknown prediction plot mode: {mode}")
+    
+    fig = Figure(figsize=(16, 6))
+    ax1, ax2 = fig.subplots(1, 2)
     
     # Get all possible classes from the encoder
     all_classes = np.arange(len(target_encoder.classes_))
+    n_classes = len(all_classes)
     
     # Count plot for actual vs predicted
-    actual_counts = pd.Series(y_test).value_counts()
-    predicted_counts = pd.Series(y_pred).value_counts()
-    
-    # Ensure all classes are represented (even with 0 counts)
-    actual_counts = actual_counts.reindex(all_classes, fill_value=0)
-    predicted_counts = predicted_counts.reindex(all_classes, fill_value=0)
+    actual_counts = np.bincount(y_test, minlength=n_classes)
+    predicted_counts = np.bincount(y_pred, minlength=n_classes)
     
     x = np.arange(len(all_classes))
     width = 0.35
     
-    bars1 = ax1.bar(x - width/2, actual_counts.values, width, 
+    bars1 = ax1.bar(x - width/2, actual_counts, width, 
                     label='Actual', color='skyblue', edgecolor='black')
-    bars2 = ax1.bar(x + width/2, predicted_counts.values, width, 
+    bars2 = ax1.bar(x + width/2, predicted_counts, width, 
                     label='Predicted', color='lightcoral', edgecolor='black')
     
     ax1.set_xlabel('Class', fontsize=12, fontweight='bold')
@@ -272,23 +498,54 @@ def plot_prediction_comparison(y_test, y_pred, target_encoder):
                 ax1.text(bar.get_x() + bar.get_width()/2., height + 0.1,
                         f'{int(height)}', ha='center', va='bottom', fontsize=9)
     
-    # Scatter plot with jitter for individual predictions
-    jitter_amount = 0.1
-    x_jitter = np.random.normal(0, jitter_amount, len(y_test))
-    y_jitter = np.random.normal(0, jitter_amount, len(y_pred))
-    
-    correct = y_test == y_pred
-    incorrect = ~correct
-    
-    if np.any(correct):
-        ax2.scatter(np.array(y_test)[correct] + x_jitter[correct], 
-                   np.array(y_pred)[correct] + y_jitter[correct],
-                   color='green', alpha=0.6, s=50, label='Correct', edgecolors='black')
-    
-    if np.any(incorrect):
-        ax2.scatter(np.array(y_test)[incorrect] + x_jitter[incorrect], 
-                   np.array(y_pred)[incorrect] + y_jitter[incorrect],
-                   color='red', alpha=0.6, s=50, label='Incorrect', edgecolors='black')
+    pairs = y_test * n_classes + y_pred
+    if mode == 'bubble':
+        # One marker per (actual, predicted) pair, area proportional to its count
+        counts = np.bincount(pairs, minlength=n_classes ** 2)
+        cells = np.flatnonzero(counts)
+        actual, predicted = np.divmod(cells, n_classes)
+        sizes = 2000 * counts[cells] / counts.max()
+        correct = actual == predicted
+        ax2.scatter(actual[correct], predicted[correct], s=sizes[correct],
+                    color='green', alpha=0.6, label='Correct', edgecolors='black')
+        ax2.scatter(actual[~correct], predicted[~correct], s=sizes[~correct],
+                    color='red', alpha=0.6, label='Incorrect', edgecolors='black')
+        for a, p, count in zip(actual, predicted, counts[cells]):
+            ax2.annotate(f'{count:,}', (a, p), ha='center', va='center', fontsize=9, fontweight='bold')
+        ax2.set_xlim(-0.6, n_classes - 0.4)
+        ax2.set_ylim(-0.6, n_classes - 0.4)
+        title = f'Prediction Counts ({n_rows:,} rows)'
+    else:
+        if n_points < n_rows:
+            sample = _stratified_sample(pairs, n_points, np.random.default_rng(random_state))
+            y_test, y_pred = y_test[sample], y_pred[sample]
+        
+        # Jitter individual predictions so overlapping points stay visible
+        jitter_amount = 0.1
+        x_jitter = np.random.normal(0, jitter_amount, len(y_test))
+        y_jitter = np.random.normal(0, jitter_amount, len(y_pred))
+        
+        if mode == 'hexbin':
+            hexbin = ax2.hexbin(y_test + x_jitter, y_pred + y_jitter, gridsize=40, mincnt=1,
+                                bins='log', cmap='viridis')
+            fig.colorbar(hexbin, ax=ax2, label='Predictions (log scale)')
+            title = f'Prediction Density ({n_rows:,} rows)'
+        else:
+            correct = y_test == y_pred
+            incorrect = ~correct
+            
+            if np.any(correct):
+                ax2.scatter(y_test[correct] + x_jitter[correct], 
+                           y_pred[correct] + y_jitter[correct],
+                           color='green', alpha=0.6, s=50, label='Correct', edgecolors='black')
+            
+            if np.any(incorrect):
+                ax2.scatter(y_test[incorrect] + x_jitter[incorrect], 
+                           y_pred[incorrect] + y_jitter[incorrect],
+                           color='red', alpha=0.6, s=50, label='Incorrect', edgecolors='black')
+            title = 'Individual Predictions'
+        if len(y_test) < n_rows:
+            title += f' (stratified sample of {len(y_test):,} / {n_rows:,})'
     
     # Add diagonal line for perfect prediction
     min_val = min(all_classes.min(), all_classes.min())
@@ -297,8 +554,11 @@ def plot_prediction_comparison(y_test, y_pred, target_encoder):
     
     ax2.set_xlabel('Actual Values', fontsize=12, fontweight='bold')
     ax2.set_ylabel('Predicted Values', fontsize=12, fontweight='bold')
-    ax2.set_title('Individual Predictions', fontsize=14, fontweight='bold', pad=15)
-    ax2.legend()
+    ax2.set_title(title, fontsize=14, fontweight='bold', pad=15)
+    legend = ax2.legend()
+    if mode == 'bubble':
+        for handle in legend.legend_handles[:2]:
+            handle.set_sizes([50])
     ax2.grid(True, alpha=0.3)
     
     # Set tick labels to class names
@@ -307,7 +567,7 @@ def plot_prediction_comparison(y_test, y_pred, target_encoder):
     ax2.set_xticklabels(target_encoder.classes_, rotation=45, ha='right')
     ax2.set_yticklabels(target_encoder.classes_)
     
-    plt.tight_layout()
+    fig.tight_layout()
     return fig
 
 if __name__ == "__main__":